@@ -0,0 +1,285 @@
+"""
+Sensor Anomaly Detection
+
+The raw city files contain sensor glitches, e.g. a CO reading of 15+ mg/m³
+between ordinary days, or one-day spikes in PM2.5. Each reading is compared
+with the rolling median of the previous ``window`` readings of the same city
+and pollutant, and flagged when it lies more than ``threshold`` robust
+standard deviations (1.4826 × MAD) away from it. The spread is floored at
+a fraction of the median and of the pollutant's valid range, so runs of
+identical readings (often all zeros) do not turn small changes into flags.
+
+The detector works on chunks: it keeps the last ``window`` readings of each
+city between chunks, so files can be processed in bounded memory as they
+are ingested, and results are identical to processing everything at once.
+Within a chunk all rows and cities are handled with array operations.
+
+Flags are added as ``Anomaly_<pollutant>`` columns plus ``Anomaly_Any``.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+import warnings
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import FEATURE_COLUMNS, VALID_RANGES, coerce_frame
+
+
+# Number of previous readings the rolling median/MAD is computed over
+ANOMALY_WINDOW = 15
+
+# A reading is flagged when it is this many robust standard deviations away
+ANOMALY_THRESHOLD = 6.0
+
+# Spread never counts as smaller than this fraction of the median, so
+# stretches of identical readings do not flag every small change
+MIN_RELATIVE_SPREAD = 0.1
+
+# Nor smaller than this fraction of the pollutant's valid range: after a
+# run of zeros (median and MAD both 0) an ordinary small reading such as
+# CO 0.66 must not count as a huge outlier
+MIN_RANGE_FRACTION = 0.02
+
+# Scales the MAD to a standard deviation for normally distributed data
+MAD_TO_STD = 1.4826
+
+FLAG_PREFIX = "Anomaly_"
+ANY_FLAG = "Anomaly_Any"
+
+
+def flag_column(name: str) -> str:
+    """Name of the flag column for a pollutant column."""
+    return FLAG_PREFIX + name
+
+
+def spread_floor(name: str) -> float:
+    """Smallest spread used for a pollutant: a fraction of its valid range."""
+    low, high = VALID_RANGES.get(name, (0.0, 0.0))
+    return max(MIN_RANGE_FRACTION * (high - low), 1e-9)
+
+
+def rolling_median_mad(values: np.ndarray, group_starts: np.ndarray, window: int,
+                       min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Median and MAD of the previous ``window`` values of each row's group.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Readings sorted by group then time
+    group_starts : np.ndarray
+        For each row, the position of the first row of its group
+    window : int
+        Number of previous readings to use (the row itself is excluded)
+    min_periods : int
+        Fewer non-missing previous readings than this gives NaN
+
+    Returns
+    -------
+    tuple
+        ``(median, mad)`` arrays aligned with ``values``
+    """
+    n = len(values)
+    padded = np.concatenate([np.full(window, np.nan), values])
+    # Row i sees values[i - window:i]; entries from another group are masked
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)[:n].copy()
+    positions = np.arange(n)[:, None] - window + np.arange(window)[None, :]
+    windows[positions < group_starts[:, None]] = np.nan
+
+    enough = np.count_nonzero(~np.isnan(windows), axis=1) >= min_periods
+    median = np.full(n, np.nan)
+    mad = np.full(n, np.nan)
+    if enough.any():
+        usable = windows[enough]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median[enough] = np.nanmedian(usable, axis=1)
+            mad[enough] = np.nanmedian(np.abs(usable - median[enough][:, None]), axis=1)
+    return median, mad
+
+
+class AnomalyDetector:
+    """
+    Chunked rolling median/MAD detector per city and pollutant.
+
+    Chunks must be in date order within each city (as the city files are).
+
+    Parameters
+    ----------
+    columns : list of str, optional
+        Pollutant columns to check (default is the model features)
+    window : int, optional
+        Previous readings per city used for the median/MAD
+    threshold : float, optional
+        Flag readings this many robust standard deviations from the median
+    min_periods : int, optional
+        Previous readings needed before a reading can be flagged
+        (default is half the window)
+
+    Examples
+    --------
+    >>> detector = AnomalyDetector(window=15)
+    >>> for chunk in pd.read_csv("Delhi_data.csv", chunksize=500):
+    ...     flagged = detector.process(chunk)
+    >>> detector.summary()
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None, window: int = ANOMALY_WINDOW,
+                 threshold: float = ANOMALY_THRESHOLD, min_periods: Optional[int] = None):
+        self.columns = list(columns or FEATURE_COLUMNS)
+        self.window = int(window)
+        self.threshold = float(threshold)
+        self.min_periods = int(min_periods or max(self.window // 2, 1))
+        # Last `window` readings of each city, carried to the next chunk
+        self._tails: Dict[str, pd.DataFrame] = {}
+        self._counts: Dict[str, np.ndarray] = {}
+        self._rows: Dict[str, int] = {}
+
+    def process(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return ``chunk`` with flag columns added (rows keep their order).
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Records with ``City``, ``Date`` and pollutant columns
+
+        Returns
+        -------
+        pd.DataFrame
+            Normalized copy of ``chunk`` with ``Anomaly_*`` columns
+        """
+        chunk = coerce_frame(chunk)
+        columns = self.columns
+        result = chunk.copy()
+        flags = np.zeros((len(chunk), len(columns)), dtype=bool)
+
+        cities = chunk["City"].astype(str).to_numpy()
+        order = np.lexsort((chunk["Date"].to_numpy(), cities))
+        present = pd.unique(cities[order])
+        tails = [self._tails[c] for c in present if c in self._tails]
+
+        # Previous readings of each city go in front of its new rows
+        current = pd.DataFrame({"City": cities[order], "_row": order})
+        for name in columns:
+            # A missing column is treated as all-missing readings (never flagged)
+            current[name] = chunk[name].to_numpy(dtype="float64")[order] if name in chunk else np.nan
+        combined = pd.concat(tails + [current], ignore_index=True) if tails else current
+        city_codes, _ = pd.factorize(combined["City"])
+        regroup = np.argsort(city_codes, kind="stable")
+        combined = combined.iloc[regroup].reset_index(drop=True)
+
+        sorted_codes = city_codes[regroup]
+        boundaries = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+        group_starts = np.maximum.accumulate(np.where(boundaries, np.arange(len(combined)), 0))
+        rows = combined["_row"].to_numpy()
+        is_new = rows >= 0
+
+        for j, name in enumerate(columns):
+            values = combined[name].to_numpy(dtype="float64")
+            median, mad = rolling_median_mad(values, group_starts, self.window, self.min_periods)
+            spread = np.maximum(MAD_TO_STD * mad, MIN_RELATIVE_SPREAD * np.abs(median))
+            spread = np.maximum(spread, spread_floor(name))
+            with np.errstate(invalid="ignore"):
+                flagged = np.abs(values - median) > self.threshold * spread
+            flags[rows[is_new], j] = flagged[is_new]
+
+        for j, name in enumerate(columns):
+            if name in chunk.columns:
+                result[flag_column(name)] = flags[:, j]
+        result[ANY_FLAG] = flags.any(axis=1)
+
+        # Keep only the last `window` readings per city for the next chunk
+        combined["_row"] = -1
+        for city, tail in combined.groupby("City", sort=False).tail(self.window).groupby("City", sort=False):
+            self._tails[city] = tail.reset_index(drop=True)
+
+        counts = pd.DataFrame(flags, columns=columns).groupby(cities).sum()
+        sizes = pd.Series(cities).value_counts()
+        for city in counts.index:
+            previous = self._counts.get(city, np.zeros(len(columns), dtype=int))
+            self._counts[city] = previous + counts.loc[city].to_numpy()
+            self._rows[city] = self._rows.get(city, 0) + int(sizes[city])
+        return result
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Flag counts per city and pollutant over everything processed so far.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per city: ``City``, ``Rows`` and one count column per pollutant
+        """
+        if not self._counts:
+            return pd.DataFrame(columns=["City", "Rows"] + self.columns)
+        table = pd.DataFrame.from_dict(self._counts, orient="index", columns=self.columns)
+        table.insert(0, "Rows", pd.Series(self._rows))
+        return table.rename_axis("City").reset_index().sort_values("City", ignore_index=True)
+
+
+def flag_anomalies(df: pd.DataFrame, window: int = ANOMALY_WINDOW,
+                   threshold: float = ANOMALY_THRESHOLD,
+                   chunk_rows: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Flag anomalies in a whole dataset.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Records with ``City``, ``Date`` and pollutant columns
+    window, threshold : optional
+        See ``AnomalyDetector``
+    chunk_rows : int, optional
+        Process in chunks of this many rows (rows are date-sorted first)
+
+    Returns
+    -------
+    tuple
+        ``(flagged, summary)``: the data with flag columns and the counts
+        from ``AnomalyDetector.summary``
+    """
+    detector = AnomalyDetector(window=window, threshold=threshold)
+    df = coerce_frame(df)
+    if not chunk_rows or len(df) <= chunk_rows:
+        return detector.process(df), detector.summary()
+
+    order = np.argsort(df["Date"].to_numpy(), kind="stable")
+    ordered = df.iloc[order]
+    parts = [detector.process(ordered.iloc[i:i + chunk_rows]) for i in range(0, len(ordered), chunk_rows)]
+    # Put the rows back in their original order
+    return pd.concat(parts).iloc[np.argsort(order, kind="stable")], detector.summary()
+
+
+def hide_flagged(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Blank out (set to NaN) flagged readings, keeping the rest of each row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data with ``Anomaly_*`` flag columns
+    columns : iterable of str, optional
+        Pollutant columns to clean (default is every column with a flag)
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy with flagged readings set to NaN
+    """
+    if columns is None:
+        columns = [c[len(FLAG_PREFIX):] for c in df.columns
+                   if c.startswith(FLAG_PREFIX) and c != ANY_FLAG]
+    cleaned = {}
+    for name in columns:
+        flag = flag_column(name)
+        if name in df.columns and flag in df.columns:
+            # Parts stored before flagging existed have missing flags
+            mask = df[flag].astype("boolean").fillna(False).to_numpy(dtype=bool)
+            cleaned[name] = df[name].mask(mask)
+    return df.assign(**cleaned)
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from warmup import start_background_warmup
+
 
 # Author: Mohsina Zaman Mim
 # Project: India Air Quality App
@@ -19,4 +21,9 @@ st.markdown("""
 - **Student ID:** St20336239
 - **Course:** CMP7005 - Practical Assignment
 - **Version:** 2.0 (Revised Submission)
-""")
\ No newline at end of file
+""")
+
+# Load the plotting stack and the model in the background now that the
+# landing page has rendered, so the first EDA chart / prediction is fast
+# (set AQI_APP_WARMUP=0 to disable)
+start_background_warmup()
@@ -0,0 +1,256 @@
+"""
+Multi-Process Batch Scoring with the Forest in Shared Memory
+
+Scoring many city files with a process pool used to mean every worker
+unpickling its own copy of ``aqi_model.pkl``. Here the parent loads the
+model once, flattens it into ``ForestArrays`` and copies those arrays into
+a single shared-memory block. Workers attach to the block and wrap it in
+NumPy arrays without copying, so the forest exists once in memory however
+many workers run.
+
+Inputs (city files, or chunks of one large file) are fanned out to the
+workers, and the scored results are appended to the output file in input
+order as they come back, so only a few chunks are ever held in memory.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python batch_score.py air_files_extracted/air_files/*.csv --output scored.parquet
+    python batch_score.py India_air.csv --output scored.csv --chunk-rows 5000 --workers 4
+"""
+
+import os
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forest_arrays import ARRAY_FIELDS, ForestArrays
+from schema import coerce_frame
+from scoring import score_frame
+from warmup import MODEL_PATH
+
+
+# Byte alignment of each array inside the shared block
+ALIGNMENT = 64
+
+# Set in each worker by _init_worker
+_worker_forest: Optional[ForestArrays] = None
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_options: Dict[str, bool] = {}
+
+
+class SharedForest:
+    """
+    Forest node arrays placed in one shared-memory block.
+
+    The creating process owns the block and must call ``close`` (which also
+    unlinks it). ``spec`` is a small picklable description that other
+    processes pass to ``attach``.
+
+    Parameters
+    ----------
+    forest : ForestArrays
+        Flattened forest to share
+
+    Examples
+    --------
+    >>> shared = SharedForest(ForestArrays.from_model(model))
+    >>> forest, block = SharedForest.attach(shared.spec)   # in a worker
+    """
+
+    def __init__(self, forest: ForestArrays):
+        layout, offset = [], 0
+        for name in ARRAY_FIELDS:
+            array = getattr(forest, name)
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout.append((name, offset, array.shape, array.dtype.str))
+            offset += array.nbytes
+
+        self.block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, start, shape, dtype in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self.block.buf, offset=start)
+            view[...] = getattr(forest, name)
+
+        self.spec = {
+            "block": self.block.name,
+            "layout": layout,
+            "feature_names": forest.feature_names,
+            "max_depth": forest.max_depth,
+        }
+
+    @staticmethod
+    def attach(spec: Dict) -> Tuple[ForestArrays, shared_memory.SharedMemory]:
+        """
+        Wrap the shared block in a ``ForestArrays`` without copying.
+
+        Returns
+        -------
+        tuple
+            ``(forest, block)``; keep ``block`` referenced while ``forest`` is used
+        """
+        block = shared_memory.SharedMemory(name=spec["block"])
+        arrays = {}
+        for name, start, shape, dtype in spec["layout"]:
+            array = np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)
+            array.flags.writeable = False
+            arrays[name] = array
+        forest = ForestArrays.from_arrays(arrays, spec["feature_names"], spec["max_depth"])
+        return forest, block
+
+    def close(self) -> None:
+        """Release and remove the shared block."""
+        self.block.close()
+        self.block.unlink()
+
+
+def _init_worker(spec: Dict, options: Dict[str, bool]) -> None:
+    global _worker_forest, _worker_block, _worker_options
+    _worker_forest, _worker_block = SharedForest.attach(spec)
+    _worker_options = options
+
+
+def _score_task(task) -> pd.DataFrame:
+    """Score one file path or one DataFrame chunk in a worker."""
+    df = coerce_frame(pd.read_csv(task)) if isinstance(task, (str, Path)) else coerce_frame(task)
+    return score_frame(_worker_forest, df, **_worker_options)
+
+
+def iter_tasks(paths: List[str], chunk_rows: Optional[int] = None) -> Iterator:
+    """
+    Work items for the pool: file paths, or DataFrame chunks of each file.
+
+    Parameters
+    ----------
+    paths : list of str
+        CSV files to score
+    chunk_rows : int, optional
+        If given, files are read in chunks of this many rows and the chunks
+        are sent to the workers (useful for a single large file)
+    """
+    for path in paths:
+        if chunk_rows:
+            yield from pd.read_csv(path, chunksize=chunk_rows)
+        else:
+            yield path
+
+
+class _StreamWriter:
+    """Append scored DataFrames to a CSV or Parquet file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = str(path).endswith(".parquet")
+        self._writer = None
+        self._csv = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        # Categories differ between chunks, so write plain strings
+        df = df.astype({name: "string" for name in df.columns
+                        if isinstance(df[name].dtype, pd.CategoricalDtype)})
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            if self._csv is None:
+                self._csv = open(self.path, "w", newline="")
+                df.to_csv(self._csv, index=False)
+            else:
+                df.to_csv(self._csv, index=False, header=False)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._csv is not None:
+            self._csv.close()
+
+
+def score_files(paths: Iterable[str], output: str, model_path: str = MODEL_PATH,
+                workers: Optional[int] = None, chunk_rows: Optional[int] = None,
+                contributions: bool = False, intervals: bool = False) -> Dict[str, float]:
+    """
+    Score CSV files with a pool of workers sharing one copy of the forest.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        CSV files (e.g. ``air_files_extracted/air_files/*.csv``)
+    output : str
+        Output file; ``.parquet`` writes Parquet, anything else CSV
+    model_path : str, optional
+        Trained forest (default is ``aqi_model.pkl``)
+    workers : int, optional
+        Worker processes (default is the CPU count)
+    chunk_rows : int, optional
+        Split files into chunks of this many rows instead of one task per file
+    contributions, intervals : bool, optional
+        Extra output columns, see ``scoring.score_frame``
+
+    Returns
+    -------
+    dict
+        ``rows``, ``seconds`` and ``rows_per_second``
+    """
+    from warmup import load_model_artifact
+
+    paths = [str(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    forest = ForestArrays.from_model(load_model_artifact(model_path))
+    shared = SharedForest(forest)
+    del forest  # workers and parent only use the shared copy from here on
+
+    options = {"contributions": contributions, "intervals": intervals}
+    writer = _StreamWriter(output)
+    rows, start = 0, time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.spec, options)) as pool:
+            # A bounded window of tasks in flight keeps memory flat; results
+            # are written in input order as soon as the oldest one is ready
+            pending = deque()
+            for task in iter_tasks(paths, chunk_rows):
+                pending.append(pool.submit(_score_task, task))
+                if len(pending) >= 2 * workers:
+                    scored = pending.popleft().result()
+                    writer.write(scored)
+                    rows += len(scored)
+            while pending:
+                scored = pending.popleft().result()
+                writer.write(scored)
+                rows += len(scored)
+    finally:
+        writer.close()
+        shared.close()
+
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds else 0.0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score CSV files with the AQI model in parallel")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--output", required=True, help="output .csv or .parquet file")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    parser.add_argument("--contributions", action="store_true")
+    parser.add_argument("--intervals", action="store_true")
+    args = parser.parse_args()
+
+    stats = score_files(args.files, args.output, args.model, args.workers, args.chunk_rows,
+                        args.contributions, args.intervals)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.1f} s "
+          f"({stats['rows_per_second']:,.0f} rows/s) → {args.output}")
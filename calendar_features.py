@@ -0,0 +1,129 @@
+"""
+Vectorized Calendar Features
+
+Derives year, month, ISO week, weekday and the Indian season from a Date
+column. The notebook used to map every month to a season with a Python
+function applied row by row; here everything is computed on the
+datetime64 array with integer arithmetic, and the season is a lookup
+array indexed by month:
+
+    season_code = MONTH_TO_SEASON[month]
+
+so deriving the features for millions of rows is a handful of NumPy
+operations. The same function is used by the training notebook and the
+EDA page, so both see identical features.
+
+Seasons follow the notebook: Winter (Dec-Feb), Summer (Mar-May),
+Monsoon (Jun-Aug) and Autumn (Sep-Nov, post-monsoon).
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+
+SEASONS = ["Winter", "Summer", "Monsoon", "Autumn"]
+
+# Season code of each month; index 0 is unused (months are 1-12)
+MONTH_TO_SEASON = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+CALENDAR_COLUMNS = ["Year", "Month", "Week", "Weekday", "Season"]
+
+# 1970-01-01 (day 0) was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def calendar_arrays(dates: Union[pd.Series, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Calendar fields of each date as plain integer arrays.
+
+    Parameters
+    ----------
+    dates : pd.Series or np.ndarray
+        datetime64 values (NaT allowed)
+
+    Returns
+    -------
+    dict
+        ``Year``, ``Month`` (1-12), ``Week`` (ISO 1-53), ``Weekday``
+        (Monday=0) and ``Season`` (index into ``SEASONS``), plus ``missing``,
+        the mask of NaT dates (their fields are meaningless)
+
+    Examples
+    --------
+    >>> fields = calendar_arrays(np.array(["2021-01-03", "2021-07-15"], dtype="datetime64[D]"))
+    >>> fields["Week"].tolist(), [SEASONS[s] for s in fields["Season"]]
+    ([53, 28], ['Winter', 'Monsoon'])
+    """
+    values = np.asarray(dates, dtype="datetime64[D]")
+    missing = np.isnat(values)
+    days = values.astype(np.int64)
+    days[missing] = 0
+
+    months = values.astype("datetime64[M]").astype(np.int64)
+    months[missing] = 0
+    year = months // 12 + 1970
+    month = months % 12 + 1
+    weekday = (days + _EPOCH_WEEKDAY) % 7
+
+    # ISO week: the week belongs to the year of its Thursday, and week 1 is
+    # the one containing that year's first Thursday
+    thursday = days - weekday + 3
+    iso_year = thursday.astype("datetime64[D]").astype("datetime64[Y]")
+    week = (thursday - iso_year.astype("datetime64[D]").astype(np.int64)) // 7 + 1
+
+    return {
+        "Year": year,
+        "Month": month,
+        "Week": week,
+        "Weekday": weekday,
+        "Season": MONTH_TO_SEASON[month],
+        "missing": missing,
+    }
+
+
+def calendar_features(dates: pd.Series) -> pd.DataFrame:
+    """
+    Calendar features of a Date column as a DataFrame.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        datetime64 Date column (see ``schema.coerce_frame``)
+
+    Returns
+    -------
+    pd.DataFrame
+        ``Year``, ``Month``, ``Week``, ``Weekday`` as nullable integers and
+        ``Season`` as an ordered categorical, aligned with ``dates``
+        (all missing where the date is NaT)
+    """
+    fields = calendar_arrays(dates)
+    missing = fields.pop("missing")
+    season = fields.pop("Season").astype(np.int8)
+    season[missing] = -1
+    columns = {
+        name: pd.arrays.IntegerArray(values.astype(np.int16 if name == "Year" else np.int8), missing.copy())
+        for name, values in fields.items()
+    }
+    columns["Season"] = pd.Categorical.from_codes(season, categories=SEASONS, ordered=True)
+    return pd.DataFrame(columns, index=dates.index)
+
+
+def add_calendar_features(df: pd.DataFrame, date_column: str = "Date") -> pd.DataFrame:
+    """
+    Return ``df`` with the ``CALENDAR_COLUMNS`` added (or replaced).
+
+    Examples
+    --------
+    >>> df = add_calendar_features(coerce_frame(pd.read_csv("India_air.csv")))
+    >>> df.groupby("Season", observed=True)["AQI"].mean()
+    """
+    return df.assign(**calendar_features(df[date_column]))
@@ -0,0 +1,213 @@
+"""
+Rendered Chart Cache for the EDA Page
+
+Rendering a seaborn chart is by far the most expensive part of an EDA rerun.
+This module keeps the rendered image bytes (PNG or SVG) of each chart in an
+in-memory LRU cache with a byte budget, keyed by a fingerprint of the
+dataset, the chart type and the chart parameters. A repeat view is then a
+dictionary lookup instead of a new render.
+
+Charts are drawn on figures that are not registered with pyplot, and any
+pyplot figure handed in is closed right after it is rendered to bytes, so
+matplotlib does not keep every figure of a long session alive.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+
+# Default memory budget for rendered charts (64 MB)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Compute a content hash of a DataFrame.
+
+    Two frames with the same values and columns get the same fingerprint,
+    so cached charts are reused across reruns and sessions that load the
+    same file.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset to fingerprint
+
+    Returns
+    -------
+    str
+        Hex digest identifying the dataset contents
+
+    Examples
+    --------
+    >>> a = pd.DataFrame({"AQI": [100, 200]})
+    >>> dataset_fingerprint(a) == dataset_fingerprint(a.copy())
+    True
+    """
+    digest = hashlib.sha1()
+    digest.update("|".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def figure_to_bytes(fig, fmt: str = "png", dpi: int = 100) -> bytes:
+    """
+    Render a matplotlib figure to image bytes and close it.
+
+    A pyplot figure is closed even if saving fails, so figures never
+    accumulate in pyplot's global registry; closing a figure that pyplot
+    never registered is a no-op.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to render
+    fmt : str, optional
+        "png" or "svg" (default is "png")
+    dpi : int, optional
+        Resolution for raster output (default is 100)
+
+    Returns
+    -------
+    bytes
+        Encoded image
+    """
+    import matplotlib.pyplot as plt
+
+    try:
+        buffer = BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class ChartCache:
+    """
+    Thread-safe LRU cache of rendered chart bytes with a byte budget.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Total size of cached images before the least recently used ones
+        are evicted (default is 64 MB)
+
+    Examples
+    --------
+    >>> cache = ChartCache(max_bytes=1024)
+    >>> cache.put(("abc", "histogram", "PM2.5"), b"png-bytes")
+    >>> cache.get(("abc", "histogram", "PM2.5"))
+    b'png-bytes'
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return cached bytes for ``key`` (marking them recently used), or None."""
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """Store bytes for ``key``, evicting least recently used entries if over budget."""
+        if len(data) > self.max_bytes:
+            return  # Would evict everything and still not fit
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = data
+            self.size += len(data)
+
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, key: Hashable, build: Callable[[], object],
+                      fmt: str = "png", dpi: int = 100) -> bytes:
+        """
+        Return cached chart bytes, rendering the chart only on a cache miss.
+
+        Parameters
+        ----------
+        key : hashable
+            Cache key, usually from ``chart_key``
+        build : callable
+            Function returning a matplotlib Figure; only called on a miss.
+            It should draw on a ``matplotlib.figure.Figure`` that is not
+            registered with pyplot, so a build that raises leaves nothing
+            open and nothing another session could close by mistake
+        fmt : str, optional
+            "png" or "svg" (default is "png")
+        dpi : int, optional
+            Resolution for PNG output (default is 100)
+
+        Returns
+        -------
+        bytes
+            Encoded image
+        """
+        key = (key, fmt, dpi)
+        data = self.get(key)
+        if data is None:
+            fig = build()
+            data = figure_to_bytes(fig, fmt=fmt, dpi=dpi)
+            self.put(key, data)
+        return data
+
+    def clear(self) -> None:
+        """Remove all cached charts."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+def chart_key(fingerprint: str, chart_type: str, **params) -> Tuple:
+    """
+    Build a hashable cache key from the dataset fingerprint and chart parameters.
+
+    Parameters
+    ----------
+    fingerprint : str
+        Output of ``dataset_fingerprint``
+    chart_type : str
+        Chart name, e.g. "histogram"
+    **params
+        Every widget value the chart depends on; lists are converted to tuples
+
+    Returns
+    -------
+    tuple
+        Hashable key
+    """
+    items = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in params.items()
+    ))
+    return (fingerprint, chart_type, items)
@@ -0,0 +1,221 @@
+"""
+City Similarity and Clustering
+
+Which monitoring cities behave alike? Each city's daily series of one
+pollutant is placed on a shared date grid (a cities × days matrix with NaN
+for days without a reading), and every pair of cities is compared over the
+days both have readings:
+
+- correlation: Pearson correlation of the two series
+- distance: root-mean-square difference of the standardized series
+
+Both are computed for all pairs at once with matrix products over the
+observed-value mask (sums, sums of squares and cross products restricted
+to common days), a block of cities at a time so memory stays bounded for
+hundreds of stations. Cities are then grouped with average-linkage
+hierarchical clustering on the correlation distance (1 - r).
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python city_similarity.py India_air.csv --column PM2.5 --clusters 4
+"""
+
+import time
+import argparse
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from schema import coerce_frame
+
+
+# Pairs with fewer common days than this get NaN similarity
+MIN_OVERLAP_DAYS = 30
+
+# Rows (cities) of the result computed per block of matrix products
+BLOCK_CITIES = 128
+
+
+@dataclass
+class AlignedSeries:
+    """Per-city daily series on a shared date grid."""
+    values: np.ndarray      # (n_cities, n_days) float64, NaN where missing
+    cities: List[str]
+    dates: pd.DatetimeIndex
+
+
+def align_series(df: pd.DataFrame, column: str, cities: Optional[Sequence[str]] = None) -> AlignedSeries:
+    """
+    Place each city's readings of ``column`` on one daily grid.
+
+    Several readings of a city on the same day are averaged.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Records with ``City``, ``Date`` and ``column``
+    column : str
+        Pollutant to compare
+    cities : sequence of str, optional
+        Cities to keep, in this order (default is every city, sorted)
+
+    Returns
+    -------
+    AlignedSeries
+    """
+    df = coerce_frame(df)
+    valid = df["Date"].notna() & df["City"].notna() & df[column].notna()
+    city_values = df["City"].astype(str)[valid]
+    if cities is None:
+        cities = sorted(city_values.unique())
+    cities = list(cities)
+    codes = pd.Categorical(city_values, categories=cities).codes
+    keep = codes >= 0
+
+    days = df["Date"][valid].to_numpy().astype("datetime64[D]")[keep]
+    values = df[column][valid].to_numpy(dtype="float64")[keep]
+    codes = codes[keep]
+    if len(days) == 0:
+        return AlignedSeries(np.full((len(cities), 0), np.nan), cities, pd.DatetimeIndex([]))
+
+    first = days.min()
+    day_index = (days - first).astype(np.int64)
+    n_days = int(day_index.max()) + 1
+    # Scatter-add into flat (city, day) cells, then average duplicates
+    cell = codes.astype(np.int64) * n_days + day_index
+    size = len(cities) * n_days
+    sums = np.bincount(cell, weights=values, minlength=size)
+    counts = np.bincount(cell, minlength=size)
+    with np.errstate(invalid="ignore"):
+        grid = (sums / counts).reshape(len(cities), n_days)
+    dates = pd.date_range(pd.Timestamp(first), periods=n_days, freq="D")
+    return AlignedSeries(grid, cities, dates)
+
+
+def _pairwise_sums(x: np.ndarray, mask: np.ndarray, rows: slice):
+    """Sums over common days of the cities in ``rows`` against all cities."""
+    xb, mb = x[rows], mask[rows]
+    n = mb @ mask.T                 # common days
+    sx = xb @ mask.T                # sum of row city's values on common days
+    sy = mb @ x.T                   # sum of column city's values on common days
+    sxx = (xb * xb) @ mask.T
+    syy = mb @ (x * x).T
+    sxy = xb @ x.T
+    return n, sx, sy, sxx, syy, sxy
+
+
+def similarity_matrices(aligned: AlignedSeries, min_overlap: int = MIN_OVERLAP_DAYS,
+                        block: int = BLOCK_CITIES):
+    """
+    NaN-aware correlation and distance between every pair of cities.
+
+    Parameters
+    ----------
+    aligned : AlignedSeries
+        Output of ``align_series``
+    min_overlap : int, optional
+        Pairs with fewer common days are NaN
+    block : int, optional
+        Cities per block of matrix products
+
+    Returns
+    -------
+    tuple
+        ``(correlation, distance, overlap)`` square DataFrames indexed by
+        city; distance is the RMS difference of series standardized by
+        each city's own mean and standard deviation
+    """
+    mask = ~np.isnan(aligned.values)
+    observed = mask.astype(np.float64)
+    # Standardize each city once; centring also keeps the sums well conditioned
+    count = np.maximum(observed.sum(axis=1, keepdims=True), 1)
+    filled = np.where(mask, aligned.values, 0.0)
+    mean = filled.sum(axis=1, keepdims=True) / count
+    std = np.sqrt((np.where(mask, filled - mean, 0.0) ** 2).sum(axis=1, keepdims=True) / count)
+    std = np.where(std > 0, std, 1.0)
+    z = np.where(mask, (filled - mean) / std, 0.0)
+
+    k = len(aligned.cities)
+    correlation = np.full((k, k), np.nan)
+    distance = np.full((k, k), np.nan)
+    overlap = np.zeros((k, k), dtype=np.int64)
+    for start in range(0, k, block):
+        rows = slice(start, min(start + block, k))
+        n, sx, sy, sxx, syy, sxy = _pairwise_sums(z, observed, rows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * sxy - sx * sy
+            var_x = n * sxx - sx * sx
+            var_y = n * syy - sy * sy
+            r = cov / np.sqrt(var_x * var_y)
+            msd = (sxx - 2 * sxy + syy) / n
+        enough = n >= min_overlap
+        correlation[rows] = np.where(enough, np.clip(r, -1.0, 1.0), np.nan)
+        distance[rows] = np.where(enough, np.sqrt(np.maximum(msd, 0.0)), np.nan)
+        overlap[rows] = n.astype(np.int64)
+
+    frame = lambda m: pd.DataFrame(m, index=aligned.cities, columns=aligned.cities)
+    return frame(correlation), frame(distance), frame(overlap)
+
+
+def cluster_cities(correlation: pd.DataFrame, n_clusters: int = 4):
+    """
+    Average-linkage clustering on the correlation distance ``1 - r``.
+
+    Pairs without enough common days count as uncorrelated (distance 1).
+
+    Parameters
+    ----------
+    correlation : pd.DataFrame
+        Square correlation matrix from ``similarity_matrices``
+    n_clusters : int, optional
+        Number of clusters to cut the tree into
+
+    Returns
+    -------
+    tuple
+        ``(labels, order)``: cluster number (1..n) per city as a Series and
+        the cities in dendrogram leaf order (similar cities next to each other)
+    """
+    from scipy.cluster.hierarchy import fcluster, leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    cities = list(correlation.index)
+    if len(cities) < 2:
+        return pd.Series(1, index=cities, name="Cluster"), cities
+    dist = 1.0 - correlation.to_numpy()
+    dist = np.nan_to_num(dist, nan=1.0)
+    dist = (dist + dist.T) / 2
+    np.fill_diagonal(dist, 0.0)
+    tree = linkage(squareform(np.clip(dist, 0.0, 2.0), checks=False), method="average")
+    labels = fcluster(tree, t=min(n_clusters, len(cities)), criterion="maxclust")
+    order = [cities[i] for i in leaves_list(tree)]
+    return pd.Series(labels, index=cities, name="Cluster"), order
+
+
+def most_similar(correlation: pd.DataFrame, city: str, k: int = 5) -> pd.Series:
+    """The ``k`` cities most correlated with ``city`` (excluding itself)."""
+    row = correlation.loc[city].drop(city).dropna()
+    return row.sort_values(ascending=False).head(k)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Correlate and cluster cities by their pollution series")
+    parser.add_argument("input", help="CSV file with City, Date and pollutant columns")
+    parser.add_argument("--column", default="PM2.5")
+    parser.add_argument("--clusters", type=int, default=4)
+    parser.add_argument("--min-overlap", type=int, default=MIN_OVERLAP_DAYS)
+    args = parser.parse_args()
+
+    data = coerce_frame(pd.read_csv(args.input))
+    start = time.perf_counter()
+    aligned = align_series(data, args.column)
+    correlation, _, _ = similarity_matrices(aligned, args.min_overlap)
+    labels, _ = cluster_cities(correlation, args.clusters)
+    print(f"{len(aligned.cities)} cities x {len(aligned.dates)} days in {time.perf_counter() - start:.2f} s")
+    for cluster, members in labels.groupby(labels):
+        print(f"Cluster {cluster}: {', '.join(members.index)}")
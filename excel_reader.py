@@ -0,0 +1,328 @@
+"""
+Fast XLSX Ingestion
+
+``pd.read_excel`` builds openpyxl's full cell-object model for the whole
+workbook before pandas sees a single value, which is many times slower
+than reading the same data from CSV. This reader opens the workbook in
+read-only (streaming) mode, pulls plain values row by row and converts
+them in batches straight into typed column arrays (float64 for pollutant
+columns, using the schema registry). Several sheets can be read in
+parallel worker processes, and each parsed sheet is cached as Parquet
+keyed by the schema version and the file's content hash, so uploading the
+same workbook again skips parsing entirely. The cache keeps the most
+recently used files up to a size limit.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python excel_reader.py --benchmark partner_data.xlsx
+    python excel_reader.py --benchmark            # builds a workbook from India_air.csv
+"""
+
+import os
+import time
+import hashlib
+import argparse
+import tempfile
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from schema import SCHEMA, SCHEMA_VERSION, coerce_frame
+
+
+# Parsed sheets are cached here as Parquet (one file per workbook + sheet)
+XLSX_CACHE_DIR = ".cache/xlsx"
+
+# Least recently used files are deleted once the cache grows past this
+XLSX_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Rows converted to arrays at a time; bounds the Python-object overhead
+BATCH_ROWS = 10_000
+
+Source = Union[str, Path, bytes]
+
+
+def _open_workbook(source: Source):
+    from openpyxl import load_workbook
+
+    handle = BytesIO(source) if isinstance(source, bytes) else source
+    # read_only streams rows from the XML instead of building every cell object
+    return load_workbook(handle, read_only=True, data_only=True)
+
+
+def list_sheets(source: Source) -> List[str]:
+    """
+    Return the sheet names of a workbook without reading any rows.
+
+    Parameters
+    ----------
+    source : str, Path or bytes
+        Path to an .xlsx file or its raw bytes
+
+    Returns
+    -------
+    list of str
+        Sheet names in workbook order
+    """
+    workbook = _open_workbook(source)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _batch_to_float(values: tuple) -> np.ndarray:
+    """Convert one column batch to float64, cleaning strings only when needed."""
+    try:
+        # Fast path: numbers and empty cells (None becomes NaN)
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        cleaned = pd.Series(values, dtype=object).astype(str).str.replace(",", "").str.strip()
+        return pd.to_numeric(cleaned.replace("None", np.nan), errors="coerce").to_numpy("float64")
+
+
+def read_sheet(source: Source, sheet: Optional[str] = None) -> pd.DataFrame:
+    """
+    Stream one sheet into a DataFrame with typed columns.
+
+    The first row is used as the header. Pollutant/AQI columns are filled
+    into float64 arrays batch by batch; other columns are kept as objects
+    and then coerced by the schema registry (e.g. Date parsing).
+
+    Parameters
+    ----------
+    source : str, Path or bytes
+        Path to an .xlsx file or its raw bytes
+    sheet : str, optional
+        Sheet name (default is the first sheet)
+
+    Returns
+    -------
+    pd.DataFrame
+        Sheet contents, normalized by ``schema.coerce_frame``
+
+    Examples
+    --------
+    >>> df = read_sheet("partner_data.xlsx", sheet="Delhi")
+    """
+    workbook = _open_workbook(source)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return coerce_frame(pd.DataFrame())
+        names = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        width = len(names)
+        is_float = [SCHEMA.get(name) is not None and SCHEMA[name].dtype == "float64" for name in names]
+        chunks: List[List[np.ndarray]] = [[] for _ in names]
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_ROWS:
+                _flush(batch, width, is_float, chunks)
+                batch = []
+        if batch:
+            _flush(batch, width, is_float, chunks)
+    finally:
+        workbook.close()
+
+    columns = {}
+    for name, parts, numeric in zip(names, chunks, is_float):
+        if parts:
+            columns[name] = np.concatenate(parts)
+        else:
+            columns[name] = np.array([], dtype="float64" if numeric else object)
+
+    df = pd.DataFrame(columns)
+    # Drop trailing rows that are completely empty (common in exported sheets)
+    df = df.dropna(how="all")
+    return coerce_frame(df)
+
+
+def _flush(batch: list, width: int, is_float: List[bool], chunks: List[List[np.ndarray]]) -> None:
+    """Transpose a batch of row tuples and append one typed array per column."""
+    # Rows can be shorter than the header when trailing cells are empty
+    padded = (row + (None,) * (width - len(row)) if len(row) < width else row[:width]
+              for row in batch)
+    for i, values in enumerate(zip(*padded)):
+        if is_float[i]:
+            chunks[i].append(_batch_to_float(values))
+        else:
+            chunks[i].append(np.array(values, dtype=object))
+
+
+def read_sheets(source: Source, sheets: Optional[List[str]] = None,
+                max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Read several sheets, each in its own worker process.
+
+    openpyxl is pure Python, so processes (not threads) are needed for the
+    sheets to be parsed at the same time.
+
+    Parameters
+    ----------
+    source : str, Path or bytes
+        Path to an .xlsx file or its raw bytes
+    sheets : list of str, optional
+        Sheets to read (default is all sheets)
+    max_workers : int, optional
+        Worker processes (default is one per sheet, capped at the CPU count)
+
+    Returns
+    -------
+    dict
+        Sheet name → DataFrame, in the requested order
+    """
+    sheets = sheets or list_sheets(source)
+    if len(sheets) == 1:
+        return {sheets[0]: read_sheet(source, sheets[0])}
+
+    workers = max_workers or min(len(sheets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = pool.map(read_sheet, [source] * len(sheets), sheets)
+        return dict(zip(sheets, frames))
+
+
+def _cache_path(cache_dir: Path, digest: str, sheet: str) -> Path:
+    # Files parsed under another schema version are never reused
+    return cache_dir / f"s{SCHEMA_VERSION}-{digest}-{hashlib.sha1(sheet.encode()).hexdigest()[:12]}.parquet"
+
+
+def _evict(cache_dir: Path, max_bytes: int) -> None:
+    """Delete the least recently used cache files until the rest fit in ``max_bytes``."""
+    entries = []
+    for path in cache_dir.glob("*.parquet"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue  # Removed by another session meanwhile
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def read_excel_cached(data: bytes, sheets: Optional[List[str]] = None,
+                      cache_dir: Union[str, Path] = XLSX_CACHE_DIR,
+                      max_bytes: int = XLSX_CACHE_MAX_BYTES) -> pd.DataFrame:
+    """
+    Read sheets from workbook bytes, reusing Parquet copies of earlier reads.
+
+    Parameters
+    ----------
+    data : bytes
+        Raw .xlsx contents (e.g. ``uploaded.getvalue()``)
+    sheets : list of str, optional
+        Sheets to read and concatenate (default is the first sheet)
+    cache_dir : str or Path, optional
+        Directory for the Parquet cache (default is ``.cache/xlsx``)
+    max_bytes : int, optional
+        Size limit of the cache directory; least recently used files are
+        deleted beyond it (default is 512 MB)
+
+    Returns
+    -------
+    pd.DataFrame
+        Requested sheets concatenated, normalized by the schema registry
+    """
+    digest = hashlib.sha1(data).hexdigest()
+    sheets = sheets or list_sheets(data)[:1]
+    cache_dir = Path(cache_dir)
+
+    frames, missing = {}, []
+    for sheet in sheets:
+        path = _cache_path(cache_dir, digest, sheet)
+        try:
+            frames[sheet] = pd.read_parquet(path)
+            os.utime(path)  # Marks the file as recently used
+        except FileNotFoundError:
+            missing.append(sheet)
+
+    if missing:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for sheet, df in read_sheets(data, missing).items():
+            # A unique temporary name, so concurrent sessions never write the same file
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                df.to_parquet(tmp, index=False)
+                os.replace(tmp, _cache_path(cache_dir, digest, sheet))
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            frames[sheet] = df
+        _evict(cache_dir, max_bytes)
+
+    ordered = [frames[sheet] for sheet in sheets]
+    result = pd.concat(ordered, ignore_index=True) if len(ordered) > 1 else ordered[0]
+    return coerce_frame(result)
+
+
+def benchmark(path: Optional[str] = None, repeat: int = 3) -> Dict[str, float]:
+    """
+    Compare ``pd.read_excel`` with the streaming reader and the Parquet cache.
+
+    Parameters
+    ----------
+    path : str, optional
+        Workbook to read; if omitted, one is built from ``India_air.csv``
+    repeat : int, optional
+        Runs per method; the best time is reported (default is 3)
+
+    Returns
+    -------
+    dict
+        Best time in seconds per method
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, "India_air.xlsx")
+            pd.read_csv("India_air.csv").to_excel(path, index=False)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        def best(fn):
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        cache_dir = os.path.join(tmp, "cache")
+        read_excel_cached(data, cache_dir=cache_dir)  # populate the cache
+        return {
+            "pd.read_excel": best(lambda: pd.read_excel(BytesIO(data))),
+            "read_sheet (streaming)": best(lambda: read_sheet(data)),
+            "read_excel_cached (warm)": best(lambda: read_excel_cached(data, cache_dir=cache_dir)),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fast XLSX reader")
+    parser.add_argument("--benchmark", nargs="?", const="", metavar="XLSX",
+                        help="compare against pd.read_excel (default: workbook built from India_air.csv)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        results = benchmark(args.benchmark or None, args.repeat)
+        baseline = results["pd.read_excel"]
+        for method, seconds in results.items():
+            print(f"{method:<28}{seconds:>8.3f} s{baseline / seconds:>8.1f}x")
+    else:
+        parser.print_help()
@@ -0,0 +1,101 @@
+"""
+Feature Contributions for Random Forest Predictions
+
+Every prediction of a regression tree can be written as the root value
+(the training mean) plus the change in node value at each split along the
+row's decision path. Assigning each change to the split's feature gives
+additive contributions, and averaging over the trees gives the same for the
+forest:
+
+    prediction = bias + sum(contributions)
+
+``feature_contributions`` computes this for all rows and all trees at once
+while ``ForestArrays.descend`` walks the flattened node arrays, so no Python
+loop over trees or rows is needed.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from forest_arrays import CHUNK_ROWS, ForestArrays
+
+
+def _chunk_contributions(forest: ForestArrays, X: np.ndarray) -> np.ndarray:
+    """Contributions (summed over trees) for one chunk of rows."""
+    n_rows, n_features = X.shape
+    totals = np.zeros(n_rows * n_features)
+
+    def accumulate(rows, parents, children):
+        # Pairs already sitting on a leaf add 0 (parent == child)
+        delta = forest.value[children] - forest.value[parents]
+        totals[:] += np.bincount(rows * n_features + forest.feature[parents],
+                                 weights=delta, minlength=totals.size)
+
+    forest.descend(X, on_step=accumulate)
+    return totals.reshape(n_rows, n_features)
+
+
+def feature_contributions(forest: ForestArrays, X) -> Tuple[float, np.ndarray]:
+    """
+    Additive feature contributions of the forest for each row.
+
+    Parameters
+    ----------
+    forest : ForestArrays
+        Flattened forest (``ForestArrays.from_model(model)``)
+    X : pd.DataFrame or array-like
+        Input rows with the model's feature columns
+
+    Returns
+    -------
+    tuple
+        ``(bias, contributions)`` where ``bias`` is the forest's mean root
+        value and ``contributions`` has shape (rows, features), in
+        ``forest.feature_names`` order. ``bias + contributions.sum(axis=1)``
+        equals the forest prediction.
+
+    Examples
+    --------
+    >>> bias, contrib = feature_contributions(forest, input_df)
+    >>> dict(zip(forest.feature_names, contrib[0]))
+    """
+    X = forest._as_matrix(X)
+    bias = float(forest.value[forest.roots].mean())
+    if len(X) == 0:
+        return bias, np.empty((0, len(forest.feature_names)))
+
+    chunks = [_chunk_contributions(forest, X[i:i + CHUNK_ROWS]) for i in range(0, len(X), CHUNK_ROWS)]
+    return bias, np.concatenate(chunks) / forest.n_trees
+
+
+def contributions_frame(forest: ForestArrays, X) -> pd.DataFrame:
+    """
+    Contributions of a single prediction as a table, largest effect first.
+
+    Parameters
+    ----------
+    forest : ForestArrays
+        Flattened forest
+    X : pd.DataFrame
+        One input row
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``Feature``, ``Value`` (input value) and ``Contribution``
+    """
+    _, contrib = feature_contributions(forest, X)
+    values = forest._as_matrix(X)[0]
+    table = pd.DataFrame({
+        "Feature": forest.feature_names,
+        "Value": values.astype(float),
+        "Contribution": contrib[0],
+    })
+    order = np.argsort(-np.abs(table["Contribution"].to_numpy()), kind="stable")
+    return table.iloc[order].reset_index(drop=True)
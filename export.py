@@ -0,0 +1,251 @@
+"""
+Streaming Export of Filtered Data
+
+Exports a selection (rows of the current filter, optionally only some
+columns) as CSV or Parquet. The output is produced by a generator that
+encodes ``chunk_rows`` rows at a time: only one chunk is converted at any
+moment, so there is never a second full DataFrame or a full in-memory
+CSV string next to the data being exported. Chunks can be streamed to a
+file, a socket or a temporary file handed to a download button.
+
+Monthly means per city can be exported the same way; they are small, so
+they are computed in one ``groupby``.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python export.py India_air.csv delhi.parquet --city Delhi --columns PM2.5 AQI
+    python export.py India_air.csv monthly.csv --monthly
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from schema import coerce_frame
+
+
+EXPORT_FORMATS = {"CSV": ".csv", "Parquet": ".parquet"}
+
+EXPORT_MIME_TYPES = {"CSV": "text/csv", "Parquet": "application/vnd.apache.parquet"}
+
+# Rows encoded at a time; bounds the extra memory an export needs
+EXPORT_CHUNK_ROWS = 50_000
+
+# Columns that identify a row and are always exported when present
+KEY_COLUMNS = ["City", "Date"]
+
+
+def export_columns(df: pd.DataFrame, selected: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Columns to export: ``City`` and ``Date`` plus the selected ones, in order.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data being exported
+    selected : sequence of str, optional
+        Columns chosen by the user (default is every column)
+
+    Returns
+    -------
+    list of str
+        Existing columns, without duplicates
+    """
+    if selected is None:
+        return list(df.columns)
+    wanted = KEY_COLUMNS + [c for c in selected if c not in KEY_COLUMNS]
+    return [c for c in wanted if c in df.columns]
+
+
+def iter_chunks(df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield consecutive row slices of ``df`` restricted to ``columns``."""
+    columns = list(df.columns) if columns is None else list(columns)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+
+def iter_csv(df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+             chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Encode ``df`` as UTF-8 CSV, one chunk of rows at a time.
+
+    Yields
+    ------
+    bytes
+        The header with the first chunk, then the following rows
+    """
+    header = True
+    for chunk in iter_chunks(df, columns, chunk_rows):
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+    if header:
+        # No rows: still produce a file with the column names
+        yield df.iloc[:0][list(df.columns if columns is None else columns)].to_csv(index=False).encode("utf-8")
+
+
+class _Drain:
+    """Write-only file object whose written bytes are collected and handed out."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def iter_parquet(df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Encode ``df`` as Parquet with one row group per chunk.
+
+    The schema is taken from the first chunk, so every row group has the
+    same column types (categories become dictionary-encoded strings).
+
+    Yields
+    ------
+    bytes
+        Parquet bytes as each row group is written, then the footer
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Drain()
+    writer = None
+    schema = None
+    for chunk in iter_chunks(df, columns, chunk_rows):
+        table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = table.schema
+            writer = pq.ParquetWriter(sink, schema)
+        writer.write_table(table)
+        yield sink.take()
+    if writer is None:
+        empty = df.iloc[:0][list(df.columns if columns is None else columns)]
+        writer = pq.ParquetWriter(sink, pa.Table.from_pandas(empty, preserve_index=False).schema)
+    writer.close()
+    yield sink.take()
+
+
+def iter_export(df: pd.DataFrame, fmt: str = "CSV", columns: Optional[Sequence[str]] = None,
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Encode ``df`` chunk by chunk in one of ``EXPORT_FORMATS``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Rows to export
+    fmt : str, optional
+        ``"CSV"`` or ``"Parquet"``
+    columns : sequence of str, optional
+        Columns to export (default is every column)
+    chunk_rows : int, optional
+        Rows encoded at a time
+
+    Yields
+    ------
+    bytes
+        Consecutive pieces of the output file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+    encode = iter_csv if fmt == "CSV" else iter_parquet
+    return encode(df, columns, chunk_rows)
+
+
+def export_file(df: pd.DataFrame, fmt: str = "CSV", columns: Optional[Sequence[str]] = None,
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> BinaryIO:
+    """
+    Stream an export into an anonymous temporary file.
+
+    The file is deleted when it is closed (or garbage collected), so it can
+    be handed straight to ``st.download_button``.
+
+    Returns
+    -------
+    BinaryIO
+        The temporary file, positioned at the start
+    """
+    handle = tempfile.TemporaryFile()
+    for piece in iter_export(df, fmt, columns, chunk_rows):
+        handle.write(piece)
+    handle.seek(0)
+    return handle
+
+
+def monthly_means(df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Mean of each numeric column per city and calendar month.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Records with ``City`` and ``Date`` columns
+    columns : sequence of str, optional
+        Columns to average (default is every numeric column)
+
+    Returns
+    -------
+    pd.DataFrame
+        ``City``, ``Month`` (first day of the month), ``Days`` and the means
+    """
+    numeric = df.select_dtypes("number").columns
+    columns = [c for c in (numeric if columns is None else columns) if c in numeric]
+    month = df["Date"].dt.to_period("M").dt.to_timestamp().rename("Month")
+    groups = df[columns].groupby([df["City"].astype(str), month], observed=True)
+    table = groups.mean()
+    table.insert(0, "Days", groups.size())
+    return table.reset_index()
+
+
+def export_name(city: str, fmt: str, monthly: bool = False) -> str:
+    """File name for a download, e.g. ``aqi_delhi_monthly.csv``."""
+    label = "all" if city in (None, "All") else str(city).lower().replace(" ", "_")
+    return f"aqi_{label}{'_monthly' if monthly else ''}{EXPORT_FORMATS[fmt]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export (a filtered part of) a dataset chunk by chunk")
+    parser.add_argument("input", help="CSV file to read")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--city", help="only rows of this city")
+    parser.add_argument("--columns", nargs="+", help="columns besides City and Date")
+    parser.add_argument("--monthly", action="store_true", help="export monthly means per city")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    data = coerce_frame(pd.read_csv(args.input))
+    if args.city:
+        data = data[data["City"] == args.city]
+    fmt = "Parquet" if args.output.endswith(".parquet") else "CSV"
+    columns = export_columns(data, args.columns)
+    if args.monthly:
+        data, columns = monthly_means(data, columns), None
+
+    start = time.perf_counter()
+    with open(args.output, "wb") as f:
+        for piece in iter_export(data, fmt, columns, args.chunk_rows):
+            f.write(piece)
+    print(f"Wrote {len(data):,} rows to {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - start:.2f} s")
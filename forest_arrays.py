@@ -0,0 +1,228 @@
+"""
+Flattened Node Arrays for the Random Forest
+
+scikit-learn keeps each of the forest's trees as a separate object, so
+anything per-tree (explanations, per-tree predictions) ends up as a Python
+loop over ``estimators_``. ``ForestArrays`` copies the node arrays of every
+tree into one set of flat NumPy arrays (children, split feature, threshold,
+node value) and walks all rows through all trees at once, one tree level
+per step.
+
+The same arrays are used by the explanation engine (explain.py) and can be
+rebuilt from plain arrays without scikit-learn via ``from_arrays``.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Rows walked through the trees at a time; bounds the (rows × trees) arrays
+CHUNK_ROWS = 4096
+
+# Array names, in the order used by to_arrays/from_arrays
+ARRAY_FIELDS = ["children", "feature", "threshold", "value", "missing_left", "roots"]
+
+
+class ForestArrays:
+    """
+    All trees of a fitted forest as flat node arrays.
+
+    Node ``i`` of the whole forest splits on ``feature[i]`` at
+    ``threshold[i]``; rows with ``x <= threshold`` go to ``children[i, 0]``,
+    others to ``children[i, 1]``. Leaves point to themselves (threshold
+    +inf), so every row can take exactly ``max_depth`` steps without
+    checking which rows are still moving. ``roots[t]`` is the first node of
+    tree ``t`` and ``value[i]`` the mean target of node ``i``.
+
+    Parameters
+    ----------
+    arrays : dict
+        Arrays named as in ``ARRAY_FIELDS``
+    feature_names : list of str
+        Model input columns, in training order
+    max_depth : int
+        Depth of the deepest tree
+
+    Examples
+    --------
+    >>> forest = ForestArrays.from_model(joblib.load("aqi_model.pkl"))
+    >>> forest.predict(df[FEATURE_COLUMNS])
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], feature_names: List[str], max_depth: int):
+        for name in ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        self.feature_names = list(feature_names)
+        self.max_depth = int(max_depth)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.value)
+
+    @property
+    def is_leaf(self) -> np.ndarray:
+        return self.children[:, 0] == np.arange(self.n_nodes)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAY_FIELDS)
+
+    @classmethod
+    def from_model(cls, model, feature_names: Optional[List[str]] = None) -> "ForestArrays":
+        """
+        Flatten a fitted forest (or a single decision tree) regressor.
+
+        Parameters
+        ----------
+        model : RandomForestRegressor, ExtraTreesRegressor or DecisionTreeRegressor
+            Fitted single-output regressor
+        feature_names : list of str, optional
+            Input columns (default is ``model.feature_names_in_``)
+
+        Returns
+        -------
+        ForestArrays
+        """
+        estimators = getattr(model, "estimators_", [model])
+        if feature_names is None:
+            feature_names = list(getattr(model, "feature_names_in_", range(model.n_features_in_)))
+
+        parts = {name: [] for name in ARRAY_FIELDS if name != "roots"}
+        roots, offset, depth = [], 0, 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            leaf = tree.children_left == -1
+            own = np.arange(tree.node_count) + offset
+            roots.append(offset)
+            parts["children"].append(np.column_stack([
+                np.where(leaf, own, tree.children_left + offset),
+                np.where(leaf, own, tree.children_right + offset),
+            ]))
+            parts["feature"].append(np.where(leaf, 0, tree.feature))
+            parts["threshold"].append(np.where(leaf, np.inf, tree.threshold))
+            parts["value"].append(tree.value[:, 0, 0])
+            # Trees trained on data with NaN record where missing values go
+            missing = getattr(tree, "missing_go_to_left", None)
+            parts["missing_left"].append(np.zeros(tree.node_count, dtype=bool) if missing is None
+                                         else np.asarray(missing, dtype=bool))
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        arrays = {
+            "children": np.ascontiguousarray(np.concatenate(parts["children"]), dtype=np.int32),
+            "feature": np.concatenate(parts["feature"]).astype(np.int32),
+            "threshold": np.concatenate(parts["threshold"]).astype(np.float64),
+            "value": np.concatenate(parts["value"]).astype(np.float64),
+            "missing_left": np.concatenate(parts["missing_left"]),
+            "roots": np.asarray(roots, dtype=np.int32),
+        }
+        return cls(arrays, [str(name) for name in feature_names], depth)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Return the node arrays by name (e.g. to place them in shared memory)."""
+        return {name: getattr(self, name) for name in ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], feature_names: List[str],
+                    max_depth: int) -> "ForestArrays":
+        """Rebuild from ``to_arrays`` output without copying the arrays."""
+        return cls(arrays, feature_names, max_depth)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names].to_numpy(dtype=np.float64, na_value=np.nan)
+        # scikit-learn trees compare float32 inputs against their thresholds
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def descend(self, X: np.ndarray,
+                on_step: Optional[Callable[[np.ndarray, np.ndarray, np.ndarray], None]] = None) -> np.ndarray:
+        """
+        Walk every row through every tree, one level per step.
+
+        The (tree, row) pairs are laid out tree-major so that each step
+        reads a tree's nodes for all rows together. Rows that already sit on
+        a leaf keep stepping onto the same leaf, which avoids compacting the
+        active set on every level.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            float32 matrix of shape (rows, features)
+        on_step : callable, optional
+            Called as ``on_step(rows, parents, children)`` after each step
+            for every (tree, row) pair; pairs already on a leaf have
+            ``parents == children``
+
+        Returns
+        -------
+        np.ndarray
+            Leaf node of each (row, tree), shape (rows, trees)
+        """
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        children = self.children.ravel()
+        nodes = np.repeat(self.roots, n_rows)
+        rows = np.tile(np.arange(n_rows, dtype=np.int32), self.n_trees)
+        offsets = rows * n_features
+
+        for _ in range(self.max_depth):
+            values = flat[offsets + self.feature[nodes]]
+            go_right = values > self.threshold[nodes]
+            missing = np.isnan(values)
+            if missing.any():
+                go_right[missing] = ~self.missing_left[nodes[missing]]
+            parents = nodes
+            nodes = children[2 * nodes + go_right]
+            if on_step is not None:
+                on_step(rows, parents, nodes)
+
+        return nodes.reshape(self.n_trees, n_rows).T
+
+    def apply(self, X) -> np.ndarray:
+        """
+        Leaf node (forest-wide index) reached in each tree.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or array-like
+            Input rows with the model's feature columns
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (rows, trees)
+        """
+        X = self._as_matrix(X)
+        return np.concatenate(
+            [self.descend(X[i:i + CHUNK_ROWS]) for i in range(0, len(X), CHUNK_ROWS)]
+        ) if len(X) else np.empty((0, self.n_trees), dtype=np.int32)
+
+    def predict_per_tree(self, X) -> np.ndarray:
+        """
+        Prediction of every tree for every row, shape (rows, trees).
+
+        Parameters
+        ----------
+        X : pd.DataFrame or array-like
+            Input rows with the model's feature columns
+
+        Returns
+        -------
+        np.ndarray
+            Matrix of per-tree predictions
+        """
+        return self.value[self.apply(X)]
+
+    def predict(self, X) -> np.ndarray:
+        """Forest prediction (mean over trees), same as ``model.predict``."""
+        return self.predict_per_tree(X).mean(axis=1)
@@ -0,0 +1,119 @@
+"""
+Prediction Intervals from Per-Tree Outputs
+
+The forest's trees each give their own AQI estimate; their spread is an
+empirical measure of how certain the forest is. ``ForestArrays``
+produces the full (rows × trees) matrix of per-tree predictions in one
+traversal, and ``summarize_trees`` reduces it column-wise to the mean, a
+quantile interval and the share of trees voting for each AQI bucket.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from forest_arrays import CHUNK_ROWS, ForestArrays
+from schema import AQI_BUCKETS
+from utils import AQI_THRESHOLDS
+
+
+# Default central interval: 5th to 95th percentile of the tree predictions
+DEFAULT_QUANTILES = (0.05, 0.95)
+
+# Column names added by summarize_trees
+LOWER_COLUMN = "AQI_Lower"
+UPPER_COLUMN = "AQI_Upper"
+PROBABILITY_PREFIX = "P_"
+
+
+def bucket_probabilities(per_tree: np.ndarray) -> np.ndarray:
+    """
+    Share of trees whose prediction falls in each AQI bucket.
+
+    Parameters
+    ----------
+    per_tree : np.ndarray
+        Per-tree predictions, shape (rows, trees)
+
+    Returns
+    -------
+    np.ndarray
+        Shape (rows, buckets), columns in ``AQI_BUCKETS`` order; rows sum to 1
+    """
+    n_rows, n_trees = per_tree.shape
+    upper_bounds = np.array([AQI_THRESHOLDS[name] for name in AQI_BUCKETS[:-1]])
+    # Same boundary rule as get_aqi_categories (50 → Good)
+    codes = np.searchsorted(upper_bounds, per_tree, side="left")
+    keys = np.arange(n_rows)[:, None] * len(AQI_BUCKETS) + codes
+    counts = np.bincount(keys.ravel(), minlength=n_rows * len(AQI_BUCKETS))
+    return counts.reshape(n_rows, len(AQI_BUCKETS)) / n_trees
+
+
+def summarize_trees(per_tree: np.ndarray,
+                    quantiles: Tuple[float, float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+    """
+    Reduce per-tree predictions to mean, interval and bucket probabilities.
+
+    Parameters
+    ----------
+    per_tree : np.ndarray
+        Per-tree predictions, shape (rows, trees)
+    quantiles : tuple of float, optional
+        Lower and upper quantile of the interval (default is 5% and 95%)
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``Predicted_AQI``, ``AQI_Lower``, ``AQI_Upper`` and one
+        ``P_<bucket>`` column per AQI bucket
+
+    Examples
+    --------
+    >>> summary = summarize_trees(forest.predict_per_tree(input_df))
+    >>> summary.loc[0, ["AQI_Lower", "AQI_Upper", "P_Poor"]]
+    """
+    lower, upper = np.quantile(per_tree, quantiles, axis=1)
+    summary = pd.DataFrame({
+        "Predicted_AQI": per_tree.mean(axis=1),
+        LOWER_COLUMN: lower,
+        UPPER_COLUMN: upper,
+    })
+    probabilities = bucket_probabilities(per_tree)
+    for i, name in enumerate(AQI_BUCKETS):
+        summary[PROBABILITY_PREFIX + name] = probabilities[:, i]
+    return summary
+
+
+def predict_interval(forest: ForestArrays, X,
+                     quantiles: Tuple[float, float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+    """
+    Mean prediction, quantile interval and bucket probabilities for each row.
+
+    Rows are processed in chunks so the (rows × trees) matrix stays small
+    for large batches.
+
+    Parameters
+    ----------
+    forest : ForestArrays
+        Flattened forest
+    X : pd.DataFrame or array-like
+        Input rows with the model's feature columns
+    quantiles : tuple of float, optional
+        Lower and upper quantile of the interval (default is 5% and 95%)
+
+    Returns
+    -------
+    pd.DataFrame
+        See ``summarize_trees``
+    """
+    X = forest._as_matrix(X)
+    parts = [summarize_trees(forest.predict_per_tree(X[i:i + CHUNK_ROWS]), quantiles)
+             for i in range(0, len(X), CHUNK_ROWS)]
+    if not parts:
+        return summarize_trees(np.empty((0, forest.n_trees)), quantiles)
+    return pd.concat(parts, ignore_index=True)
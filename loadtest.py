@@ -0,0 +1,623 @@
+"""
+Concurrent-Session Load Test for the Streamlit Pages
+
+Starts the app with ``streamlit run`` on a free local port and connects
+simulated analysts to it over Streamlit's websocket protocol, sending the
+same messages a browser sends. Every analyst uploads a file, filters the
+EDA charts or makes predictions. All sessions are served by the one server
+process, as in production: their scripts run as threads that share the GIL
+and the ``st.cache_resource``/``st.cache_data`` caches, so CPU and lock
+contention between sessions shows up in the timings.
+
+For every scenario the harness records the p50/p95 latency of each script
+rerun (from the rerun request to the server's "script finished" message;
+fragment reruns included) and the CPU time and peak resident memory (RSS)
+of the server process. Each scenario gets a fresh server so nothing is
+inherited from the previous one. Work done in the browser (drawing the
+page, fetching chart images) is not part of the timings. Results can be
+saved and compared with a baseline to catch regressions before deploying.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python loadtest.py                                   # all scenarios, 1/4/8 sessions
+    python loadtest.py --scenario eda_filter --sessions 2 4 8 --iterations 3
+    python loadtest.py --output results.json
+    python loadtest.py --baseline results.json           # exit code 1 on regression
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import base64
+import socket
+import struct
+import asyncio
+import argparse
+import resource
+import subprocess
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# URL path of each page (Streamlit derives them from the file names in pages/)
+PAGES = {
+    "app": "",
+    "overview": "Data_Overview",
+    "eda": "EDA",
+    "prediction": "Prediction",
+}
+
+# Upload used by the scenarios (a small file keeps the default run quick)
+DEFAULT_DATA = os.path.join("data_samples", "test_timeseries.csv")
+
+# Seconds one rerun may take before it counts as failed
+RERUN_TIMEOUT = 600
+
+# Seconds to wait for the server to answer its health check
+SERVER_START_TIMEOUT = 60
+
+# Allowed slowdown of p95 latency against a baseline before failing
+DEFAULT_TOLERANCE = 0.25
+
+# Element types the scenarios interact with
+WIDGET_KINDS = {"button", "checkbox", "file_uploader", "multiselect", "number_input", "radio", "selectbox"}
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one scenario at one concurrency level."""
+    scenario: str
+    sessions: int
+    reruns: int
+    errors: int
+    first_error: str
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    wall_s: float
+    cpu_s: float
+    cpu_percent: float
+    peak_rss_mb: float
+
+
+# ----------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Server:
+    """
+    The app under ``streamlit run``, on a free port of the loopback interface.
+
+    XSRF protection is turned off because the harness has no browser
+    cookies; nothing else differs from a normal deployment.
+    """
+
+    def __init__(self):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        command = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+                   "--server.headless", "true", "--server.address", "127.0.0.1",
+                   "--server.port", str(self.port), "--server.enableXsrfProtection", "false",
+                   "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+        self._children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        self.process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
+            try:
+                urllib.request.urlopen(f"{self.url}/_stcore/health", timeout=1).read()
+                return
+            except OSError:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.process.kill()
+                    raise RuntimeError(f"streamlit run did not start on port {self.port}")
+                time.sleep(0.1)
+
+    def cpu_seconds(self) -> Optional[float]:
+        """CPU time the server has used so far (None without /proc)."""
+        try:
+            with open(f"/proc/{self.process.pid}/stat") as f:
+                # Fields after the command name; utime and stime are the 12th and 13th
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def peak_rss_mb(self) -> Optional[float]:
+        """Peak resident memory of the server so far (None without /proc)."""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) / 1e3
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def stop(self) -> Tuple[float, float]:
+        """
+        Stop the server.
+
+        Returns
+        -------
+        tuple
+            ``(cpu_s, peak_rss_mb)`` of the whole server run from
+            ``getrusage``, used where /proc is not available
+        """
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime + after.ru_stime) - (self._children.ru_utime + self._children.ru_stime)
+        # ru_maxrss is KB on Linux and bytes on macOS
+        peak = after.ru_maxrss / 1e6 if sys.platform == "darwin" else after.ru_maxrss / 1e3
+        return cpu, peak
+
+
+# ----------------------------------------------------------------------
+# Websocket client
+# ----------------------------------------------------------------------
+class WebSocket:
+    """Minimal RFC 6455 client for binary messages (the harness needs nothing more)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, url: str, path: str) -> "WebSocket":
+        parts = urllib.parse.urlsplit(url)
+        host, port = parts.hostname, parts.port
+        reader, writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        # Streamlit expects its own name as the subprotocol
+        writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      f"Sec-WebSocket-Version: 13\r\nSec-WebSocket-Protocol: streamlit\r\n\r\n").encode())
+        status = await reader.readline()
+        if b" 101 " not in status:
+            raise ConnectionError(f"Websocket upgrade refused: {status.decode().strip()}")
+        while await reader.readline() not in (b"\r\n", b""):
+            pass
+        return cls(reader, writer)
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        # Client frames are always masked
+        mask = os.urandom(4)
+        n = len(payload)
+        if n < 126:
+            header = struct.pack(">BB", 0x80 | opcode, 0x80 | n)
+        elif n < 1 << 16:
+            header = struct.pack(">BBH", 0x80 | opcode, 0x80 | 126, n)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 0x80 | 127, n)
+        masked = np.frombuffer(payload, dtype=np.uint8) ^ np.resize(np.frombuffer(mask, dtype=np.uint8), n)
+        self.writer.write(header + mask + masked.tobytes())
+
+    async def send(self, payload: bytes) -> None:
+        self._write_frame(0x2, payload)
+        await self.writer.drain()
+
+    async def recv(self) -> bytes:
+        """Next complete data message; pings are answered on the way."""
+        parts = []
+        while True:
+            first, second = await self.reader.readexactly(2)
+            opcode, n = first & 0x0F, second & 0x7F
+            if n == 126:
+                n = struct.unpack(">H", await self.reader.readexactly(2))[0]
+            elif n == 127:
+                n = struct.unpack(">Q", await self.reader.readexactly(8))[0]
+            payload = await self.reader.readexactly(n)
+            if opcode == 0x8:
+                raise ConnectionError("The server closed the websocket")
+            if opcode == 0x9:
+                self._write_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            parts.append(payload)
+            if first & 0x80:
+                return b"".join(parts)
+
+    async def close(self) -> None:
+        try:
+            self._write_frame(0x8, struct.pack(">H", 1000))
+            await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        self.writer.close()
+
+
+# ----------------------------------------------------------------------
+# Sessions
+# ----------------------------------------------------------------------
+@dataclass
+class Widget:
+    """A widget as last rendered: its element proto and enclosing fragment."""
+    kind: str
+    proto: object
+    fragment_id: str
+
+
+class Session:
+    """
+    One simulated analyst: a browser tab connected to the server.
+
+    Parameters
+    ----------
+    server : Server
+        Running app
+    data : bytes
+        CSV file the analyst uploads
+    data_name : str
+        File name shown to the uploader
+    """
+
+    def __init__(self, server: Server, data: bytes, data_name: str):
+        self.server = server
+        self.data = data
+        self.data_name = data_name
+        self.socket: Optional[WebSocket] = None
+        self.session_id = ""
+        self.page = ""
+        self.page_hashes: Dict[str, str] = {}
+        self.widgets: Dict[Tuple[str, str], Widget] = {}
+        self.states: Dict[str, object] = {}
+        self.triggers: List[object] = []
+        self.has_data = False
+        self.timings: List[float] = []
+        self.errors = 0
+        self.first_error = ""
+
+    def record_error(self, message: str) -> None:
+        self.errors += 1
+        self.first_error = self.first_error or message[:200]
+
+    async def _receive(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = ForwardMsg()
+        msg.ParseFromString(await self.socket.recv())
+        return msg
+
+    async def open(self, page: str) -> None:
+        """Navigate to ``page`` (a key of ``PAGES``) and run it."""
+        if self.socket is None:
+            self.socket = await WebSocket.connect(self.server.url, "/_stcore/stream")
+        self.page = PAGES[page]
+        self.widgets, self.states = {}, {}
+        await self.run()
+
+    async def run(self, fragment_id: str = "") -> None:
+        """Rerun the page (or one fragment) with the current widget values, timing it."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        client = msg.rerun_script
+        client.query_string = ""
+        client.page_name = self.page
+        client.page_script_hash = self.page_hashes.get(self.page, "")
+        client.fragment_id = fragment_id
+        client.widget_states.widgets.extend(list(self.states.values()) + self.triggers)
+        self.triggers = []
+
+        start = time.perf_counter()
+        await self.socket.send(msg.SerializeToString())
+        await asyncio.wait_for(self._until_finished(), RERUN_TIMEOUT)
+        self.timings.append((time.perf_counter() - start) * 1000)
+
+    async def _until_finished(self) -> None:
+        while True:
+            msg = await self._receive()
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.session_id = msg.new_session.initialize.session_id or self.session_id
+            elif kind == "navigation":
+                for page in msg.navigation.app_pages:
+                    self.page_hashes[page.url_pathname] = page.page_script_hash
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    self.record_error(element.exception.message)
+                elif element_kind in WIDGET_KINDS:
+                    proto = getattr(element, element_kind)
+                    self.widgets[(element_kind, proto.label)] = Widget(element_kind, proto, msg.delta.fragment_id)
+            elif kind == "script_finished":
+                if msg.script_finished == msg.FINISHED_WITH_COMPILE_ERROR:
+                    self.record_error(f"Compile error on page {self.page or 'app'}")
+                return
+
+    def widget(self, kind: str, label: str) -> Widget:
+        try:
+            return self.widgets[(kind, label)]
+        except KeyError:
+            raise LookupError(f"No {kind} labelled {label!r} on page {self.page or 'app'}") from None
+
+    async def set_value(self, kind: str, label: str, value) -> None:
+        """Change a widget like a user would, then rerun its page or fragment."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget = self.widget(kind, label)
+        state = WidgetState(id=widget.proto.id)
+        if kind == "checkbox":
+            state.bool_value = bool(value)
+        elif kind == "number_input":
+            state.double_value = float(value)
+        elif kind == "multiselect":
+            state.string_array_value.data.extend(value)
+        elif "raw_value" in widget.proto.DESCRIPTOR.fields_by_name:
+            state.string_value = value
+        else:
+            # Older releases send the index of a radio option
+            state.int_value = list(widget.proto.options).index(value)
+        self.states[widget.proto.id] = state
+        await self.run(widget.fragment_id)
+
+    async def click(self, label: str) -> None:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget = self.widget("button", label)
+        self.triggers.append(WidgetState(id=widget.proto.id, trigger_value=True))
+        await self.run(widget.fragment_id)
+
+    async def upload(self, label: str) -> None:
+        """Upload this session's file through the file uploader ``label``."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget = self.widget("file_uploader", label)
+        request = BackMsg()
+        request.file_urls_request.request_id = uuid.uuid4().hex
+        request.file_urls_request.file_names.append(self.data_name)
+        request.file_urls_request.session_id = self.session_id
+        await self.socket.send(request.SerializeToString())
+        while True:
+            msg = await self._receive()
+            if msg.WhichOneof("type") == "file_urls_response" \
+                    and msg.file_urls_response.response_id == request.file_urls_request.request_id:
+                break
+        urls = msg.file_urls_response.file_urls[0]
+        await asyncio.to_thread(self._put_file, urllib.parse.urljoin(self.server.url, urls.upload_url))
+
+        state = WidgetState(id=widget.proto.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id = urls.file_id
+        info.name = self.data_name
+        info.size = len(self.data)
+        info.file_urls.CopyFrom(urls)
+        self.states[widget.proto.id] = state
+        await self.run(widget.fragment_id)
+        self.has_data = True
+
+    def _put_file(self, url: str) -> None:
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; "
+                f"filename=\"{self.data_name}\"\r\nContent-Type: text/csv\r\n\r\n").encode() \
+            + self.data + f"\r\n--{boundary}--\r\n".encode()
+        request = urllib.request.Request(url, data=body, method="PUT",
+                                         headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+        urllib.request.urlopen(request, timeout=RERUN_TIMEOUT).read()
+
+    async def close(self) -> None:
+        if self.socket is not None:
+            await self.socket.close()
+
+
+# ----------------------------------------------------------------------
+# Scenario steps
+# ----------------------------------------------------------------------
+async def landing(session: Session) -> None:
+    await session.open("app")
+
+
+async def upload(session: Session) -> None:
+    await session.open("overview")
+    sources = session.widgets.get(("radio", "Data Source"))
+    if sources is not None and sources.proto.options[sources.proto.default] != "Upload a file":
+        # The preloaded dataset is the default source when it exists
+        await session.set_value("radio", "Data Source", "Upload a file")
+    await session.upload("Upload Air Quality File")
+
+
+async def eda_filter(session: Session) -> None:
+    if not session.has_data:
+        await upload(session)
+    await session.open("eda")
+    cities = session.widget("selectbox", "Select City")
+    options = [c for c in cities.proto.options if c != "All"]
+    if options:
+        await session.set_value("selectbox", "Select City", options[0])
+    await session.set_value("selectbox", "Select Column for Histogram", "PM10")
+    await session.set_value("multiselect", "Select Pollutants to Plot", ["PM10", "NO2"])
+
+
+async def predict(session: Session) -> None:
+    await session.open("prediction")
+    await session.set_value("number_input", "PM2.5 (μg/m³)", 250.0)
+    await session.set_value("number_input", "PM10 (μg/m³)", 350.0)
+    await session.click("🔮 Predict AQI")
+
+
+async def mixed(session: Session) -> None:
+    await landing(session)
+    await upload(session)
+    await eda_filter(session)
+    await predict(session)
+
+
+SCENARIOS: Dict[str, Callable[[Session], Awaitable[None]]] = {
+    "landing": landing,
+    "upload": upload,
+    "eda_filter": eda_filter,
+    "predict": predict,
+    "mixed": mixed,
+}
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+async def _run_session(name: str, iterations: int, session: Session) -> None:
+    try:
+        for _ in range(iterations):
+            try:
+                await SCENARIOS[name](session)
+            except (LookupError, ConnectionError, OSError, asyncio.TimeoutError) as exc:
+                # Failures seen by the harness (a missing widget, a lost connection, a timeout)
+                session.record_error(f"{type(exc).__name__}: {exc}")
+    finally:
+        await session.close()
+
+
+async def _run_sessions(name: str, iterations: int, sessions: List[Session]) -> None:
+    await asyncio.gather(*(_run_session(name, iterations, session) for session in sessions))
+
+
+def run_scenario(name: str, sessions: int, iterations: int = 1,
+                 data_path: str = DEFAULT_DATA) -> ScenarioResult:
+    """
+    Run ``sessions`` concurrent analysts through scenario ``name``.
+
+    A fresh server is started for the scenario; the analysts connect to it
+    at the same time and each repeats the scenario ``iterations`` times.
+
+    Parameters
+    ----------
+    name : str
+        Key of ``SCENARIOS``
+    sessions : int
+        Concurrent simulated sessions (websocket connections)
+    iterations : int, optional
+        Times each session repeats the scenario (default is 1)
+    data_path : str, optional
+        CSV file uploaded by the sessions
+
+    Returns
+    -------
+    ScenarioResult
+        CPU time and peak RSS are those of the server process
+    """
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {name}")
+    data_path = os.path.join(ROOT, data_path)
+    with open(data_path, "rb") as f:
+        data = f.read()
+
+    server = Server()
+    try:
+        analysts = [Session(server, data, os.path.basename(data_path)) for _ in range(sessions)]
+        cpu_start = server.cpu_seconds()
+        wall_start = time.perf_counter()
+        asyncio.run(_run_sessions(name, iterations, analysts))
+        wall = time.perf_counter() - wall_start
+        cpu_end, peak = server.cpu_seconds(), server.peak_rss_mb()
+    finally:
+        total_cpu, total_peak = server.stop()
+    # Without /proc the whole server run (start-up included) is reported
+    cpu = cpu_end - cpu_start if cpu_start is not None and cpu_end is not None else total_cpu
+    peak = peak if peak is not None else total_peak
+
+    timings = np.array([t for s in analysts for t in s.timings])
+    p50, p95 = np.percentile(timings, [50, 95]) if timings.size else (np.nan, np.nan)
+    return ScenarioResult(
+        scenario=name,
+        sessions=sessions,
+        reruns=int(timings.size),
+        errors=sum(s.errors for s in analysts),
+        first_error=next((s.first_error for s in analysts if s.first_error), ""),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        max_ms=float(timings.max()) if timings.size else float("nan"),
+        wall_s=wall,
+        cpu_s=cpu,
+        cpu_percent=100 * cpu / wall if wall else 0.0,
+        peak_rss_mb=peak,
+    )
+
+
+def find_regressions(results: List[ScenarioResult], baseline: List[Dict],
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare p95 latency and peak RSS with a saved baseline.
+
+    Returns
+    -------
+    list of str
+        One message per (scenario, sessions) that got worse by more than
+        ``tolerance`` (a fraction), or started to fail
+    """
+    previous = {(row["scenario"], row["sessions"]): row for row in baseline}
+    problems = []
+    for result in results:
+        old = previous.get((result.scenario, result.sessions))
+        if old is None:
+            continue
+        label = f"{result.scenario} x{result.sessions}"
+        if result.errors > old["errors"]:
+            problems.append(f"{label}: {result.errors} errors (baseline {old['errors']})")
+        for metric in ("p95_ms", "peak_rss_mb"):
+            new_value, old_value = getattr(result, metric), old[metric]
+            if old_value and new_value > old_value * (1 + tolerance):
+                problems.append(f"{label}: {metric} {new_value:.1f} vs baseline {old_value:.1f}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit pages with concurrent sessions")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--iterations", type=int, default=1, help="repeats per session")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="CSV file the sessions upload")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    # Scenarios run from the project directory; keep user paths valid there
+    if args.data != DEFAULT_DATA:
+        args.data = os.path.abspath(args.data)
+
+    results = []
+    header = f"{'scenario':<12}{'sessions':>9}{'reruns':>8}{'errors':>7}{'p50 ms':>10}{'p95 ms':>10}" \
+             f"{'cpu %':>8}{'peak MB':>9}"
+    print(header)
+    for name in args.scenario:
+        for sessions in args.sessions:
+            result = run_scenario(name, sessions, args.iterations, args.data)
+            results.append(result)
+            print(f"{result.scenario:<12}{result.sessions:>9}{result.reruns:>8}{result.errors:>7}"
+                  f"{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}{result.cpu_percent:>8.0f}"
+                  f"{result.peak_rss_mb:>9.0f}")
+            if result.first_error:
+                print(f"    first error: {result.first_error}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = find_regressions(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        sys.exit(1 if problems else 0)
@@ -0,0 +1,382 @@
+"""
+Latency-Budgeted Model Selection
+
+The notebook picks the model by R² alone and ships a 300-tree, depth-15
+forest, whatever it costs to serve. This tool starts from that trained
+forest and builds cheaper variants:
+
+- the best N trees of the forest, chosen greedily on validation data
+- forests retrained with a shallower ``max_depth``
+- a single shallow tree distilled from the forest's own predictions
+
+Each variant is measured for accuracy (R², MAE) and for p50/p99 latency
+of single-row and batch prediction and model size. The most accurate
+variant that fits the configured budget is refit on all rows (see
+``refit_variant``), written as the deployed model and published to the model registry (with its report row as the version's
+metrics), since the app serves the registry's current version whenever
+one exists.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python model_budget.py                                # report only
+    python model_budget.py --deploy --single-p99-ms 20 --max-mb 40
+"""
+
+import io
+import os
+import copy
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forest_arrays import ForestArrays
+from model_registry import REGISTRY_DIR, publish
+from schema import FEATURE_COLUMNS, NUMERIC_COLUMNS, coerce_frame
+from warmup import MODEL_PATH
+
+
+# Rows per call for the batch latency measurement
+BATCH_ROWS = 1000
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Serving limits a deployed model must fit."""
+    single_p99_ms: float = 25.0   # one prediction on the Prediction page
+    batch_p99_ms: float = 250.0   # one call scoring BATCH_ROWS rows
+    max_mb: float = 50.0          # size of the saved model file
+
+
+def model_size_mb(model) -> float:
+    """Size of the model as saved by joblib, in MB."""
+    import joblib
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.tell() / 1e6
+
+
+def forest_subset(model, indices: Sequence[int]):
+    """Copy of a fitted forest that keeps only the trees at ``indices``."""
+    subset = copy.copy(model)
+    subset.estimators_ = [model.estimators_[i] for i in indices]
+    subset.n_estimators = len(subset.estimators_)
+    return subset
+
+
+def greedy_tree_order(per_tree: np.ndarray, y: np.ndarray, max_trees: int) -> List[int]:
+    """
+    Order trees by forward selection on validation error.
+
+    At each step the tree whose addition gives the lowest mean squared error
+    of the averaged prediction is added. All candidates are scored at once
+    from the (rows × trees) prediction matrix.
+
+    Parameters
+    ----------
+    per_tree : np.ndarray
+        Per-tree validation predictions, shape (rows, trees)
+    y : np.ndarray
+        Validation targets
+    max_trees : int
+        Number of trees to select
+
+    Returns
+    -------
+    list of int
+        Tree indices in selection order (the first N form the best N-tree subset)
+    """
+    n_trees = per_tree.shape[1]
+    remaining = np.arange(n_trees)
+    running_sum = np.zeros(len(y))
+    order: List[int] = []
+    for k in range(min(max_trees, n_trees)):
+        candidates = (running_sum[:, None] + per_tree[:, remaining]) / (k + 1)
+        errors = ((candidates - y[:, None]) ** 2).mean(axis=0)
+        best = int(np.argmin(errors))
+        order.append(int(remaining[best]))
+        running_sum += per_tree[:, remaining[best]]
+        remaining = np.delete(remaining, best)
+    return order
+
+
+def build_variants(model, X_train: pd.DataFrame, y_train: pd.Series,
+                   X_val: pd.DataFrame, y_val: pd.Series,
+                   tree_counts: Sequence[int] = (10, 25, 50, 100),
+                   depths: Sequence[int] = (8, 10, 12),
+                   distill_depths: Sequence[int] = (8, 12)) -> Dict[str, object]:
+    """
+    Build the smaller variants of a fitted random forest.
+
+    Parameters
+    ----------
+    model : RandomForestRegressor
+        Trained forest (the reference variant)
+    X_train, y_train : pd.DataFrame, pd.Series
+        Data used to retrain shallower forests and to distill the single tree
+    X_val, y_val : pd.DataFrame, pd.Series
+        Data used to choose the greedy tree subsets
+    tree_counts : sequence of int, optional
+        Sizes of the greedy subsets
+    depths : sequence of int, optional
+        ``max_depth`` values of the retrained forests (only those below the
+        reference depth are built)
+    distill_depths : sequence of int, optional
+        Depths of the distilled single trees
+
+    Returns
+    -------
+    dict
+        Variant name → fitted model, starting with the reference forest
+    """
+    from sklearn.base import clone
+    from sklearn.tree import DecisionTreeRegressor
+
+    variants: Dict[str, object] = {f"forest ({len(model.estimators_)} trees)": model}
+
+    # Greedy subsets: per-tree predictions in one pass over the flattened forest
+    per_tree = ForestArrays.from_model(model, list(X_val.columns)).predict_per_tree(X_val)
+    order = greedy_tree_order(per_tree, np.asarray(y_val, dtype=float), max(tree_counts))
+    for count in tree_counts:
+        if count < len(model.estimators_):
+            variants[f"greedy {count} trees"] = forest_subset(model, order[:count])
+
+    reference_depth = model.max_depth or max(e.tree_.max_depth for e in model.estimators_)
+    for depth in depths:
+        if depth < reference_depth:
+            variants[f"forest depth {depth}"] = clone(model).set_params(max_depth=depth).fit(X_train, y_train)
+
+    # The student learns the forest's predictions, not the noisy labels
+    teacher = model.predict(X_train)
+    for depth in distill_depths:
+        student = DecisionTreeRegressor(max_depth=depth, random_state=42)
+        variants[f"distilled tree depth {depth}"] = student.fit(X_train, teacher)
+    return variants
+
+
+def refit_variant(name: str, model, reference, X: pd.DataFrame, y: pd.Series):
+    """
+    Retrain a selected variant on all rows before it is deployed.
+
+    Variants are fitted on the training split so they can be compared on
+    held-out rows; the deployed model should learn from every row, like the
+    forest the notebook ships. Forests (reference or shallower) are refit
+    with the same settings and distilled trees learn from a reference
+    forest refit on all rows.
+
+    Greedy tree subsets are returned unchanged: which trees to keep was
+    chosen on validation rows the forest had not seen, and a forest refit
+    on all rows has different trees and no unseen rows left to choose with.
+
+    Parameters
+    ----------
+    name : str
+        Variant name from ``build_variants``
+    model : estimator
+        The variant as fitted on the training split
+    reference : RandomForestRegressor
+        Reference forest passed to ``build_variants``
+    X, y : pd.DataFrame, pd.Series
+        All rows
+
+    Returns
+    -------
+    estimator
+        Model to deploy
+    """
+    from sklearn.base import clone
+
+    if name.startswith("greedy"):
+        return model
+    if name.startswith("distilled"):
+        teacher = clone(reference).fit(X, y).predict(X)
+        return clone(model).fit(X, teacher)
+    return clone(model).fit(X, y)
+
+
+def measure_latency(model, X: pd.DataFrame, repeat: int, batch_rows: int = BATCH_ROWS,
+                    seed: int = 0) -> Dict[str, float]:
+    """
+    p50/p99 latency (ms) of single-row and batch ``predict`` calls.
+
+    Parameters
+    ----------
+    model : estimator
+        Fitted model
+    X : pd.DataFrame
+        Rows to sample inputs from
+    repeat : int
+        Number of timed calls per mode
+    batch_rows : int, optional
+        Rows per batch call (default is ``BATCH_ROWS``)
+    seed : int, optional
+        Seed for the row sampling
+
+    Returns
+    -------
+    dict
+        ``single_p50_ms``, ``single_p99_ms``, ``batch_p50_ms``, ``batch_p99_ms``
+    """
+    rng = np.random.default_rng(seed)
+    model.predict(X.iloc[:1])  # first call pays one-off costs
+
+    def timed(rows: int) -> np.ndarray:
+        times = []
+        for _ in range(repeat):
+            start_row = int(rng.integers(0, max(len(X) - rows, 0) + 1))
+            batch = X.iloc[start_row:start_row + rows]
+            start = time.perf_counter()
+            model.predict(batch)
+            times.append((time.perf_counter() - start) * 1000)
+        return np.percentile(times, [50, 99])
+
+    single = timed(1)
+    batch = timed(min(batch_rows, len(X)))
+    return {
+        "single_p50_ms": single[0], "single_p99_ms": single[1],
+        "batch_p50_ms": batch[0], "batch_p99_ms": batch[1],
+    }
+
+
+def evaluate_variants(variants: Dict[str, object], X_test: pd.DataFrame, y_test: pd.Series,
+                      repeat: int = 100) -> pd.DataFrame:
+    """
+    Accuracy, latency and size of every variant.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per variant: ``Variant``, ``R2``, ``MAE``, latency columns
+        (see ``measure_latency``) and ``Size_MB``
+    """
+    from sklearn.metrics import r2_score, mean_absolute_error
+
+    rows = []
+    for name, model in variants.items():
+        pred = model.predict(X_test)
+        row = {"Variant": name, "R2": r2_score(y_test, pred), "MAE": mean_absolute_error(y_test, pred)}
+        row.update(measure_latency(model, X_test, repeat))
+        row["Size_MB"] = model_size_mb(model)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def within_budget(report: pd.DataFrame, budget: Budget) -> pd.Series:
+    """Boolean mask of the variants that fit every limit of ``budget``."""
+    return ((report["single_p99_ms"] <= budget.single_p99_ms)
+            & (report["batch_p99_ms"] <= budget.batch_p99_ms)
+            & (report["Size_MB"] <= budget.max_mb))
+
+
+def select_variant(report: pd.DataFrame, budget: Budget) -> Optional[str]:
+    """
+    Name of the most accurate (highest R²) variant within ``budget``.
+
+    Returns
+    -------
+    str or None
+        Variant name, or None if no variant fits
+    """
+    fits = report[within_budget(report, budget)]
+    if fits.empty:
+        return None
+    return str(fits.sort_values("R2", ascending=False).iloc[0]["Variant"])
+
+
+def deploy_model(model, path: str = MODEL_PATH, registry: Optional[str] = REGISTRY_DIR,
+                 metrics: Optional[Dict[str, float]] = None, note: str = "") -> Optional[Dict]:
+    """
+    Write ``model`` to ``path`` and publish it as the registry's current version.
+
+    The file is written atomically (the app never sees a half-written file).
+    Publishing matters because the app ignores ``aqi_model.pkl`` once the
+    registry has a current version.
+
+    Parameters
+    ----------
+    model : estimator
+        Model to deploy
+    path : str, optional
+        joblib file to write (default is ``aqi_model.pkl``)
+    registry : str or None, optional
+        Registry directory to publish to; None only writes ``path``
+    metrics : dict, optional
+        Stored in the version's manifest (e.g. the variant's budget report)
+    note : str, optional
+        Free text stored in the manifest
+
+    Returns
+    -------
+    dict or None
+        Manifest of the published version, or None if not published
+    """
+    import joblib
+
+    tmp = f"{path}.tmp"
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    if registry is None:
+        return None
+    return publish(path, registry, note=note, metrics=metrics)
+
+
+def load_training_data(path: str = "India_air.csv") -> Tuple[pd.DataFrame, pd.Series]:
+    """Features and target prepared the same way as in the notebook."""
+    df = coerce_frame(pd.read_csv(path))
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].fillna(df[NUMERIC_COLUMNS].median())
+    df = df.drop_duplicates()
+    return df[FEATURE_COLUMNS], df["AQI"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build smaller model variants and pick one within a latency budget")
+    parser.add_argument("--data", default="India_air.csv")
+    parser.add_argument("--model", default=MODEL_PATH, help="forest whose settings are used as the reference")
+    parser.add_argument("--single-p99-ms", type=float, default=Budget.single_p99_ms)
+    parser.add_argument("--batch-p99-ms", type=float, default=Budget.batch_p99_ms)
+    parser.add_argument("--max-mb", type=float, default=Budget.max_mb)
+    parser.add_argument("--repeat", type=int, default=100, help="timed calls per latency mode")
+    parser.add_argument("--deploy", action="store_true", help="write the selected variant to --output and publish it")
+    parser.add_argument("--output", default=MODEL_PATH)
+    parser.add_argument("--registry", default=REGISTRY_DIR, help="registry the deployed variant is published to")
+    args = parser.parse_args()
+
+    import joblib
+    from sklearn.model_selection import train_test_split
+
+    X, y = load_training_data(args.data)
+    # Same split as the notebook; the test part is split again for the greedy selection
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_val, X_test, y_val, y_test = train_test_split(X_test, y_test, test_size=0.5, random_state=42)
+
+    # The deployed forest was refit on all rows, so it is retrained on the
+    # training split first; otherwise it would be scored on rows it has seen
+    from sklearn.base import clone
+    reference = clone(joblib.load(args.model)).fit(X_train, y_train)
+
+    variants = build_variants(reference, X_train, y_train, X_val, y_val)
+    report = evaluate_variants(variants, X_test, y_test, args.repeat)
+    budget = Budget(args.single_p99_ms, args.batch_p99_ms, args.max_mb)
+    report["Fits"] = within_budget(report, budget)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    selected = select_variant(report, budget)
+    if selected is None:
+        print("\nNo variant fits the budget; the deployed model was not changed.")
+    else:
+        print(f"\nSelected: {selected}")
+        if args.deploy:
+            row = report[report["Variant"] == selected].iloc[0]
+            metrics = {name: float(row[name]) for name in report.columns if name not in ("Variant", "Fits")}
+            # The report scores the split-trained variant; the deployed one sees all rows
+            model = refit_variant(selected, variants[selected], reference, X, y)
+            manifest = deploy_model(model, args.output, args.registry,
+                                    metrics=metrics, note=f"model_budget: {selected}")
+            print(f"Saved to {args.output} and published as {manifest['version']}")
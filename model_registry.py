@@ -0,0 +1,483 @@
+"""
+Versioned Model Registry with Hot Swap
+
+The Prediction page used to load ``aqi_model.pkl`` once per process and
+keep it forever, so a new model needed an app restart, and the first
+request after the restart paid for loading it. Models are now published
+to a registry directory:
+
+    model_registry/
+        CURRENT                     name of the active version
+        versions/v0001/model.pkl
+        versions/v0001/manifest.json
+        versions/v0002/...
+
+Publishing writes the version to a staging directory and renames it into
+place, then moves the ``CURRENT`` pointer with ``os.replace``, so readers
+see either the old or the new version and never a partial one. Rolling
+back is pointing ``CURRENT`` at an older version.
+
+Each app process keeps a ``LiveModel``. A watcher thread polls the
+pointer; when it moves, the new version is loaded and warmed up in the
+background (predictions on a batch of rows, the flattened forest built
+and checked against the model) while the old version keeps serving. Only
+then is the handle swapped, in one assignment. A version that fails to
+load or warm up is never served. Without a registry the app uses
+``aqi_model.pkl`` as before, and reloads it the same way when the file is
+replaced.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python model_registry.py publish aqi_model.pkl --note "forest, 300 trees"
+    python model_registry.py list
+    python model_registry.py activate v0001            # roll back
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from schema import FEATURE_COLUMNS
+from warmup import MODEL_PATH
+
+
+REGISTRY_DIR = "model_registry"
+CURRENT = "CURRENT"
+MANIFEST = "manifest.json"
+ARTIFACT = "model.pkl"
+REGISTRY_VERSION = 1
+
+# Seconds between checks of the CURRENT pointer (AQI_MODEL_POLL overrides)
+POLL_SECONDS = 5.0
+POLL_ENV_VAR = "AQI_MODEL_POLL"
+
+# Rows predicted while warming up a new version
+WARMUP_ROWS = 256
+
+
+def _versions_dir(registry: str) -> str:
+    return os.path.join(registry, "versions")
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def list_versions(registry: str = REGISTRY_DIR) -> List[Dict]:
+    """Manifests of all published versions, oldest first."""
+    root = _versions_dir(registry)
+    if not os.path.isdir(root):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(root)):
+        manifest = read_version_manifest(name, registry)
+        if manifest is not None:
+            manifests.append(manifest)
+    return manifests
+
+
+def read_version_manifest(version: str, registry: str = REGISTRY_DIR) -> Optional[Dict]:
+    """The manifest of one version, or None if it does not exist."""
+    try:
+        with open(os.path.join(_versions_dir(registry), version, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("registry_version") == REGISTRY_VERSION else None
+
+
+def current_version(registry: str = REGISTRY_DIR) -> Optional[str]:
+    """Name of the active version, or None if nothing was published."""
+    try:
+        with open(os.path.join(registry, CURRENT)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return version or None
+
+
+def check_model(path: str, label: str = "candidate") -> "ModelHandle":
+    """
+    Load and warm up a model file the same way a serving process would.
+
+    Raises
+    ------
+    ValueError
+        If the model cannot be loaded, is not a forest that can be
+        flattened, or fails its warm-up (see ``load_handle``)
+    """
+    try:
+        return load_handle(label, path)
+    except Exception as exc:
+        raise ValueError(f"Model {label} cannot be served: {exc}") from exc
+
+
+def activate(version: str, registry: str = REGISTRY_DIR, check: bool = True) -> None:
+    """
+    Point ``CURRENT`` at ``version`` atomically.
+
+    Parameters
+    ----------
+    version : str
+        Published version, e.g. "v0002"
+    registry : str, optional
+        Registry directory
+    check : bool, optional
+        Load and warm up the version first, so a model the app could not
+        serve never becomes current (default True)
+
+    Raises
+    ------
+    ValueError
+        If the version was not published or fails the check
+    """
+    if read_version_manifest(version, registry) is None:
+        raise ValueError(f"Unknown model version: {version}")
+    if check:
+        check_model(os.path.join(_versions_dir(registry), version, ARTIFACT), version)
+    tmp = os.path.join(registry, f"{CURRENT}.tmp-{os.getpid()}")
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(registry, CURRENT))
+
+
+def publish(model_path: str, registry: str = REGISTRY_DIR, note: str = "",
+            metrics: Optional[Dict[str, float]] = None, make_current: bool = True,
+            check: bool = True) -> Dict:
+    """
+    Copy a model file into the registry as the next version.
+
+    Parameters
+    ----------
+    model_path : str
+        joblib model file
+    registry : str, optional
+        Registry directory (created if needed)
+    note : str, optional
+        Free text stored in the manifest
+    metrics : dict, optional
+        Evaluation results stored in the manifest (e.g. from ``backtest.py``)
+    make_current : bool, optional
+        Also move ``CURRENT`` to the new version (default True)
+    check : bool, optional
+        Load and warm up the model before publishing it (default True)
+
+    Returns
+    -------
+    dict
+        The new version's manifest
+
+    Raises
+    ------
+    ValueError
+        If ``check`` is set and the model could not be served (for
+        example a model that is not a tree forest)
+    """
+    if check:
+        check_model(model_path, os.path.basename(model_path))
+    root = _versions_dir(registry)
+    os.makedirs(root, exist_ok=True)
+    numbers = [int(name[1:]) for name in os.listdir(root) if name.startswith("v") and name[1:].isdigit()]
+    version = f"v{max(numbers, default=0) + 1:04d}"
+
+    staging = os.path.join(root, f".{version}.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    artifact = os.path.join(staging, ARTIFACT)
+    shutil.copyfile(model_path, artifact)
+    manifest = {
+        "registry_version": REGISTRY_VERSION,
+        "version": version,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "source": os.path.basename(model_path),
+        "sha256": _file_sha256(artifact),
+        "bytes": os.path.getsize(artifact),
+        "features": list(FEATURE_COLUMNS),
+        "note": note,
+        "metrics": metrics or {},
+    }
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    # Fails instead of overwriting if another publisher took the same number
+    os.rename(staging, os.path.join(root, version))
+
+    if make_current:
+        activate(version, registry, check=False)  # The file was checked above, if asked to
+    return manifest
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    """A loaded, warmed-up model version; swapped as a whole."""
+    model: object
+    forest: object                    # ForestArrays of the model
+    version: str
+    manifest: Dict = field(default_factory=dict)
+    path: str = ""
+    load_seconds: float = 0.0
+    warmup_seconds: float = 0.0
+
+
+def resolve(registry: str = REGISTRY_DIR, fallback: str = MODEL_PATH) -> Optional[Tuple[str, str, Dict]]:
+    """
+    The model that should be served now.
+
+    Returns
+    -------
+    tuple or None
+        ``(key, path, manifest)``: the registry's current version, else the
+        fallback file (keyed by its modification time so a replaced file is
+        noticed), else None
+    """
+    version = current_version(registry)
+    if version is not None:
+        manifest = read_version_manifest(version, registry)
+        if manifest is not None:
+            return version, os.path.join(_versions_dir(registry), version, ARTIFACT), manifest
+    try:
+        stat = os.stat(fallback)
+    except OSError:
+        return None
+    manifest = {"version": "unversioned", "source": os.path.basename(fallback),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_mtime))}
+    return f"{fallback}@{stat.st_mtime_ns}", fallback, manifest
+
+
+def warmup_rows(n: int = WARMUP_ROWS):
+    """Deterministic pollutant rows spanning typical concentrations."""
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    rows = rng.gamma(2.0, 30.0, size=(n, len(FEATURE_COLUMNS)))
+    rows[0] = 0.0
+    return pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+
+
+def load_handle(version: str, path: str, manifest: Optional[Dict] = None) -> ModelHandle:
+    """
+    Load a model file and warm it up before it serves anyone.
+
+    The model predicts one row and a batch (the page's two code paths), its
+    forest is flattened, and the flattened forest must reproduce the
+    model's predictions.
+
+    Raises
+    ------
+    ValueError
+        If the model's predictions are not finite or the forest disagrees
+    """
+    import joblib
+    from forest_arrays import ForestArrays
+    from intervals import predict_interval
+
+    start = time.perf_counter()
+    model = joblib.load(path)
+    loaded = time.perf_counter()
+
+    rows = warmup_rows()
+    model.predict(rows.iloc[:1])
+    predictions = model.predict(rows)
+    forest = ForestArrays.from_model(model, FEATURE_COLUMNS)
+    predict_interval(forest, rows)
+    if not np.isfinite(predictions).all():
+        raise ValueError(f"Model {version} returns non-finite predictions")
+    if not np.allclose(forest.predict(rows), predictions, rtol=1e-6, atol=1e-6):
+        raise ValueError(f"Flattened forest of model {version} does not match the model")
+    done = time.perf_counter()
+    return ModelHandle(model, forest, version, dict(manifest or {}), path, loaded - start, done - loaded)
+
+
+class LiveModel:
+    """
+    The model a process serves, swapped to new versions without downtime.
+
+    ``current()`` always returns a complete handle: the old one until the
+    new version has loaded and warmed up in a background thread.
+
+    Parameters
+    ----------
+    registry : str, optional
+        Registry directory
+    fallback : str, optional
+        Model file used when nothing was published
+    poll_seconds : float, optional
+        Interval of the watcher thread
+    """
+
+    def __init__(self, registry: str = REGISTRY_DIR, fallback: str = MODEL_PATH,
+                 poll_seconds: float = POLL_SECONDS):
+        self.registry = registry
+        self.fallback = fallback
+        self.poll_seconds = poll_seconds
+        self.last_error: Optional[str] = None
+        self._handle: Optional[ModelHandle] = None
+        self._key: Optional[str] = None
+        self._failed_key: Optional[str] = None
+        self._loading: Optional[Tuple[str, threading.Thread]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def loading(self) -> Optional[str]:
+        """Version being loaded in the background, if any."""
+        loading = self._loading
+        return loading[0] if loading else None
+
+    def available(self) -> bool:
+        """True if a model is served or can be loaded."""
+        return self._handle is not None or resolve(self.registry, self.fallback) is not None
+
+    def current(self, wait: bool = True) -> Optional[ModelHandle]:
+        """
+        The handle to predict with.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If no version has been loaded yet, load it and wait (only the
+            first request of a process that was not warmed up does this)
+
+        Returns
+        -------
+        ModelHandle or None
+            None if there is no model (or ``wait`` is False and none is loaded)
+        """
+        handle = self._handle
+        if handle is None and wait:
+            thread = self.check()
+            if thread is not None:
+                thread.join()
+            handle = self._handle
+        return handle
+
+    def check(self) -> Optional[threading.Thread]:
+        """
+        Start loading the version the registry points to, if it is new.
+
+        Returns
+        -------
+        threading.Thread or None
+            The loading thread (also when one was already running)
+        """
+        target = resolve(self.registry, self.fallback)
+        with self._lock:
+            if self._loading is not None:
+                return self._loading[1]
+            if target is None or target[0] in (self._key, self._failed_key):
+                return None
+            key, path, manifest = target
+            label = manifest["version"]
+            thread = threading.Thread(target=self._load, args=(key, label, path, manifest),
+                                      name=f"aqi-model-{label}", daemon=True)
+            self._loading = (label, thread)
+            thread.start()
+            return thread
+
+    def _load(self, key: str, label: str, path: str, manifest: Dict) -> None:
+        try:
+            handle = load_handle(label, path, manifest)
+        except Exception as exc:
+            # Keep serving the previous version; do not retry this one
+            with self._lock:
+                self._failed_key = key
+                self._loading = None
+                self.last_error = f"Model {label} was not activated: {exc}"
+            return
+        with self._lock:
+            self._handle = handle
+            self._key = key
+            self.last_error = None
+            self._loading = None
+
+    def start_watcher(self) -> bool:
+        """Poll the registry in a daemon thread; True if started by this call."""
+        with self._lock:
+            if self._watcher is not None:
+                return False
+            self._watcher = threading.Thread(target=self._watch, name="aqi-model-watcher", daemon=True)
+            self._watcher.start()
+            return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        """Stop the watcher thread."""
+        self._stop.set()
+
+
+_LIVE: Dict[Tuple[str, str], LiveModel] = {}
+_LIVE_LOCK = threading.Lock()
+
+
+def live_model(registry: str = REGISTRY_DIR, fallback: str = MODEL_PATH) -> LiveModel:
+    """
+    The process-wide ``LiveModel`` of a registry, with its watcher running.
+
+    Shared by every session, like ``st.cache_resource`` but able to change
+    version while the app runs.
+    """
+    key = (os.path.abspath(registry), os.path.abspath(fallback))
+    with _LIVE_LOCK:
+        live = _LIVE.get(key)
+        if live is None:
+            poll = float(os.environ.get(POLL_ENV_VAR, POLL_SECONDS))
+            live = _LIVE[key] = LiveModel(registry, fallback, poll)
+    live.start_watcher()
+    return live
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish, list and activate model versions")
+    parser.add_argument("--registry", default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    pub = sub.add_parser("publish", help="add a model file as the next version")
+    pub.add_argument("model", nargs="?", default=MODEL_PATH)
+    pub.add_argument("--note", default="")
+    pub.add_argument("--no-activate", action="store_true", help="publish without moving CURRENT")
+    pub.add_argument("--no-check", action="store_true", help="skip loading and warming up the model first")
+    sub.add_parser("list", help="show published versions")
+    act = sub.add_parser("activate", help="point CURRENT at a version (deploy or roll back)")
+    act.add_argument("version")
+    act.add_argument("--no-check", action="store_true", help="skip loading and warming up the version first")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        if not args.no_check:
+            handle = check_model(args.model)
+            print(f"Loaded in {handle.load_seconds:.2f} s, warmed up in {handle.warmup_seconds:.2f} s")
+        manifest = publish(args.model, args.registry, args.note, make_current=not args.no_activate,
+                           check=False)
+        state = "active" if not args.no_activate else "not active"
+        print(f"Published {manifest['version']} ({manifest['bytes'] / 1e6:.1f} MB, {state})")
+    elif args.command == "list":
+        active = current_version(args.registry)
+        for manifest in list_versions(args.registry):
+            marker = "*" if manifest["version"] == active else " "
+            print(f"{marker} {manifest['version']}  {manifest['created']}  "
+                  f"{manifest['bytes'] / 1e6:8.1f} MB  {manifest['source']}  {manifest['note']}")
+    else:
+        activate(args.version, args.registry, check=not args.no_check)
+        print(f"CURRENT -> {args.version}")
@@ -7,6 +7,7 @@ and provides an initial exploration of the data structure, including:
 - Dataset dimensions (rows × columns)
 - Column information (data types, non-null counts)
 - Missing value analysis
+- Export of the loaded data (CSV or Parquet), streamed chunk by chunk
 
 The uploaded dataset is stored in Streamlit's session state to be accessible
 across all pages of the dashboard.
@@ -27,21 +28,73 @@ import streamlit as st
 import pandas as pd
 from io import StringIO
 
+from schema import coerce_frame
+from store import DatasetStore, STORE_DIR
+from excel_reader import list_sheets, read_excel_cached
+from preloaded import default_dataset, known_fingerprint
+from export import EXPORT_FORMATS, EXPORT_MIME_TYPES, export_columns, export_file
+
 # Page title with emoji for visual appeal
 st.title("📊 Data Overview")
 
-# File uploader widget
-# Accepts both CSV and Excel formats for flexibility
-uploaded = st.file_uploader("Upload Air Quality File", type=["csv", "xlsx"])
-
-if uploaded:
-    # Load data based on file extension
-    # Using conditional logic to handle different file formats
-    if uploaded.name.endswith(".csv"):
-        df = pd.read_csv(uploaded)
-    else:
-        # For .xlsx files, requires openpyxl library
-        df = pd.read_excel(uploaded)
+# The partitioned store (built by the notebook or `python store.py ingest`)
+# and the preloaded dataset (`python preloaded.py build` at deploy time)
+# are offered as data sources only when they actually exist
+store = DatasetStore(STORE_DIR)
+preloaded = default_dataset()
+sources = ["Upload a file"]
+if preloaded is not None:
+    # Ready without an upload, so it is the default source
+    sources.insert(0, "Preloaded dataset")
+if store.exists():
+    sources.append("Load from dataset store")
+# A session that already has its own data (an upload or a store read) does
+# not start on the preloaded source, which would replace that data
+has_own_data = 'df' in st.session_state and known_fingerprint(st.session_state['df']) is None
+default_source = sources.index("Upload a file") if has_own_data else 0
+source = st.radio("Data Source", sources, index=default_source, horizontal=True)
+
+df = None
+
+if source == "Upload a file":
+    # File uploader widget
+    # Accepts both CSV and Excel formats for flexibility
+    uploaded = st.file_uploader("Upload Air Quality File", type=["csv", "xlsx"])
+
+    if uploaded:
+        # Load data based on file extension
+        # Using conditional logic to handle different file formats
+        if uploaded.name.endswith(".csv"):
+            df = pd.read_csv(uploaded)
+        else:
+            # For .xlsx files, rows are streamed with openpyxl in read-only mode
+            # into typed columns; parsed sheets are cached as Parquet, so the
+            # same workbook is only parsed once
+            data = uploaded.getvalue()
+            sheet_names = list_sheets(data)
+            chosen_sheets = st.multiselect(
+                "Sheets", sheet_names, default=sheet_names[:1],
+                help="Several sheets are read in parallel and combined"
+            )
+            if chosen_sheets:
+                df = read_excel_cached(data, chosen_sheets)
+elif source == "Preloaded dataset":
+    # Memory-mapped arrays shared by every session: nothing is parsed or copied
+    df = preloaded.frame
+    st.caption(f"Preloaded dataset: {len(df):,} rows, memory-mapped from `{preloaded.directory}/`")
+else:
+    # Only the selected City/Year partitions are read from disk
+    store_cities = st.multiselect("Cities", store.cities(), help="Leave empty for all cities")
+    store_years = st.multiselect("Years", store.years(), help="Leave empty for all years")
+    if st.button("Load Data"):
+        df = store.read(cities=store_cities or None, years=store_years or None)
+    elif 'df' in st.session_state:
+        df = st.session_state['df']
+
+if df is not None:
+    # Coerce dtypes once at ingestion (numbers, dd/mm/yyyy dates, categories)
+    # The frame is marked as normalized so other pages skip re-cleaning it
+    df = coerce_frame(df)
 
     # Store dataframe in session state for access across pages
     # Session state persists data throughout the user's session
@@ -84,6 +137,24 @@ if uploaded:
     else:
         st.success("✅ No missing values detected!")
 
+    # Export the loaded data (for the store: the selected cities/years)
+    # The file is written chunk by chunk into a temporary file only when the
+    # download is clicked, without building a second copy of the data
+    st.subheader("📥 Export")
+    export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+    selected_columns = st.multiselect(
+        "Columns", [c for c in df.columns if c not in ("City", "Date")],
+        help="City and Date are always included; leave empty for all columns"
+    )
+    columns = export_columns(df, selected_columns or None)
+    st.download_button(
+        f"📥 Download {export_format}",
+        data=lambda: export_file(df, export_format, columns),
+        file_name=f"aqi_data{EXPORT_FORMATS[export_format]}",
+        mime=EXPORT_MIME_TYPES[export_format],
+        on_click="ignore"
+    )
+
 else:
     # Informational message when no file is uploaded
     # Using st.info() instead of st.warning() for a friendlier tone
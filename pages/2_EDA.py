@@ -6,9 +6,23 @@ This page provides interactive visualizations for exploring air quality data pat
 - Histograms: Examine pollutant distributions
 - Scatter plots: Explore relationships between pollutants
 - Correlation heatmap: Identify strongly correlated variables
+- Season breakdown: Compare pollutant levels across Indian seasons
+- City similarity: Correlate and cluster cities by their daily series
 
 Features city-based filtering and multi-pollutant selection for customized analysis.
 
+The page is split into cached stages, each keyed only by its own inputs:
+
+    load (dataset fingerprint) → clean (+ hide flagged) → city/date filter → one stage per chart
+
+and every chart runs in its own fragment, so changing a chart's widget
+reruns only that chart instead of the whole page.
+
+Large datasets are first charted from a stratified sample (every City and
+year sampled at the same rate, so charts need no reweighting) and can be
+refined to a larger sample or the exact data;
+each chart states the sampled fraction and the estimated error.
+
 Author: Mohsina Zaman Mim
 Student ID: St20336239
 Course: CMP7005 - Practical Assignment
@@ -22,215 +36,314 @@ Usage:
 
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from schema import coerce_frame, NUMERIC_COLUMNS, AQI_BUCKETS
+from chart_cache import ChartCache, chart_key, dataset_fingerprint
+from warmup import use_headless_backend
+from queries import top_k_groups, top_k_rows, longest_episodes
+from city_index import CityDateIndex
+from city_similarity import (align_series, similarity_matrices, cluster_cities, most_similar,
+                             MIN_OVERLAP_DAYS)
+from calendar_features import calendar_features, SEASONS
+from anomalies import ANY_FLAG, flag_anomalies, hide_flagged
+from export import EXPORT_FORMATS, EXPORT_MIME_TYPES, export_columns, export_file, export_name, monthly_means
+from preloaded import use_default_dataset, known_fingerprint
+from sampling import (StratifiedReservoir, SAMPLE_LEVELS, EXACT_LEVEL, SAMPLING_MIN_ROWS,
+                      stratified_mean, correlation_error)
 
 # Page title
 st.title("🔬 Advanced Exploratory Data Analysis")
 
 
-def clean_numeric_column(series):
-    """
-    Clean numeric columns by removing commas and converting to numeric type.
-    
-    Many air quality datasets contain numbers with comma separators (e.g., "1,234.5")
-    which prevent proper numeric operations. This function standardizes the format.
-    
-    Parameters
-    ----------
-    series : pd.Series
-        Input series that may contain comma-separated numbers or strings
-        
-    Returns
-    -------
-    pd.Series
-        Cleaned series with numeric dtype (float64)
-        
-    Examples
-    --------
-    >>> data = pd.Series(["125.5", "1,234", " 89.2 "])
-    >>> cleaned = clean_numeric_column(data)
-    >>> cleaned
-    0     125.5
-    1    1234.0
-    2      89.2
-    dtype: float64
-    
-    Notes
-    -----
-    - Removes comma separators: "1,234" → 1234
-    - Strips whitespace: " 89.2 " → 89.2
-    - Handles errors gracefully: "invalid" → NaN (using errors='coerce')
-    - Converts to float64 for consistency
-    """
-    return pd.to_numeric(
-        series.astype(str).str.replace(",", "").str.strip(), 
-        errors="coerce"
-    )
+# ----------------------------------------------------------------------
+# Cached stages (shared by all sessions)
+# DataFrame arguments start with an underscore so Streamlit does not hash
+# them; the fingerprint/filter arguments before them are the cache key
+# ----------------------------------------------------------------------
 
+# One rendered-chart cache per server process, shared by all sessions
+# Keys include the dataset fingerprint, so sessions never see each other's data
+@st.cache_resource
+def get_chart_cache():
+    return ChartCache()
 
-# Check if dataset exists in session state
-# Session state is populated by the Data Overview page
-if 'df' not in st.session_state:
-    st.warning(" Please upload a dataset in the Data Overview page.")
-    st.info(" Navigate to 'Data Overview' using the sidebar to upload your air quality data.")
-else:
-    # Retrieve dataframe from session state
-    df = st.session_state['df'].copy()  # .copy() prevents modifying original data
 
-    # Define numeric columns to process
-    # These are standard pollutant measurements in air quality datasets
-    numeric_cols = ['PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3', 'CO', 'SO2', 'O3',
-                    'Benzene', 'Toluene', 'Xylene', 'AQI']
-    
-    # Clean numeric columns
-    # Loop through each column and apply cleaning function
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = clean_numeric_column(df[col])
+# Stage 1 (load): content hash of the session's dataset, computed once per
+# uploaded frame instead of on every rerun (the preloaded dataset's hash is
+# stored with it, so it is never recomputed)
+def load_stage():
+    df = coerce_frame(st.session_state['df'])
+    memo = st.session_state.get('_eda_fingerprint')
+    if memo is None or memo[0] is not df:
+        memo = (df, known_fingerprint(df) or dataset_fingerprint(df))
+        st.session_state['_eda_fingerprint'] = memo
+    return df, memo[1]
 
-    # Convert Date column to datetime for time-series analysis
-    # errors='coerce' converts invalid dates to NaT (Not a Time)
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
 
-    # Sidebar filters for interactive exploration
-    st.sidebar.subheader(" Filters")
-    
-    # City selection dropdown
-    # "All" option shows data from all cities combined
-    city = st.sidebar.selectbox(
-        "Select City", 
-        ["All"] + sorted(df["City"].unique().tolist())
-    )
+# Stage 2 (clean): sensor anomaly flags (rolling median/MAD per city and
+# pollutant, see anomalies.py) and, if requested, the data with flagged
+# readings blanked. Returns the data, its key and the flagged row count.
+@st.cache_resource(max_entries=8)
+def clean_stage(fingerprint, hide_anomalies, _df):
+    if not hide_anomalies:
+        return _df, fingerprint, None
+    flagged = _df if ANY_FLAG in _df.columns else flag_anomalies(_df)[0]
+    return hide_flagged(flagged), f"{fingerprint}-clean", int(flagged[ANY_FLAG].sum())
+
+
+# Sorted (City, Date) index, built once per dataset and shared by sessions
+@st.cache_resource(max_entries=4)
+def get_city_index(fingerprint, _df):
+    return CityDateIndex(_df)
+
 
-    # Filter dataframe by selected city
-    # Only applies filter if a specific city is selected (not "All")
+# Stage 3 (filter): rows of one city and date window
+# The (City, Date) index turns each selection into a binary search +
+# zero-copy slice instead of a scan of every row
+@st.cache_resource(max_entries=32)
+def filter_stage(fingerprint, city, date_range, _df):
+    if "City" in _df.columns and "Date" in _df.columns and _df["Date"].notna().any():
+        index = get_city_index(fingerprint, _df)
+        city_key = None if city == "All" else city
+        # The full range (None) also keeps rows with a missing date
+        return index.slice(city_key) if date_range is None else index.slice(city_key, *date_range)
     if city != "All":
-        df = df[df["City"] == city]
-        st.info(f" Showing data for: **{city}** ({len(df)} records)")
+        return _df[_df["City"] == city]
+    return _df
 
-    # Multi-select widget for pollutant selection
-    # Allows users to compare multiple pollutants on the same plot
-    # Default selection: PM2.5 and AQI (most commonly monitored)
-    pollutants_selected = st.sidebar.multiselect(
-        "Select Pollutants to Plot",
-        numeric_cols,
-        default=["PM2.5", "AQI"]
+
+# Stage 3b (sample): stratified reservoirs per (City, year) of the filtered
+# rows, built once per filter; every sample level is read from the same
+# reservoirs, so refining a chart only adds points
+@st.cache_resource(max_entries=16)
+def reservoir_stage(fingerprint, city, date_range, _df):
+    return StratifiedReservoir.from_frame(_df)
+
+
+@st.cache_resource(max_entries=32)
+def sample_stage(fingerprint, city, date_range, detail, _df):
+    if detail == EXACT_LEVEL:
+        return _df, None
+    reservoir = reservoir_stage(fingerprint, city, date_range, _df)
+    sample, info = reservoir.sample(SAMPLE_LEVELS[detail], proportional=True)
+    return sample, (info, reservoir.population)
+
+
+# City similarity: every city's daily series on one date grid, pairwise
+# correlations over common days and the clustering, once per dataset,
+# date window and pollutant
+@st.cache_resource(max_entries=8)
+def similarity_stage(fingerprint, date_range, column, _df):
+    aligned = align_series(_df, column)
+    correlation, distance, overlap = similarity_matrices(aligned)
+    return aligned, correlation, distance, overlap
+
+
+def sample_caption(sampled, estimate=""):
+    """One line under a chart: how much data it shows and how precise it is."""
+    if sampled is None:
+        return
+    info, _ = sampled
+    st.caption(
+        f"Sample: {info.fraction:.1%} of rows ({info.sample_rows:,} of {info.total_rows:,}, "
+        f"{info.strata} City×year strata). {estimate}"
     )
 
+
+def stratified_estimate(df, sampled, column):
+    """'mean ± standard error' text for one column of a sampled chart."""
+    mean, error = stratified_mean(df, column, sampled[1])
+    return f"{column} mean {mean:.2f} ± {error:.2f}"
+
+
+def plotting():
+    """
+    Import matplotlib and seaborn on first use.
+
+    They are only needed when a chart is not in the cache, so page loads
+    with cached charts never pay for importing them. Charts are drawn on
+    a plain ``Figure`` rather than ``plt.subplots``: it is never registered
+    with pyplot's global figure list, so sessions rendering at the same
+    time cannot close or draw on each other's figures.
+    """
+    use_headless_backend()
+    from matplotlib.figure import Figure
+    import seaborn as sns
+    return Figure, sns
+
+
+# ----------------------------------------------------------------------
+# Stage 4: one fragment per chart
+# A widget inside a fragment reruns only that fragment; the other charts
+# keep what they last rendered. Each chart's image is cached under a key
+# made of exactly the inputs it depends on.
+# ----------------------------------------------------------------------
+@st.fragment
+def time_series_section(df, fingerprint, city, date_range, pollutants_selected, detail, sampled):
     # Visualization 1: Time-Series Trend
     st.subheader(" Time-Series Trend")
     
     # Check if Date column exists and is properly formatted
     if "Date" in df.columns and df["Date"].notna().any():
-        # Create matplotlib figure and axis
-        # figsize=(10,4) provides good aspect ratio for time-series
-        fig, ax = plt.subplots(figsize=(10, 4))
-        
-        # Plot each selected pollutant as a separate line
-        for col in pollutants_selected:
-            if col in df.columns:
-                # seaborn's lineplot handles missing values gracefully
-                sns.lineplot(data=df, x="Date", y=col, label=col, ax=ax)
-        
-        # Rotate x-axis labels for readability
-        # 45-degree rotation prevents label overlap
-        plt.xticks(rotation=45)
-        plt.xlabel("Date")
-        plt.ylabel("Concentration")
-        plt.title(f"Pollutant Trends Over Time - {city}")
-        plt.legend()
-        plt.tight_layout()  # Adjust spacing to prevent label cutoff
+        def build_time_series():
+            Figure, sns = plotting()
+            # Create matplotlib figure and axis
+            # figsize=(10,4) provides good aspect ratio for time-series
+            fig = Figure(figsize=(10, 4))
+            ax = fig.subplots()
+            
+            # Plot each selected pollutant as a separate line
+            for col in pollutants_selected:
+                if col in df.columns:
+                    # seaborn's lineplot handles missing values gracefully
+                    sns.lineplot(data=df, x="Date", y=col, label=col, ax=ax)
+            
+            # Rotate x-axis labels for readability
+            # 45-degree rotation prevents label overlap
+            ax.tick_params(axis="x", rotation=45)
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Concentration")
+            ax.set_title(f"Pollutant Trends Over Time - {city}")
+            ax.legend()
+            fig.tight_layout()  # Adjust spacing to prevent label cutoff
+            return fig
         
-        st.pyplot(fig)
+        st.image(get_chart_cache().get_or_render(
+            chart_key(fingerprint, "time_series", city=city, dates=date_range, pollutants=pollutants_selected,
+                      detail=detail),
+            build_time_series
+        ))
+        if sampled is not None:
+            estimates = [stratified_estimate(df, sampled, col) for col in pollutants_selected if col in df.columns]
+            sample_caption(sampled, "; ".join(estimates) + " (stratified standard error)")
     else:
         st.info(" Date column not available for time-series plot.")
 
+
+@st.fragment
+def histogram_section(df, fingerprint, city, date_range, detail, sampled):
     # Visualization 2: Histogram (Distribution Analysis)
     st.subheader(" Histogram")
     
     # Dropdown to select which pollutant to visualize
-    selected_hist = st.selectbox("Select Column for Histogram", numeric_cols)
+    selected_hist = st.selectbox("Select Column for Histogram", NUMERIC_COLUMNS)
 
     if selected_hist in df.columns:
-        fig, ax = plt.subplots()
-        
-        # Plot histogram with kernel density estimate (KDE)
-        # kde=True overlays a smooth probability density curve
-        # dropna() removes missing values before plotting
-        sns.histplot(df[selected_hist].dropna(), kde=True, ax=ax)
-        
-        ax.set_xlabel(f"{selected_hist} Concentration")
-        ax.set_ylabel("Frequency")
-        ax.set_title(f"Distribution of {selected_hist}")
-        
-        # Add vertical line for median value
-        median_val = df[selected_hist].median()
-        ax.axvline(median_val, color='red', linestyle='--', 
-                   label=f'Median: {median_val:.2f}')
-        ax.legend()
+        def build_histogram():
+            Figure, sns = plotting()
+            fig = Figure()
+            ax = fig.subplots()
+            
+            # Plot histogram with kernel density estimate (KDE)
+            # kde=True overlays a smooth probability density curve
+            # dropna() removes missing values before plotting
+            sns.histplot(df[selected_hist].dropna(), kde=True, ax=ax)
+            
+            ax.set_xlabel(f"{selected_hist} Concentration")
+            ax.set_ylabel("Frequency")
+            ax.set_title(f"Distribution of {selected_hist}")
+            
+            # Add vertical line for median value
+            median_val = df[selected_hist].median()
+            ax.axvline(median_val, color='red', linestyle='--', 
+                       label=f'Median: {median_val:.2f}')
+            ax.legend()
+            return fig
         
-        st.pyplot(fig)
+        st.image(get_chart_cache().get_or_render(
+            chart_key(fingerprint, "histogram", city=city, dates=date_range, column=selected_hist, detail=detail),
+            build_histogram
+        ))
+        if sampled is not None:
+            sample_caption(sampled, stratified_estimate(df, sampled, selected_hist) + " (stratified standard error)")
 
+
+@st.fragment
+def scatter_section(df, fingerprint, city, date_range, detail, sampled):
     # Visualization 3: Scatter Plot (Bivariate Analysis)
     st.subheader(" Scatter Plot")
     
     # Two dropdowns for X and Y axis selection
-    x_scatter = st.selectbox("X-axis", numeric_cols, key='x_scatter')
-    y_scatter = st.selectbox("Y-axis", numeric_cols, index=1, key='y_scatter')
+    x_scatter = st.selectbox("X-axis", NUMERIC_COLUMNS, key='x_scatter')
+    y_scatter = st.selectbox("Y-axis", NUMERIC_COLUMNS, index=1, key='y_scatter')
 
     if x_scatter in df.columns and y_scatter in df.columns:
-        fig, ax = plt.subplots()
-        
-        # Scatter plot to visualize relationship between two variables
-        # alpha=0.6 adds transparency to see overlapping points
-        sns.scatterplot(x=df[x_scatter], y=df[y_scatter], ax=ax, alpha=0.6)
-        
-        ax.set_xlabel(x_scatter)
-        ax.set_ylabel(y_scatter)
-        ax.set_title(f"{x_scatter} vs {y_scatter}")
-        
-        # Calculate and display correlation coefficient
-        correlation = df[[x_scatter, y_scatter]].corr().iloc[0, 1]
-        ax.text(0.05, 0.95, f'Correlation: {correlation:.3f}', 
-                transform=ax.transAxes, verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        def build_scatter():
+            Figure, sns = plotting()
+            fig = Figure()
+            ax = fig.subplots()
+            
+            # Scatter plot to visualize relationship between two variables
+            # alpha=0.6 adds transparency to see overlapping points
+            sns.scatterplot(x=df[x_scatter], y=df[y_scatter], ax=ax, alpha=0.6)
+            
+            ax.set_xlabel(x_scatter)
+            ax.set_ylabel(y_scatter)
+            ax.set_title(f"{x_scatter} vs {y_scatter}")
+            
+            # Calculate and display correlation coefficient
+            correlation = df[[x_scatter, y_scatter]].corr().iloc[0, 1]
+            ax.text(0.05, 0.95, f'Correlation: {correlation:.3f}', 
+                    transform=ax.transAxes, verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+            return fig
         
-        st.pyplot(fig)
+        st.image(get_chart_cache().get_or_render(
+            chart_key(fingerprint, "scatter", city=city, dates=date_range, x=x_scatter, y=y_scatter, detail=detail),
+            build_scatter
+        ))
+        if sampled is not None:
+            pairs = df[[x_scatter, y_scatter]].dropna()
+            r = pairs.corr().iloc[0, 1] if len(pairs) > 1 else float("nan")
+            sample_caption(sampled, f"Correlation {r:.3f} ± {correlation_error(r, len(pairs)):.3f} (standard error)")
 
+
+@st.fragment
+def heatmap_section(df, fingerprint, city, date_range, detail, sampled):
     # Visualization 4: Correlation Heatmap
     st.subheader(" Correlation Heatmap")
     
     # Filter to only include numeric columns that exist in the dataframe
-    available_numeric_cols = [col for col in numeric_cols if col in df.columns]
+    available_numeric_cols = [col for col in NUMERIC_COLUMNS if col in df.columns]
     
     if len(available_numeric_cols) > 1:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Calculate correlation matrix
-        corr_matrix = df[available_numeric_cols].corr()
-        
-        # Create heatmap
-        # annot=True displays correlation values in each cell
-        # fmt='.2f' formats values to 2 decimal places
-        # cmap='coolwarm' uses red for positive, blue for negative correlations
-        # center=0 ensures 0 correlation is white
-        sns.heatmap(
-            corr_matrix, 
-            annot=True, 
-            fmt='.2f', 
-            cmap="coolwarm", 
-            center=0,
-            square=True,  # Makes cells square-shaped
-            linewidths=1,  # Adds gridlines between cells
-            cbar_kws={"shrink": 0.8}  # Adjusts colorbar size
-        )
+        def build_heatmap():
+            Figure, sns = plotting()
+            fig = Figure(figsize=(10, 6))
+            ax = fig.subplots()
+            
+            # Calculate correlation matrix
+            corr_matrix = df[available_numeric_cols].corr()
+            
+            # Create heatmap
+            # annot=True displays correlation values in each cell
+            # fmt='.2f' formats values to 2 decimal places
+            # cmap='coolwarm' uses red for positive, blue for negative correlations
+            # center=0 ensures 0 correlation is white
+            sns.heatmap(
+                corr_matrix, 
+                annot=True, 
+                fmt='.2f', 
+                cmap="coolwarm", 
+                center=0,
+                square=True,  # Makes cells square-shaped
+                linewidths=1,  # Adds gridlines between cells
+                cbar_kws={"shrink": 0.8},  # Adjusts colorbar size
+                ax=ax
+            )
+            
+            ax.set_title("Pollutant Correlation Matrix")
+            fig.tight_layout()
+            return fig
         
-        plt.title("Pollutant Correlation Matrix")
-        plt.tight_layout()
-        
-        st.pyplot(fig)
+        st.image(get_chart_cache().get_or_render(
+            chart_key(fingerprint, "heatmap", city=city, dates=date_range, columns=available_numeric_cols,
+                      detail=detail),
+            build_heatmap
+        ))
+        if sampled is not None:
+            # Largest standard error of any cell (reached at correlation 0)
+            sample_caption(sampled, f"Each correlation ± up to {correlation_error(0.0, len(df)):.3f} (standard error)")
         
         # Interpretation helper
         st.markdown("""
@@ -240,4 +353,269 @@ else:
         -  **White (near 0)**: Weak or no correlation
         """)
     else:
-        st.warning("⚠️ Not enough numeric columns for correlation analysis.")
\ No newline at end of file
+        st.warning("⚠️ Not enough numeric columns for correlation analysis.")
+
+
+@st.fragment
+def season_section(df, fingerprint, city, date_range):
+    # Visualization 5: Season Breakdown
+    # Seasons come from calendar_features.py (the same derivation the model
+    # notebook uses): a month → season lookup on the Date array
+    st.subheader(" Season Breakdown")
+
+    if "Date" not in df.columns or not df["Date"].notna().any():
+        st.info(" Date column not available for the season breakdown.")
+        return
+
+    selected_season_col = st.selectbox("Select Column for Season Breakdown", NUMERIC_COLUMNS,
+                                       index=len(NUMERIC_COLUMNS) - 1)
+    if selected_season_col not in df.columns:
+        return
+
+    # Mean, median and number of readings per season, in calendar order
+    season = calendar_features(df["Date"])["Season"]
+    summary = (
+        df[selected_season_col]
+        .groupby(season, observed=False)
+        .agg(["mean", "median", "count"])
+        .reindex(SEASONS)
+        .rename(columns={"mean": "Mean", "median": "Median", "count": "Readings"})
+    )
+
+    def build_season_chart():
+        Figure, sns = plotting()
+        fig = Figure(figsize=(8, 4))
+        ax = fig.subplots()
+        sns.barplot(x=summary.index, y=summary["Mean"], hue=summary.index, palette="coolwarm",
+                    legend=False, ax=ax)
+        ax.set_xlabel("Season")
+        ax.set_ylabel(f"Average {selected_season_col}")
+        ax.set_title(f"Average {selected_season_col} by Season - {city}")
+        fig.tight_layout()
+        return fig
+
+    st.image(get_chart_cache().get_or_render(
+        chart_key(fingerprint, "season", city=city, dates=date_range, column=selected_season_col),
+        build_season_chart
+    ))
+    st.dataframe(summary.round(2))
+    st.caption("Winter: Dec-Feb · Summer: Mar-May · Monsoon: Jun-Aug · Autumn: Sep-Nov")
+
+
+@st.fragment
+def similarity_section(window_df, fingerprint, city, date_range):
+    # Visualization 6: City Similarity
+    # Cities whose daily series rise and fall together, compared only over
+    # days both cities have readings; clustered by correlation distance
+    st.subheader(" City Similarity")
+
+    if not {"City", "Date"}.issubset(window_df.columns) or window_df["City"].nunique() < 2:
+        st.info(" At least two cities with dates are needed for the similarity analysis.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        similarity_col = st.selectbox("Select Column for Similarity",
+                                      [c for c in NUMERIC_COLUMNS if c in window_df.columns])
+    with col2:
+        n_clusters = st.slider("Clusters", min_value=2, max_value=8, value=4)
+
+    aligned, correlation, distance, overlap = similarity_stage(fingerprint, date_range, similarity_col,
+                                                               window_df)
+    labels, order = cluster_cities(correlation, n_clusters)
+
+    def build_similarity_chart():
+        Figure, sns = plotting()
+        size = max(6, 0.3 * len(order))
+        fig = Figure(figsize=(size + 2, size))
+        ax = fig.subplots()
+        # Cities in dendrogram order, so clusters appear as blocks
+        sns.heatmap(correlation.loc[order, order], cmap="coolwarm", vmin=-1, vmax=1, center=0,
+                    square=True, cbar_kws={"shrink": 0.8}, ax=ax)
+        ax.set_title(f"Correlation of daily {similarity_col} between cities")
+        fig.tight_layout()
+        return fig
+
+    st.image(get_chart_cache().get_or_render(
+        chart_key(fingerprint, "similarity", dates=date_range, column=similarity_col, clusters=n_clusters),
+        build_similarity_chart
+    ))
+    st.caption(f"{len(aligned.cities)} cities × {len(aligned.dates):,} days; "
+               f"pairs with fewer than {MIN_OVERLAP_DAYS} common days are left blank")
+
+    # Members of each cluster, in dendrogram order
+    members = pd.Series(order, index=labels.loc[order].to_numpy(), name="Cities")
+    st.dataframe(members.groupby(level=0).agg(", ".join).rename_axis("Cluster"))
+
+    if city != "All" and city in correlation.index:
+        st.markdown(f"**Most similar to {city}:**")
+        nearest = most_similar(correlation, city).rename("Correlation").to_frame()
+        nearest["RMS distance"] = distance.loc[city, nearest.index]
+        nearest["Common days"] = overlap.loc[city, nearest.index]
+        st.dataframe(nearest.round(3))
+
+
+@st.fragment
+def rankings_section(all_cities_df, df):
+    # Rankings: most polluted cities, worst days and longest episodes
+    # Uses partial selection (argpartition) and run-length encoding, so only
+    # the top K results are ever sorted
+    st.subheader(" Rankings")
+
+    ranking = st.selectbox(
+        "Ranking",
+        ["Most polluted cities", "Worst days nationally",
+         "Worst city-days", "Longest episodes per city"]
+    )
+    top_k = st.slider("Top K", min_value=5, max_value=50, value=20, step=5)
+
+    if "AQI" not in all_cities_df.columns:
+        st.info(" AQI column not available for rankings.")
+    elif ranking == "Most polluted cities":
+        st.dataframe(top_k_groups(all_cities_df, "City", "AQI", k=top_k))
+    elif ranking == "Worst days nationally":
+        # Mean AQI across all cities reporting on that day
+        st.dataframe(top_k_groups(all_cities_df, "Date", "AQI", k=top_k))
+    elif ranking == "Worst city-days":
+        st.dataframe(top_k_rows(all_cities_df, "AQI", k=top_k)[
+            [c for c in ["City", "Date", "AQI", "AQI_Bucket"] if c in all_cities_df.columns]
+        ])
+    else:
+        episode_bucket = st.selectbox("AQI Category", AQI_BUCKETS, index=len(AQI_BUCKETS) - 1)
+        if "Date" in df.columns:
+            # Respects the city filter; consecutive days in the chosen category
+            st.dataframe(longest_episodes(df, episode_bucket, k=top_k, per_city=True))
+        else:
+            st.info(" Date column not available for episode detection.")
+
+
+@st.fragment
+def export_section(df, city, pollutants_selected):
+    # Export: the current filter (city, date range, hidden readings) with the
+    # selected pollutants, or its monthly means per city. The file is encoded
+    # chunk by chunk into a temporary file only when the button is clicked,
+    # so large selections never get a second in-memory copy while encoding
+    st.subheader(" Export")
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+    with col2:
+        contents = st.radio("Contents", ["Filtered rows", "Monthly means per city"], horizontal=True,
+                            key="export_contents")
+
+    columns = export_columns(df, pollutants_selected)
+    monthly = contents == "Monthly means per city"
+    if monthly and "Date" not in df.columns:
+        st.info(" Date column not available for monthly means.")
+        return
+    st.caption(f"{len(df):,} rows · columns: {', '.join(columns)}")
+
+    def build_export():
+        data = monthly_means(df, columns) if monthly else df
+        return export_file(data, export_format, None if monthly else columns)
+
+    st.download_button(
+        f"📥 Download {export_format}",
+        data=build_export,
+        file_name=export_name(city, export_format, monthly),
+        mime=EXPORT_MIME_TYPES[export_format],
+        on_click="ignore"
+    )
+
+
+# Check if dataset exists in session state
+# Session state is populated by the Data Overview page; sessions without an
+# upload start from the memory-mapped preloaded dataset when one was built
+use_default_dataset(st.session_state)
+if 'df' not in st.session_state:
+    st.warning(" Please upload a dataset in the Data Overview page.")
+    st.info(" Navigate to 'Data Overview' using the sidebar to upload your air quality data.")
+else:
+    # Stage 1: retrieve dataframe from session state
+    # Data loaded through the Data Overview page is already normalized by the
+    # schema registry, so coerce_frame() returns it as-is (no copy, no re-parsing)
+    df, fingerprint = load_stage()
+
+    # Numeric columns (pollutants + AQI) come from the shared schema
+    numeric_cols = NUMERIC_COLUMNS
+
+    # Sidebar filters for interactive exploration
+    # These feed several stages, so changing them reruns the whole page
+    # (stages whose inputs did not change are cache lookups)
+    st.sidebar.subheader(" Filters")
+
+    # Stage 2: hide sensor glitches: flagged readings are blanked (set to NaN)
+    # in every chart, while the other pollutants of the same day are kept
+    hide_anomalies = False
+    if "City" in df.columns and "Date" in df.columns:
+        hide_anomalies = st.sidebar.checkbox(
+            "Hide flagged readings",
+            value=False,
+            help="Hide readings that are far from the rolling median of the same city and pollutant"
+        )
+    df, fingerprint, flagged_rows = clean_stage(fingerprint, hide_anomalies, df)
+    if flagged_rows is not None:
+        st.sidebar.caption(f"{flagged_rows:,} rows have at least one flagged reading")
+    
+    # City selection dropdown
+    # "All" option shows data from all cities combined
+    city = st.sidebar.selectbox(
+        "Select City", 
+        ["All"] + sorted(df["City"].dropna().unique().tolist())
+    )
+
+    # Keep the unfiltered data for national rankings
+    all_cities_df = df
+
+    # Date range slider, bounded by the selected city's first and last day
+    date_range = None
+    if "City" in df.columns and "Date" in df.columns and df["Date"].notna().any():
+        first, last = get_city_index(fingerprint, df).date_bounds(None if city == "All" else city)
+        if first is not None:
+            date_range = st.sidebar.slider(
+                "Date Range",
+                min_value=first.date(),
+                max_value=last.date(),
+                value=(first.date(), last.date())
+            )
+            # The full range is stored as None so it shares the unfiltered stage
+            if date_range == (first.date(), last.date()):
+                date_range = None
+
+    # Stage 3: filter by selected city and date range
+    df = filter_stage(fingerprint, city, date_range, df)
+
+    if city != "All":
+        st.info(f" Showing data for: **{city}** ({len(df)} records)")
+
+    # Multi-select widget for pollutant selection
+    # Allows users to compare multiple pollutants on the same plot
+    # Default selection: PM2.5 and AQI (most commonly monitored)
+    pollutants_selected = st.sidebar.multiselect(
+        "Select Pollutants to Plot",
+        numeric_cols,
+        default=["PM2.5", "AQI"]
+    )
+
+    # Chart detail: large datasets start from a quick stratified sample
+    # (instant charts) and can be refined to a larger sample or exact data
+    detail = EXACT_LEVEL
+    if len(df) >= SAMPLING_MIN_ROWS:
+        detail = st.sidebar.select_slider(
+            "Chart Detail",
+            options=list(SAMPLE_LEVELS) + [EXACT_LEVEL],
+            value=next(iter(SAMPLE_LEVELS)),
+            help="Samples keep the same share of every city and year; refine for exact charts"
+        )
+    plot_df, sampled = sample_stage(fingerprint, city, date_range, detail, df)
+
+    # Stage 4: charts, each rerunning on its own
+    time_series_section(plot_df, fingerprint, city, date_range, pollutants_selected, detail, sampled)
+    histogram_section(plot_df, fingerprint, city, date_range, detail, sampled)
+    scatter_section(plot_df, fingerprint, city, date_range, detail, sampled)
+    heatmap_section(plot_df, fingerprint, city, date_range, detail, sampled)
+    # Seasons, rankings and exports always use the exact data
+    season_section(df, fingerprint, city, date_range)
+    similarity_section(filter_stage(fingerprint, "All", date_range, all_cities_df), fingerprint, city, date_range)
+    rankings_section(all_cities_df, df)
+    export_section(df, city, pollutants_selected)
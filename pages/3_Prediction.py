@@ -27,7 +27,15 @@ Usage:
 
 import streamlit as st
 import pandas as pd
-import joblib
+
+from schema import FEATURE_COLUMNS
+from model_registry import live_model
+from explain import contributions_frame
+from scoring import score_frame
+from intervals import predict_interval, DEFAULT_QUANTILES, PROBABILITY_PREFIX
+from schema import AQI_BUCKETS
+from preloaded import use_default_dataset
+from export import EXPORT_MIME_TYPES, export_file
 
 # Page title
 st.title("🤖 AQI Prediction")
@@ -35,21 +43,36 @@ st.title("🤖 AQI Prediction")
 # Load pre-trained machine learning model
 # Model was trained using Model_Development.ipynb
 # Stored as .pkl file using joblib for efficient serialization
-@st.cache_resource
-def load_model():
-    return joblib.load("aqi_model.pkl")
+# The served version comes from the model registry (see model_registry.py):
+# one live model per process, shared by all sessions, that switches to a
+# newly published version only after it has been loaded and warmed up in
+# the background. Without a registry, aqi_model.pkl is served.
+# joblib/scikit-learn are only imported when a prediction is requested,
+# and the landing page usually has them loaded in the background already
+live = live_model()
 
-try:
-    model = load_model()
-except FileNotFoundError:
+# Cheap existence check so a missing model is reported before any input
+if not live.available():
     st.error("❌ Model file 'aqi_model.pkl' not found. Please ensure it's in the project directory.")
     st.stop()
 
+# A version that failed its warm-up is not served; the previous one stays
+if live.last_error:
+    st.warning(live.last_error)
+
+
+def serving_handle():
+    """The handle to predict with; stops the page if no version could be activated."""
+    handle = live.current()
+    if handle is None:
+        st.error(f"❌ No model could be activated. {live.last_error or ''}")
+        st.stop()
+    return handle
+
 # Define required features for the model
-# These match the features used during model training
+# These match the features used during model training (see schema.py)
 # All 12 pollutants are required for accurate prediction
-required_features = ['PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3', 
-                     'CO', 'SO2', 'O3', 'Benzene', 'Toluene', 'Xylene']
+required_features = FEATURE_COLUMNS
 
 # Instructions section
 st.subheader("📝 Enter Pollutant Values")
@@ -187,6 +210,14 @@ with col2:
         help="Volatile Organic Compound"
     )
 
+# Interval mode: use the spread of the forest's individual trees
+# to show how certain the prediction is
+show_interval = st.checkbox(
+    "Show prediction interval",
+    value=True,
+    help="Range covered by the middle 90% of the forest's trees, and how many trees vote for each AQI category"
+)
+
 # Prediction button
 if st.button("🔮 Predict AQI", type="primary"):
     # Convert input dictionary to DataFrame
@@ -197,11 +228,15 @@ if st.button("🔮 Predict AQI", type="primary"):
     df_input = df_input[required_features]
     
     # Make prediction using the trained model
+    # The handle is taken once so the whole result comes from one version,
+    # even if a new one is swapped in meanwhile
+    handle = serving_handle()
     # predict() returns numpy array, we take first element [0]
-    prediction = model.predict(df_input)[0]
+    prediction = handle.model.predict(df_input)[0]
     
     # Display prediction result with success message
     st.success(f"### Predicted AQI: **{prediction:.2f}**")
+    st.caption(f"Model version: {handle.version} (published {handle.manifest.get('created', 'unknown')})")
     
     # Categorize AQI into health buckets
     # Based on Indian National Air Quality Index (NAQI) standards
@@ -239,6 +274,21 @@ if st.button("🔮 Predict AQI", type="primary"):
     # Display AQI category with color coding
     st.markdown(f"### AQI Category: **:{color}[{bucket}]** {emoji}")
     st.info(description)
+
+    if show_interval:
+        # All per-tree predictions come from one pass over the flattened forest
+        summary = predict_interval(handle.forest, df_input).iloc[0]
+        lower_pct, upper_pct = (int(q * 100) for q in DEFAULT_QUANTILES)
+        st.markdown(
+            f"**Prediction interval ({lower_pct}th–{upper_pct}th percentile of trees):** "
+            f"{summary['AQI_Lower']:.2f} – {summary['AQI_Upper']:.2f}"
+        )
+        probabilities = pd.Series(
+            [summary[PROBABILITY_PREFIX + name] for name in AQI_BUCKETS],
+            index=AQI_BUCKETS, name="Probability"
+        )
+        st.markdown("**Probability of each AQI category** (share of trees):")
+        st.bar_chart(probabilities)
     
     # Health recommendations based on category
     st.markdown("---")
@@ -291,6 +341,7 @@ if st.button("🔮 Predict AQI", type="primary"):
         st.markdown(f"""
         **Model Information:**
         - Algorithm: Random Forest Regressor
+        - Version: {handle.version}
         - Features used: {len(required_features)} pollutant measurements
         - Training data: Historical Indian air quality records
         
@@ -305,6 +356,19 @@ if st.button("🔮 Predict AQI", type="primary"):
         geographic factors, etc.).
         """)
 
+        # Which pollutants drove this prediction
+        # Contributions are measured from the average AQI of the training data
+        # and add up exactly to the predicted value
+        contributions = contributions_frame(handle.forest, df_input)
+        baseline = prediction - contributions["Contribution"].sum()
+        st.markdown(f"""
+        **What drove this prediction:**
+        Starting from the average training AQI of **{baseline:.2f}**, each pollutant
+        moved the prediction up (positive) or down (negative) by the amounts below.
+        """)
+        st.bar_chart(contributions.set_index("Feature")["Contribution"])
+        st.dataframe(contributions.style.format({"Value": "{:.2f}", "Contribution": "{:+.2f}"}))
+
 else:
     # Display helpful information when prediction hasn't been made yet
     st.info("👆 Enter pollutant values above and click 'Predict AQI' to get your result.")
@@ -323,4 +387,36 @@ else:
         **Example 3: Severe Air Quality**
         - PM2.5: 450, PM10: 550, NO: 150, NO2: 200, NOx: 300, NH3: 80
         - CO: 8.0, SO2: 50, O3: 120, Benzene: 20, Toluene: 35, Xylene: 28
-        """)
\ No newline at end of file
+        """)
+
+# Batch scoring of the dataset loaded on the Data Overview page
+# Predictions (and optionally contributions) are added as extra columns
+st.markdown("---")
+st.subheader("📦 Batch Scoring")
+# Sessions without an upload use the preloaded dataset, if one was built
+use_default_dataset(st.session_state)
+if 'df' not in st.session_state:
+    st.info("Load a dataset on the Data Overview page to score all of its rows.")
+else:
+    batch_df = st.session_state['df']
+    missing_features = [name for name in required_features if name not in batch_df.columns]
+    if missing_features:
+        st.warning(f"The loaded dataset is missing: {', '.join(missing_features)}")
+    else:
+        with_contributions = st.checkbox("Include feature contributions", value=False)
+        with_intervals = st.checkbox("Include prediction intervals and category probabilities", value=False)
+        if st.button("Score Dataset"):
+            handle = serving_handle()
+            with st.spinner(f"Scoring {len(batch_df):,} rows..."):
+                scored = score_frame(handle.forest, batch_df, contributions=with_contributions,
+                                     intervals=with_intervals, model=handle.model)
+            st.write(f"Scored **{len(scored):,}** rows with model version **{handle.version}**")
+            st.dataframe(scored.head(100))
+            # Encoded in chunks only when the download is requested
+            st.download_button(
+                "Download scored CSV",
+                data=lambda: export_file(scored, "CSV"),
+                file_name="scored_aqi.csv",
+                mime=EXPORT_MIME_TYPES["CSV"],
+                on_click="ignore"
+            )
@@ -0,0 +1,287 @@
+"""
+Memory-Mapped Preloaded Dataset
+
+Without this, every analyst uploads ``India_air.csv`` before the EDA or
+batch pages can be used, and every session parses and holds its own copy.
+At deploy time the bundled dataset is converted once into one ``.npy``
+file per column:
+
+- numeric columns as float64
+- Date as datetime64
+- City and AQI_Bucket as integer codes plus a dictionary of labels
+
+A ``manifest.json`` records the columns, row count and content fingerprint.
+The app opens the arrays with ``np.load(mmap_mode="r")`` and wraps them in a
+DataFrame without copying. Pages are only read from disk as they are
+touched, and the operating system's page cache shares one physical copy
+between every session, process and worker. The arrays are read-only;
+filtering and cleaning create new frames as usual.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python preloaded.py build                              # from India_air.csv
+    python preloaded.py build air_files_extracted/air_files/*.csv
+    python preloaded.py info
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import NORMALIZED_ATTR, SCHEMA_VERSION, coerce_frame
+from chart_cache import dataset_fingerprint
+
+
+PRELOAD_DIR = "preloaded"
+
+# Set AQI_PRELOAD_DIR to serve the preloaded dataset from another directory
+PRELOAD_ENV_VAR = "AQI_PRELOAD_DIR"
+DEFAULT_SOURCE = "India_air.csv"
+MANIFEST = "manifest.json"
+PRELOAD_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PreloadedDataset:
+    """A memory-mapped dataset and its fingerprint (from the manifest)."""
+    frame: pd.DataFrame
+    fingerprint: str
+    directory: str
+
+
+def _column_file(index: int) -> str:
+    # Column names contain characters like "." (PM2.5), so files are numbered
+    return f"col{index:03d}.npy"
+
+
+def build_preloaded(df: pd.DataFrame, directory: str = PRELOAD_DIR) -> Dict:
+    """
+    Write ``df`` as per-column arrays plus a manifest.
+
+    Rows are sorted by City then Date. The new directory is written next to
+    the old one and swapped in with renames, so running processes keep
+    their mapping of the previous files until they reload.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset to preload (normalized with ``coerce_frame``)
+    directory : str, optional
+        Output directory
+
+    Returns
+    -------
+    dict
+        The manifest
+    """
+    df = coerce_frame(df)
+    keys = [c for c in ("City", "Date") if c in df.columns]
+    if keys:
+        df = df.sort_values(keys, kind="stable", na_position="first").reset_index(drop=True)
+
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    columns = []
+    for index, name in enumerate(df.columns):
+        series = df[name]
+        entry = {"name": str(name), "file": _column_file(index)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Codes in the smallest integer type plus the label dictionary
+            array = series.cat.codes.to_numpy()
+            entry.update(kind="category", categories=[str(c) for c in series.cat.categories],
+                         ordered=bool(series.cat.ordered),
+                         categories_dtype=str(series.cat.categories.dtype))
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            array = series.to_numpy()
+            entry.update(kind="datetime")
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            array = series.to_numpy(dtype="float64", na_value=np.nan)
+            entry.update(kind="float")
+        elif pd.api.types.is_bool_dtype(series):
+            array = series.fillna(False).to_numpy(dtype=bool)
+            entry.update(kind="bool")
+        else:
+            # Other text columns: encode like a category
+            codes, labels = pd.factorize(series.astype("string"))
+            array = codes.astype(np.int32)
+            entry.update(kind="category", categories=[str(c) for c in labels], ordered=False,
+                         categories_dtype="string")
+        np.save(os.path.join(staging, entry["file"]), np.ascontiguousarray(array))
+        entry["dtype"] = str(array.dtype)
+        columns.append(entry)
+
+    manifest = {
+        "version": PRELOAD_VERSION,
+        "rows": int(len(df)),
+        "columns": columns,
+        "fingerprint": dataset_fingerprint(df),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    # Swap directories: old → .old, staging → directory, then remove .old
+    previous = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def read_manifest(directory: str = PRELOAD_DIR) -> Optional[Dict]:
+    """The manifest of a preloaded dataset, or None if there is none."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == PRELOAD_VERSION else None
+
+
+def open_preloaded(directory: str = PRELOAD_DIR) -> Optional[PreloadedDataset]:
+    """
+    Memory-map a preloaded dataset as a DataFrame (no copy of the data).
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory written by ``build_preloaded``
+
+    Returns
+    -------
+    PreloadedDataset or None
+        None if the directory has no (compatible) manifest
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    data = {}
+    for entry in manifest["columns"]:
+        array = np.load(os.path.join(directory, entry["file"]), mmap_mode="r")
+        if entry["kind"] == "category":
+            labels = pd.Index(entry["categories"], dtype=entry["categories_dtype"])
+            dtype = pd.CategoricalDtype(labels, ordered=entry["ordered"])
+            data[entry["name"]] = pd.Categorical.from_codes(array, dtype=dtype)
+        else:
+            data[entry["name"]] = array
+    frame = pd.DataFrame(data, copy=False)
+    # Stored columns already have the schema dtypes; marking the frame as
+    # normalized stops coerce_frame() from copying it
+    frame.attrs[NORMALIZED_ATTR] = SCHEMA_VERSION
+    return PreloadedDataset(frame, manifest["fingerprint"], directory)
+
+
+# One mapping per directory and manifest version, shared by all sessions
+_OPENED: Dict[Tuple[str, float], PreloadedDataset] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def preload_dir() -> str:
+    """Directory the app serves the preloaded dataset from."""
+    return os.environ.get(PRELOAD_ENV_VAR) or PRELOAD_DIR
+
+
+def default_dataset(directory: Optional[str] = None) -> Optional[PreloadedDataset]:
+    """
+    The preloaded dataset, opened once per process.
+
+    A rebuilt dataset (newer manifest) is mapped again on the next call.
+    ``directory`` defaults to ``preload_dir()``.
+    """
+    directory = directory or preload_dir()
+    try:
+        stamp = os.path.getmtime(os.path.join(directory, MANIFEST))
+    except OSError:
+        return None
+    key = (os.path.abspath(directory), stamp)
+    with _OPEN_LOCK:
+        dataset = _OPENED.get(key)
+        if dataset is None:
+            dataset = open_preloaded(directory)
+            if dataset is None:
+                return None
+            # Keep only the latest mapping of each directory
+            for old in [k for k in _OPENED if k[0] == key[0]]:
+                del _OPENED[old]
+            _OPENED[key] = dataset
+    return dataset
+
+
+def known_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """Fingerprint of ``df`` if it is an opened preloaded frame (skips hashing)."""
+    for dataset in list(_OPENED.values()):
+        if dataset.frame is df:
+            return dataset.fingerprint
+    return None
+
+
+def use_default_dataset(state: MutableMapping, directory: Optional[str] = None) -> bool:
+    """
+    Put the preloaded dataset in a session's state if it has no data yet.
+
+    Parameters
+    ----------
+    state : MutableMapping
+        ``st.session_state`` (or any dict)
+
+    Returns
+    -------
+    bool
+        True if the session is using the preloaded dataset
+    """
+    if "df" not in state:
+        dataset = default_dataset(directory)
+        if dataset is None:
+            return False
+        state["df"] = dataset.frame
+    return known_fingerprint(state["df"]) is not None
+
+
+def load_sources(paths: Sequence[str]) -> pd.DataFrame:
+    """Read and combine the CSV files to preload."""
+    frames: List[pd.DataFrame] = [coerce_frame(pd.read_csv(path)) for path in paths]
+    combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return coerce_frame(combined)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect the memory-mapped preloaded dataset")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="convert CSV files into per-column arrays")
+    build.add_argument("sources", nargs="*", default=[DEFAULT_SOURCE])
+    build.add_argument("--dir", default=preload_dir())
+    info = sub.add_parser("info", help="show the manifest and time opening the arrays")
+    info.add_argument("--dir", default=preload_dir())
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        manifest = build_preloaded(load_sources(args.sources), args.dir)
+        size = sum(os.path.getsize(os.path.join(args.dir, c["file"])) for c in manifest["columns"])
+        print(f"Preloaded {manifest['rows']:,} rows x {len(manifest['columns'])} columns "
+              f"({size / 1e6:.1f} MB) into {args.dir}/ in {time.perf_counter() - start:.2f} s")
+    else:
+        start = time.perf_counter()
+        dataset = open_preloaded(args.dir)
+        if dataset is None:
+            print(f"No preloaded dataset in {args.dir}/; run `python preloaded.py build`")
+            sys.exit(1)
+        print(f"Opened {len(dataset.frame):,} rows in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"(fingerprint {dataset.fingerprint[:12]})")
+        for column in read_manifest(args.dir)["columns"]:
+            print(f"  {column['name']:<12} {column['kind']:<9} {column['dtype']}")
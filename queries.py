@@ -0,0 +1,393 @@
+"""
+Ranking Queries: Most Polluted Cities, Days and Episodes
+
+Answers questions such as "top 20 worst days nationally" or "longest
+Severe runs per city" without sorting whole grouped results:
+
+- ``top_k_rows`` / ``top_k_groups`` use ``np.argpartition`` (O(n)) and
+  only sort the k selected values
+- ``top_k_rows_stream`` / ``top_k_groups_stream`` process chunked input
+  (e.g. ``pd.read_csv(..., chunksize=...)``) keeping a k-sized heap or one
+  running sum per group, so memory stays bounded
+- ``find_episodes`` / ``longest_episodes_stream`` detect consecutive-day
+  runs in an AQI category with run-length encoding
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import coerce_frame
+from utils import get_aqi_categories
+
+
+EPISODE_COLUMNS = ["City", "Start", "End", "Days", "Peak_AQI", "Mean_AQI"]
+
+
+def _top_k_positions(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Positions of the k largest (or smallest) non-NaN values, best first.
+
+    ``np.argpartition`` selects them in linear time; only those k values
+    are then sorted.
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or valid.size == 0:
+        return np.array([], dtype=np.intp)
+
+    keys = values[valid] if not largest else -values[valid]
+    k = min(k, valid.size)
+    if k < valid.size:
+        chosen = np.argpartition(keys, k - 1)[:k]
+    else:
+        chosen = np.arange(valid.size)
+    chosen = chosen[np.argsort(keys[chosen], kind="stable")]
+    return valid[chosen]
+
+
+def top_k_rows(df: pd.DataFrame, column: str = "AQI", k: int = 20,
+               largest: bool = True) -> pd.DataFrame:
+    """
+    Return the k rows with the highest (or lowest) value in ``column``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Air quality records
+    column : str, optional
+        Column to rank by (default is "AQI")
+    k : int, optional
+        Number of rows to return (default is 20)
+    largest : bool, optional
+        Rank highest values first (default is True)
+
+    Returns
+    -------
+    pd.DataFrame
+        Up to k rows ordered best first; rows with missing values are ignored
+
+    Examples
+    --------
+    >>> top_k_rows(df, "PM2.5", k=5)[["City", "Date", "PM2.5"]]
+    """
+    values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    return df.iloc[_top_k_positions(values, k, largest)]
+
+
+def top_k_groups(df: pd.DataFrame, by: str = "City", column: str = "AQI",
+                 k: int = 20, largest: bool = True) -> pd.DataFrame:
+    """
+    Rank groups (cities, dates, ...) by the mean of ``column``.
+
+    ``top_k_groups(df, "City")`` gives the most polluted cities and
+    ``top_k_groups(df, "Date")`` the worst days nationally.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Air quality records
+    by : str, optional
+        Grouping column (default is "City")
+    column : str, optional
+        Value column to average (default is "AQI")
+    k : int, optional
+        Number of groups to return (default is 20)
+    largest : bool, optional
+        Rank highest means first (default is True)
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``[by, "Mean_<column>", "Records"]``, best first
+    """
+    grouped = df.groupby(by, observed=True)[column].agg(["sum", "count"])
+    return _rank_group_totals(grouped.index.to_numpy(), grouped["sum"].to_numpy(),
+                              grouped["count"].to_numpy(), by, column, k, largest)
+
+
+def _rank_group_totals(keys: np.ndarray, sums: np.ndarray, counts: np.ndarray,
+                       by: str, column: str, k: int, largest: bool) -> pd.DataFrame:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    positions = _top_k_positions(means, k, largest)
+    return pd.DataFrame({
+        by: keys[positions],
+        f"Mean_{column}": means[positions],
+        "Records": counts[positions].astype("int64"),
+    })
+
+
+def top_k_rows_stream(chunks: Iterable[pd.DataFrame], column: str = "AQI",
+                      k: int = 20, largest: bool = True) -> pd.DataFrame:
+    """
+    Streaming version of ``top_k_rows`` for chunked input.
+
+    Each chunk is reduced to its own top k with ``argpartition`` and merged
+    into a k-sized heap, so at most k rows (plus one chunk) are in memory.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        For example ``pd.read_csv("India_air.csv", chunksize=50_000)``
+    column, k, largest
+        As for ``top_k_rows``
+
+    Returns
+    -------
+    pd.DataFrame
+        Up to k rows ordered best first
+    """
+    heap: List[Tuple[float, int, dict]] = []  # min-heap of (score, seq, row)
+    seq = 0
+    for chunk in chunks:
+        chunk = coerce_frame(chunk)
+        for _, row in top_k_rows(chunk, column, k, largest).iterrows():
+            score = row[column] if largest else -row[column]
+            item = (score, seq, row.to_dict())
+            seq += 1
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    best = sorted(heap, key=lambda item: (-item[0], item[1]))
+    return pd.DataFrame([row for _, _, row in best])
+
+
+def top_k_groups_stream(chunks: Iterable[pd.DataFrame], by: str = "City",
+                        column: str = "AQI", k: int = 20,
+                        largest: bool = True) -> pd.DataFrame:
+    """
+    Streaming version of ``top_k_groups``.
+
+    Only a running sum and count per group is kept between chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Chunked air quality records
+    by, column, k, largest
+        As for ``top_k_groups``
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns ``[by, "Mean_<column>", "Records"]``, best first
+    """
+    totals: Dict[object, List[float]] = {}
+    for chunk in chunks:
+        chunk = coerce_frame(chunk)
+        partial = chunk.groupby(by, observed=True)[column].agg(["sum", "count"])
+        for key, total, count in zip(partial.index, partial["sum"], partial["count"]):
+            entry = totals.setdefault(key, [0.0, 0])
+            entry[0] += total
+            entry[1] += count
+
+    keys = np.array(list(totals), dtype=object)
+    sums = np.array([v[0] for v in totals.values()], dtype="float64")
+    counts = np.array([v[1] for v in totals.values()], dtype="int64")
+    return _rank_group_totals(keys, sums, counts, by, column, k, largest)
+
+
+def _bucket_column(df: pd.DataFrame) -> np.ndarray:
+    """AQI_Bucket where present, filled from AQI via get_aqi_categories."""
+    if "AQI" not in df.columns and "AQI_Bucket" not in df.columns:
+        raise ValueError("Episodes need an AQI or AQI_Bucket column; neither is present")
+    derived = get_aqi_categories(df["AQI"]) if "AQI" in df.columns else None
+    if "AQI_Bucket" not in df.columns:
+        return derived
+    buckets = np.array(df["AQI_Bucket"].astype(object), dtype=object)
+    if derived is not None:
+        missing = pd.isna(buckets)
+        buckets[missing] = derived[missing]
+    return buckets
+
+
+def find_episodes(df: pd.DataFrame, bucket: str = "Severe",
+                  assume_sorted: bool = False) -> pd.DataFrame:
+    """
+    Find runs of consecutive days in an AQI category, per city.
+
+    A run ends when the category changes, the city changes or a day is
+    missing. Runs are found with a vectorized run-length encoding: the
+    start of each run is where the "in bucket" flag switches on or the
+    previous row is not the previous day of the same city.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Records with City, Date and AQI_Bucket and/or AQI
+    bucket : str, optional
+        AQI category to look for (default is "Severe")
+    assume_sorted : bool, optional
+        Skip sorting when rows are already ordered by City then Date
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per episode with columns City, Start, End, Days, Peak_AQI
+        and Mean_AQI, in City/Start order
+
+    Raises
+    ------
+    ValueError
+        If ``df`` has neither an AQI nor an AQI_Bucket column
+    """
+    df = coerce_frame(df)
+    if not assume_sorted:
+        df = df.sort_values(["City", "Date"], kind="stable")
+
+    in_bucket = _bucket_column(df) == bucket
+    if not in_bucket.any():
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+
+    cities = df["City"].astype(object).to_numpy()
+    days = df["Date"].to_numpy().astype("datetime64[D]")
+    aqi = df["AQI"].to_numpy(dtype="float64", na_value=np.nan) if "AQI" in df.columns \
+        else np.full(len(df), np.nan)
+
+    # A row continues the previous run if both are in the bucket, same city,
+    # and exactly one day apart
+    continues = np.zeros(len(df), dtype=bool)
+    continues[1:] = (in_bucket[1:] & in_bucket[:-1]
+                     & (cities[1:] == cities[:-1])
+                     & (days[1:] - days[:-1] == np.timedelta64(1, "D")))
+    starts = np.flatnonzero(in_bucket & ~continues)
+    run_id = np.cumsum(in_bucket & ~continues) - 1
+
+    members = np.flatnonzero(in_bucket)
+    ids = run_id[members]
+    lengths = np.bincount(ids)
+    ends = starts + lengths - 1
+
+    member_aqi = aqi[members]
+    peak = np.full(len(starts), -np.inf)
+    np.maximum.at(peak, ids, np.nan_to_num(member_aqi, nan=-np.inf))
+    totals = np.bincount(ids, weights=np.nan_to_num(member_aqi))
+    counted = np.bincount(ids, weights=~np.isnan(member_aqi))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "City": cities[starts],
+            "Start": pd.to_datetime(days[starts]),
+            "End": pd.to_datetime(days[ends]),
+            "Days": lengths.astype("int64"),
+            "Peak_AQI": np.where(np.isinf(peak), np.nan, peak),
+            "Mean_AQI": np.where(counted > 0, totals / counted, np.nan),
+        })
+
+
+def longest_episodes(df: pd.DataFrame, bucket: str = "Severe", k: int = 20,
+                     per_city: bool = False) -> pd.DataFrame:
+    """
+    Return the k longest episodes overall, or the longest k per city.
+
+    Ties are broken by peak AQI.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Air quality records
+    bucket : str, optional
+        AQI category (default is "Severe")
+    k : int, optional
+        Episodes to return (per city if ``per_city``) (default is 20)
+    per_city : bool, optional
+        Keep the k longest runs of each city (default is False)
+
+    Returns
+    -------
+    pd.DataFrame
+        Episodes, longest first
+    """
+    episodes = find_episodes(df, bucket)
+    order = ["Days", "Peak_AQI"]
+    episodes = episodes.sort_values(order, ascending=False, kind="stable")
+    if per_city:
+        return episodes.groupby("City", sort=False).head(k).reset_index(drop=True)
+    return episodes.head(k).reset_index(drop=True)
+
+
+def longest_episodes_stream(chunks: Iterable[pd.DataFrame], bucket: str = "Severe",
+                            k: int = 20) -> pd.DataFrame:
+    """
+    Streaming version of ``longest_episodes`` for chunked input.
+
+    Chunks must be ordered by City then Date (as ``India_air.csv`` is).
+    A run that reaches the end of a chunk is carried over and joined with
+    a run starting on the next day at the top of the next chunk; finished
+    runs go into a k-sized heap.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Chunked records ordered by City then Date
+    bucket : str, optional
+        AQI category (default is "Severe")
+    k : int, optional
+        Episodes to return (default is 20)
+
+    Returns
+    -------
+    pd.DataFrame
+        The k longest episodes, longest first
+    """
+    heap: List[Tuple] = []
+    seq = 0
+    carry: Optional[dict] = None  # open episode touching the previous chunk's end
+
+    def finish(episode: dict) -> None:
+        nonlocal seq
+        item = (episode["Days"], np.nan_to_num(episode["Peak_AQI"], nan=-np.inf), -seq, episode)
+        seq += 1
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, item)
+
+    for chunk in chunks:
+        chunk = coerce_frame(chunk)
+        if chunk.empty:
+            continue
+        episodes = find_episodes(chunk, bucket, assume_sorted=True).to_dict("records")
+        first_city = chunk["City"].iloc[0]
+        first_day = chunk["Date"].iloc[0]
+        last_city = chunk["City"].iloc[-1]
+        last_day = chunk["Date"].iloc[-1]
+
+        if carry is not None:
+            joins = (episodes and episodes[0]["City"] == carry["City"] == first_city
+                     and episodes[0]["Start"] == first_day
+                     and episodes[0]["Start"] - carry["End"] == pd.Timedelta(days=1))
+            if joins:
+                head = episodes.pop(0)
+                total = carry["Days"] + head["Days"]
+                carry = {
+                    "City": carry["City"], "Start": carry["Start"], "End": head["End"],
+                    "Days": total,
+                    "Peak_AQI": np.nanmax([carry["Peak_AQI"], head["Peak_AQI"]]),
+                    "Mean_AQI": np.nansum([carry["Mean_AQI"] * carry["Days"],
+                                           head["Mean_AQI"] * head["Days"]]) / total,
+                }
+                episodes.insert(0, carry)
+            else:
+                finish(carry)
+            carry = None
+
+        # The last run stays open if it reaches the final row of the chunk
+        if episodes and episodes[-1]["City"] == last_city and episodes[-1]["End"] == last_day:
+            carry = episodes.pop()
+        for episode in episodes:
+            finish(episode)
+
+    if carry is not None:
+        finish(carry)
+
+    best = sorted(heap, key=lambda item: item[:3], reverse=True)
+    return pd.DataFrame([item[3] for item in best], columns=EPISODE_COLUMNS)
@@ -0,0 +1,237 @@
+"""
+Stratified Progressive Sampling
+
+For very large datasets the EDA charts can be drawn from a sample first
+and refined on request. The sample is stratified: each (City, year)
+stratum keeps its own reservoir of up to ``capacity`` rows.
+
+Samples fed to charts use proportional allocation: every stratum
+contributes the same fraction of its rows, so histograms, medians,
+scatter plots and correlations drawn from the sample need no weights.
+A stratum gets exactly its share, rounded up or down at random (the
+expected count is exact), which keeps city shares steadier than a plain
+random sample. Equal allocation (up to ``k`` rows of every stratum)
+over-represents small strata, so it is only meant for ``stratified_mean``,
+which weights each stratum by its population.
+
+Every row gets a random key and a stratum keeps the rows with the smallest
+keys (bottom-k sampling, equivalent to reservoir sampling). This has two
+useful properties:
+
+- reservoirs built from separate chunks merge exactly, so they can be
+  filled while streaming through data
+- the sample with k rows per stratum is contained in the one with 2k rows
+  (the same holds for proportional samples), so refining a chart only
+  adds points, it never reshuffles them
+
+Estimates carry a stratified standard error, shown next to each chart.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import coerce_frame
+
+
+# Rows kept per (City, year) stratum at each refinement level; proportional
+# samples give this many rows to the largest stratum
+SAMPLE_LEVELS = {"Quick sample": 25, "Larger sample": 150}
+EXACT_LEVEL = "Exact"
+
+# Largest per-stratum reservoir kept (the biggest sample level)
+DEFAULT_CAPACITY = max(SAMPLE_LEVELS.values())
+
+# Datasets smaller than this are always shown exactly
+SAMPLING_MIN_ROWS = 5000
+
+STRATUM_COLUMN = "_stratum"
+KEY_COLUMN = "_sample_key"
+
+
+@dataclass(frozen=True)
+class SampleInfo:
+    """How a sample relates to the data it was drawn from."""
+    sample_rows: int
+    total_rows: int
+    strata: int
+
+    @property
+    def fraction(self) -> float:
+        return self.sample_rows / self.total_rows if self.total_rows else 1.0
+
+    @property
+    def exact(self) -> bool:
+        return self.sample_rows == self.total_rows
+
+
+def strata_labels(df: pd.DataFrame) -> pd.Series:
+    """Stratum of each row: ``"<City>|<year>"`` (missing parts become "?")."""
+    city = df["City"].astype("string").fillna("?") if "City" in df.columns else pd.Series("?", index=df.index)
+    if "Date" in df.columns:
+        year = df["Date"].dt.year.astype("Int64").astype("string").fillna("?")
+    else:
+        year = pd.Series("?", index=df.index)
+    return (city + "|" + year).astype(str)
+
+
+class StratifiedReservoir:
+    """
+    Bottom-k reservoirs per (City, year), fillable chunk by chunk.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Maximum rows kept per stratum
+    seed : int, optional
+        Random seed (the same data and seed give the same sample)
+
+    Examples
+    --------
+    >>> reservoir = StratifiedReservoir(capacity=150)
+    >>> for chunk in pd.read_csv("India_air.csv", chunksize=5000):
+    ...     reservoir.update(chunk)
+    >>> quick, info = reservoir.sample(25, proportional=True)
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, seed: int = 0):
+        self.capacity = int(capacity)
+        self._rng = np.random.default_rng(seed)
+        self._rows: Optional[pd.DataFrame] = None
+        self._population = pd.Series(dtype="int64")
+        # Random rounding offset per stratum, fixed so samples stay nested
+        self._offsets = pd.Series(dtype="float64")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, capacity: int = DEFAULT_CAPACITY,
+                   seed: int = 0) -> "StratifiedReservoir":
+        """Build the reservoirs from an in-memory dataset in one pass."""
+        reservoir = cls(capacity, seed)
+        reservoir.update(df)
+        return reservoir
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Add a chunk of rows, keeping only the ``capacity`` smallest keys per stratum.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Rows with ``City`` and ``Date`` columns
+        """
+        if chunk.empty:
+            return
+        chunk = coerce_frame(chunk)
+        strata = strata_labels(chunk)
+        self._population = self._population.add(strata.value_counts(), fill_value=0).astype("int64")
+        new = self._population.index.difference(self._offsets.index)
+        self._offsets = pd.concat([self._offsets, pd.Series(self._rng.random(len(new)), index=new)])
+
+        tagged = chunk.assign(**{STRATUM_COLUMN: strata.to_numpy(),
+                                 KEY_COLUMN: self._rng.random(len(chunk))})
+        if self._rows is not None:
+            tagged = pd.concat([self._rows, tagged], ignore_index=True)
+        self._rows = self._bottom_k(tagged, self.capacity)
+
+    @staticmethod
+    def _bottom_k(rows: pd.DataFrame, k: int) -> pd.DataFrame:
+        ordered = rows.sort_values([STRATUM_COLUMN, KEY_COLUMN], kind="stable")
+        rank = ordered.groupby(STRATUM_COLUMN, sort=False).cumcount().to_numpy()
+        return ordered[rank < k]
+
+    @property
+    def population(self) -> pd.Series:
+        """Number of rows seen per stratum."""
+        return self._population
+
+    def allocation(self, largest: int) -> pd.Series:
+        """
+        Proportional rows per stratum, with ``largest`` rows for the biggest one.
+
+        Every stratum is sampled at the same fraction ``largest / max(N)``;
+        the fractional part of its share is rounded up with that
+        probability using the stratum's fixed random offset.
+        """
+        fraction = min(1.0, largest / self._population.max())
+        share = self._population * fraction + self._offsets.reindex(self._population.index)
+        return np.floor(share).clip(upper=self._population).astype("int64")
+
+    def sample(self, per_stratum: Optional[int] = None,
+               proportional: bool = False) -> Tuple[pd.DataFrame, SampleInfo]:
+        """
+        Sample with up to ``per_stratum`` rows of every stratum.
+
+        Parameters
+        ----------
+        per_stratum : int, optional
+            Rows per stratum, at most ``capacity`` (default is ``capacity``)
+        proportional : bool, optional
+            Take the same fraction of every stratum instead, giving
+            ``per_stratum`` rows to the largest one (default is False).
+            Use this for rows that are charted or summarised directly;
+            equal allocation over-represents small strata
+
+        Returns
+        -------
+        tuple
+            ``(sample, info)``; the sample is in Date order and keeps the
+            helper column ``_stratum`` used by ``stratified_mean``
+        """
+        k = min(per_stratum or self.capacity, self.capacity)
+        total = int(self._population.sum())
+        if self._rows is None:
+            return pd.DataFrame(), SampleInfo(0, total, 0)
+        rows = self._bottom_k(self._rows, k)
+        if proportional:
+            quota = self.allocation(k).reindex(rows[STRATUM_COLUMN]).to_numpy()
+            rank = rows.groupby(STRATUM_COLUMN, sort=False).cumcount().to_numpy()
+            rows = rows[rank < quota]
+        rows = rows.drop(columns=KEY_COLUMN)
+        if "Date" in rows.columns:
+            rows = rows.sort_values("Date", kind="stable")
+        rows = rows.reset_index(drop=True)
+        return rows, SampleInfo(len(rows), total, len(self._population))
+
+
+def stratified_mean(sample: pd.DataFrame, column: str,
+                    population: pd.Series) -> Tuple[float, float]:
+    """
+    Stratified estimate of a column's mean and its standard error.
+
+    Parameters
+    ----------
+    sample : pd.DataFrame
+        Output of ``StratifiedReservoir.sample`` (with ``_stratum``)
+    column : str
+        Numeric column to estimate
+    population : pd.Series
+        Rows per stratum in the full data (``StratifiedReservoir.population``)
+
+    Returns
+    -------
+    tuple
+        ``(mean, standard_error)``; the error is 0 when every row was sampled
+    """
+    groups = sample.groupby(STRATUM_COLUMN)[column].agg(["mean", "var", "count"])
+    groups = groups[groups["count"] > 0]
+    if groups.empty:
+        return float("nan"), float("nan")
+    size = population.reindex(groups.index).fillna(groups["count"]).astype(float)
+    weight = size / size.sum()
+    # Finite population correction: strata sampled in full add no error
+    fpc = (1 - groups["count"] / size).clip(lower=0)
+    variance = (weight ** 2 * fpc * groups["var"].fillna(0) / groups["count"]).sum()
+    return float((weight * groups["mean"]).sum()), float(np.sqrt(variance))
+
+
+def correlation_error(r: float, n: int) -> float:
+    """Approximate standard error of a Pearson correlation from ``n`` rows."""
+    if n <= 3 or np.isnan(r):
+        return float("nan")
+    return float((1 - r ** 2) / np.sqrt(n - 1))
@@ -0,0 +1,170 @@
+"""
+Schema Registry for India Air Quality Data
+
+Single source of truth for the dataset's columns: names, dtypes, units,
+reasonable value ranges and the Date format. Every page and helper reads
+column lists from here instead of repeating them.
+
+The ``coerce_frame`` step runs once at ingestion (Data Overview page, dataset
+store) and marks the frame as normalized, so later pages can use it as-is
+without re-cleaning numeric columns or re-parsing dates.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Definition of one dataset column."""
+    name: str
+    dtype: str
+    unit: str = ""
+    valid_range: Optional[Tuple[float, float]] = None
+    description: str = ""
+
+
+# Bump when coercion rules change so frames normalized by an older
+# version are coerced again
+SCHEMA_VERSION = 1
+
+# Key in DataFrame.attrs used to mark a frame as already coerced
+NORMALIZED_ATTR = "schema_version"
+
+# Raw city files use day-first dates (e.g. 31/12/2019)
+DATE_FORMAT = "%d/%m/%Y"
+
+AQI_BUCKETS = ["Good", "Satisfactory", "Moderate", "Poor", "Very Poor", "Severe"]
+
+# Reasonable ranges are based on typical measurement ranges in India
+# and are used to warn about unusual readings, not to reject them
+SCHEMA: Dict[str, ColumnSpec] = {spec.name: spec for spec in [
+    ColumnSpec("City", "category", description="Monitoring city"),
+    ColumnSpec("Date", "datetime64[ns]", description="Measurement day"),
+    ColumnSpec("PM2.5", "float64", "μg/m³", (0, 500), "Particulate Matter 2.5"),
+    ColumnSpec("PM10", "float64", "μg/m³", (0, 600), "Particulate Matter 10"),
+    ColumnSpec("NO", "float64", "μg/m³", (0, 200), "Nitric Oxide"),
+    ColumnSpec("NO2", "float64", "μg/m³", (0, 200), "Nitrogen Dioxide"),
+    ColumnSpec("NOx", "float64", "μg/m³", (0, 300), "Nitrogen Oxides"),
+    ColumnSpec("NH3", "float64", "μg/m³", (0, 200), "Ammonia"),
+    ColumnSpec("CO", "float64", "mg/m³", (0, 10), "Carbon Monoxide"),
+    ColumnSpec("SO2", "float64", "μg/m³", (0, 100), "Sulfur Dioxide"),
+    ColumnSpec("O3", "float64", "μg/m³", (0, 300), "Ozone"),
+    ColumnSpec("Benzene", "float64", "μg/m³", (0, 50), "Benzene"),
+    ColumnSpec("Toluene", "float64", "μg/m³", (0, 100), "Toluene"),
+    ColumnSpec("Xylene", "float64", "μg/m³", (0, 100), "Xylene"),
+    ColumnSpec("AQI", "float64", "index", (0, 500), "Air Quality Index"),
+    ColumnSpec("AQI_Bucket", "category", description="AQI health category"),
+]}
+
+# Model inputs, in the order the model was trained on
+FEATURE_COLUMNS: List[str] = ['PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3',
+                              'CO', 'SO2', 'O3', 'Benzene', 'Toluene', 'Xylene']
+
+NUMERIC_COLUMNS: List[str] = FEATURE_COLUMNS + ['AQI']
+
+VALID_RANGES: Dict[str, Tuple[float, float]] = {
+    name: spec.valid_range for name, spec in SCHEMA.items() if spec.valid_range
+}
+
+UNITS: Dict[str, str] = {name: spec.unit for name, spec in SCHEMA.items() if spec.unit}
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """
+    Parse a Date column with the explicit ``DATE_FORMAT``.
+
+    An explicit format avoids pandas guessing (slow, and ambiguous for
+    dd/mm/yyyy). Values that do not match are retried as ISO dates
+    (yyyy-mm-dd), which is what the sample files and exports use.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Date strings or already-parsed datetimes
+
+    Returns
+    -------
+    pd.Series
+        datetime64 series with NaT for unparseable values
+
+    Examples
+    --------
+    >>> parse_dates(pd.Series(["02/01/2015", "2024-01-03"])).dt.day.tolist()
+    [2, 3]
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    parsed = pd.to_datetime(series, format=DATE_FORMAT, errors="coerce")
+    retry = parsed.isna() & series.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(series[retry], format="ISO8601", errors="coerce")
+    return parsed
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    """Convert to float64 with the same rules as utils.clean_numeric_column."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+    return pd.to_numeric(
+        series.astype(str).str.replace(",", "").str.strip(),
+        errors="coerce"
+    ).astype("float64")
+
+
+def is_normalized(df: pd.DataFrame) -> bool:
+    """Return True if ``df`` was produced by ``coerce_frame`` with this schema version."""
+    return df.attrs.get(NORMALIZED_ATTR) == SCHEMA_VERSION
+
+
+def coerce_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce a raw frame to the schema dtypes and mark it as normalized.
+
+    Numeric columns become float64 (commas and whitespace removed), Date is
+    parsed with ``DATE_FORMAT`` and City/AQI_Bucket become categoricals.
+    Columns not in the schema are left untouched. Frames that are already
+    normalized are returned unchanged, so calling this again is free.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw uploaded or loaded data
+
+    Returns
+    -------
+    pd.DataFrame
+        Coerced copy of the data, with ``attrs["schema_version"]`` set
+
+    Examples
+    --------
+    >>> raw = pd.DataFrame({"Date": ["01/02/2019"], "PM2.5": ["1,234"]})
+    >>> clean = coerce_frame(raw)
+    >>> clean["PM2.5"].iloc[0], is_normalized(clean)
+    (1234.0, True)
+    """
+    if is_normalized(df):
+        return df
+
+    df = df.copy()
+    for name in df.columns:
+        spec = SCHEMA.get(name)
+        if spec is None:
+            continue
+        if spec.dtype == "float64":
+            df[name] = _to_float(df[name])
+        elif spec.dtype.startswith("datetime64"):
+            df[name] = parse_dates(df[name])
+        elif name == "AQI_Bucket":
+            df[name] = pd.Categorical(df[name], categories=AQI_BUCKETS, ordered=True)
+        elif spec.dtype == "category" and not isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].astype("string").str.strip().astype("category")
+
+    df.attrs[NORMALIZED_ATTR] = SCHEMA_VERSION
+    return df
@@ -0,0 +1,340 @@
+"""
+Partitioned Dataset Store for India Air Quality Data
+
+This module keeps the merged air quality records in a columnar (Parquet)
+store partitioned by City and Year, instead of one flat CSV that has to be
+rewritten whenever a day of data is added.
+
+Layout on disk (Hive-style, readable by pyarrow/pandas directly):
+
+    air_store/
+        City=Delhi/
+            Year=2019/
+                part-00000.parquet
+                part-00001.parquet
+
+Features:
+- Append-only writes with de-duplication on (City, Date)
+- Compaction of partitions made up of many small part files
+- Partition pruning: reading "Delhi, 2019" only opens that directory
+- Sensor anomaly flags added while ingesting (see anomalies.py)
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python store.py ingest air_files_extracted/air_files/*.csv
+    python store.py ingest --window 30 air_files_extracted/air_files/*.csv
+    python store.py compact
+"""
+
+import os
+import argparse
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import coerce_frame
+from anomalies import AnomalyDetector, ANOMALY_WINDOW, ANOMALY_THRESHOLD
+
+
+# Default location of the store, next to India_air.csv
+STORE_DIR = "air_store"
+
+# Rows are unique on these columns; the store never holds two copies of them
+DEDUP_KEYS = ["City", "Date"]
+
+# Rows read from a CSV file at a time during ingestion
+INGEST_CHUNK_ROWS = 5000
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise a frame before it is written so every part file has the same schema.
+
+    Columns are coerced through the schema registry and rows without a City
+    or Date (which cannot be partitioned or de-duplicated) are dropped.
+    """
+    df = coerce_frame(df)
+    df = df.dropna(subset=DEDUP_KEYS)
+    # Plain strings keep part files independent of each batch's category set
+    df = df.assign(City=df["City"].astype(str))
+    df.attrs = {}
+    return df[df["City"] != ""]
+
+
+class DatasetStore:
+    """
+    Append-only Parquet store partitioned by City and Year.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Directory holding the store (default is ``air_store``)
+
+    Examples
+    --------
+    >>> store = DatasetStore("air_store")
+    >>> store.append(pd.read_csv("India_air.csv"))
+    29531
+    >>> delhi_2019 = store.read(cities=["Delhi"], years=[2019])
+    """
+
+    def __init__(self, root: Union[str, Path] = STORE_DIR):
+        self.root = Path(root)
+
+    def exists(self) -> bool:
+        """Return True if the store holds at least one partition."""
+        return any(True for _ in self.partitions())
+
+    # ------------------------------------------------------------------
+    # Partition layout
+    # ------------------------------------------------------------------
+    def _partition_dir(self, city: str, year: int) -> Path:
+        return self.root / f"City={city}" / f"Year={int(year)}"
+
+    def partitions(self,
+                   cities: Optional[Iterable[str]] = None,
+                   years: Optional[Iterable[int]] = None) -> List[Tuple[str, int, Path]]:
+        """
+        List partitions, pruned to the requested cities and years.
+
+        Only directory names are inspected, so pruning never opens a data file.
+
+        Parameters
+        ----------
+        cities : iterable of str, optional
+            Cities to keep (default is all cities)
+        years : iterable of int, optional
+            Years to keep (default is all years)
+
+        Returns
+        -------
+        list of tuple
+            ``(city, year, directory)`` for every matching partition
+        """
+        if not self.root.is_dir():
+            return []
+
+        city_filter = set(cities) if cities is not None else None
+        year_filter = {int(y) for y in years} if years is not None else None
+
+        found = []
+        for city_dir in sorted(self.root.glob("City=*")):
+            city = city_dir.name[len("City="):]
+            if city_filter is not None and city not in city_filter:
+                continue
+            for year_dir in sorted(city_dir.glob("Year=*")):
+                year = int(year_dir.name[len("Year="):])
+                if year_filter is not None and year not in year_filter:
+                    continue
+                found.append((city, year, year_dir))
+        return found
+
+    def cities(self) -> List[str]:
+        """Return the sorted list of cities held in the store."""
+        return sorted({city for city, _, _ in self.partitions()})
+
+    def years(self) -> List[int]:
+        """Return the sorted list of years held in the store."""
+        return sorted({year for _, year, _ in self.partitions()})
+
+    @staticmethod
+    def _part_files(directory: Path) -> List[Path]:
+        return sorted(directory.glob("part-*.parquet"))
+
+    @staticmethod
+    def _write_part(directory: Path, table: pa.Table) -> Path:
+        """Write a new part file atomically (temp file, then rename)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = DatasetStore._part_files(directory)
+        next_id = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+        target = directory / f"part-{next_id:05d}.parquet"
+        tmp = directory / f".{target.name}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, target)
+        return target
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Append records, skipping any (City, Date) already in the store.
+
+        Existing part files are never rewritten; new rows go to a fresh part
+        file in their partition. Within one batch the last occurrence of a
+        (City, Date) pair wins.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Records with at least ``City`` and ``Date`` columns
+
+        Returns
+        -------
+        int
+            Number of rows actually written
+        """
+        if df.empty:
+            return 0
+
+        df = _prepare(df)
+        df = df.drop_duplicates(subset=DEDUP_KEYS, keep="last")
+
+        written = 0
+        years = df["Date"].dt.year
+        for (city, year), part in df.groupby([df["City"], years], sort=True):
+            directory = self._partition_dir(city, year)
+
+            # Only the Date column of existing parts is needed for de-duplication
+            stored_dates = self._read_partition(directory, columns=["Date"])
+            if not stored_dates.empty:
+                part = part[~part["Date"].isin(stored_dates["Date"])]
+            if part.empty:
+                continue
+
+            table = pa.Table.from_pandas(part.sort_values("Date"), preserve_index=False)
+            self._write_part(directory, table)
+            written += len(part)
+
+        return written
+
+    def compact(self, max_files: int = 1) -> int:
+        """
+        Merge the part files of fragmented partitions into a single file.
+
+        Parameters
+        ----------
+        max_files : int, optional
+            Partitions with more part files than this are compacted (default is 1)
+
+        Returns
+        -------
+        int
+            Number of partitions that were compacted
+        """
+        compacted = 0
+        for _, _, directory in self.partitions():
+            files = self._part_files(directory)
+            if len(files) <= max_files:
+                continue
+
+            merged = self._read_partition(directory)
+            merged = merged.drop_duplicates(subset=DEDUP_KEYS, keep="last").sort_values("Date")
+            table = pa.Table.from_pandas(merged, preserve_index=False)
+
+            # Write the merged file first so a crash never loses data
+            new_file = self._write_part(directory, table)
+            for old in files:
+                if old != new_file:
+                    old.unlink()
+            compacted += 1
+        return compacted
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _read_partition(self, directory: Path,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+        files = self._part_files(directory) if directory.is_dir() else []
+        if not files:
+            return pd.DataFrame(columns=columns or [])
+        # Files store City but not Year (the year is only in the Year=
+        # directory name, see ``partitions``); partitioning=None stops
+        # pyarrow inferring City and Year from the City=/Year= path, which
+        # would clash with the stored City column and add a Year column
+        frames = [pq.read_table(f, columns=columns, partitioning=None).to_pandas() for f in files]
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def read(self,
+             cities: Optional[Iterable[str]] = None,
+             years: Optional[Iterable[int]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read records, opening only the partitions that match the filters.
+
+        Parameters
+        ----------
+        cities : iterable of str, optional
+            Cities to read (default is all)
+        years : iterable of int, optional
+            Years to read (default is all)
+        columns : list of str, optional
+            Columns to load; other columns are never read from disk
+
+        Returns
+        -------
+        pd.DataFrame
+            Matching records ordered by City then Date, already normalized
+            by the schema registry
+        """
+        frames = [self._read_partition(directory, columns)
+                  for _, _, directory in self.partitions(cities, years)]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        return coerce_frame(pd.concat(frames, ignore_index=True))
+
+
+def ingest_files(paths: Iterable[Union[str, Path]], root: Union[str, Path] = STORE_DIR,
+                 detector: Optional[AnomalyDetector] = None,
+                 chunk_rows: int = INGEST_CHUNK_ROWS) -> int:
+    """
+    Append one or more city CSV files to the store.
+
+    Files are read in chunks, so memory use does not grow with file size.
+    If a detector is given, each chunk is flagged for sensor anomalies
+    before it is written (the ``Anomaly_*`` columns are stored with it).
+
+    Parameters
+    ----------
+    paths : iterable of str or Path
+        CSV files such as ``air_files_extracted/air_files/Delhi_data.csv``
+    root : str or Path, optional
+        Store directory (default is ``air_store``)
+    detector : AnomalyDetector, optional
+        Anomaly detector; its ``summary()`` gives the flag counts afterwards
+    chunk_rows : int, optional
+        Rows read per chunk
+
+    Returns
+    -------
+    int
+        Total number of new rows written
+    """
+    store = DatasetStore(root)
+    written = 0
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            if detector is not None:
+                chunk = detector.process(chunk)
+            written += store.append(chunk)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the partitioned air quality store")
+    parser.add_argument("--root", default=STORE_DIR, help="store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="append CSV files to the store")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("--no-anomalies", action="store_true", help="skip sensor anomaly flagging")
+    ingest.add_argument("--window", type=int, default=ANOMALY_WINDOW, help="anomaly rolling window (readings)")
+    ingest.add_argument("--threshold", type=float, default=ANOMALY_THRESHOLD,
+                        help="anomaly threshold (robust standard deviations)")
+    sub.add_parser("compact", help="merge small part files")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        detector = None if args.no_anomalies else AnomalyDetector(window=args.window, threshold=args.threshold)
+        print(f"Rows written: {ingest_files(args.files, args.root, detector)}")
+        if detector is not None:
+            print("\nFlagged sensor anomalies:")
+            print(detector.summary().to_string(index=False))
+    else:
+        print(f"Partitions compacted: {DatasetStore(args.root).compact()}")
@@ -0,0 +1,86 @@
+"""
+Unit tests for the sensor anomaly detector
+
+Checks that spikes are flagged per city, that chunked processing matches a
+single pass and that flagged readings can be hidden.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+from anomalies import AnomalyDetector, flag_anomalies, hide_flagged, rolling_median_mad
+
+
+def make_data():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2019-01-01", periods=60).strftime("%d/%m/%Y")
+    frames = []
+    for city, level in [("Delhi", 2.0), ("Patna", 1.0)]:
+        co = level + rng.normal(0, 0.1, 60)
+        frames.append(pd.DataFrame({"City": city, "Date": dates, "CO": co,
+                                    "PM2.5": 100 + rng.normal(0, 5, 60)}))
+    df = pd.concat(frames, ignore_index=True)
+    df.loc[30, "CO"] = 16.0    # Delhi glitch
+    df.loc[95, "PM2.5"] = 900  # Patna spike
+    return df
+
+
+def test_rolling_window_stays_within_group():
+    """Windows never mix readings of two groups"""
+    values = np.array([1.0, 1.0, 1.0, 50.0, 50.0, 50.0])
+    starts = np.array([0, 0, 0, 3, 3, 3])
+    median, mad = rolling_median_mad(values, starts, window=3, min_periods=1)
+    assert np.isnan(median[0]) and np.isnan(median[3])
+    assert median[2] == 1.0 and median[5] == 50.0
+    assert mad[5] == 0.0
+
+
+def test_spikes_are_flagged_per_city():
+    """Only the injected glitches are flagged, and counted per city"""
+    flagged, summary = flag_anomalies(make_data(), window=10)
+    assert flagged.index[flagged["Anomaly_CO"]].tolist() == [30]
+    assert flagged.index[flagged["Anomaly_PM2.5"]].tolist() == [95]
+    assert flagged["Anomaly_Any"].sum() == 2
+    counts = summary.set_index("City")
+    assert counts.loc["Delhi", "CO"] == 1 and counts.loc["Patna", "PM2.5"] == 1
+    assert counts.loc["Delhi", "Rows"] == 60
+
+
+def test_small_reading_after_zeros_is_not_flagged():
+    """A run of zeros (no spread) does not turn an ordinary reading into a flag"""
+    dates = pd.date_range("2019-01-01", periods=25).strftime("%d/%m/%Y")
+    co = [0.0] * 20 + [0.66, 0.0, 0.0, 0.0, 8.0]
+    benzene = [0.0] * 20 + [0.02, 0.0, 0.0, 0.0, 0.0]
+    flagged, _ = flag_anomalies(pd.DataFrame({"City": "Delhi", "Date": dates, "CO": co, "Benzene": benzene}))
+    assert not flagged.loc[20, "Anomaly_CO"] and not flagged.loc[20, "Anomaly_Benzene"]
+    # A real glitch is still flagged
+    assert flagged.index[flagged["Anomaly_Any"]].tolist() == [24]
+
+
+def test_chunked_matches_single_pass():
+    """Carrying each city's last readings across chunks gives the same flags"""
+    df = make_data()
+    whole, _ = flag_anomalies(df, window=10)
+    detector = AnomalyDetector(columns=["CO", "PM2.5"], window=10)
+    # Interleave the cities, 7 rows at a time, in date order
+    ordered = df.iloc[np.argsort(np.tile(np.arange(60), 2), kind="stable")]
+    parts = [detector.process(ordered.iloc[i:i + 7]) for i in range(0, len(ordered), 7)]
+    chunked = pd.concat(parts).sort_index()
+    assert (chunked["Anomaly_CO"] == whole["Anomaly_CO"]).all()
+    assert (chunked["Anomaly_PM2.5"] == whole["Anomaly_PM2.5"]).all()
+
+
+def test_hide_flagged_blanks_only_flagged_readings():
+    """Flagged readings become NaN; the rest of the row is kept"""
+    flagged, _ = flag_anomalies(make_data(), window=10)
+    cleaned = hide_flagged(flagged)
+    assert np.isnan(cleaned.loc[30, "CO"]) and not np.isnan(cleaned.loc[30, "PM2.5"])
+    assert cleaned["CO"].isna().sum() == 1
+
+    # Rows stored before flagging have missing flags, which count as not flagged
+    flagged["Anomaly_CO"] = flagged["Anomaly_CO"].astype(object)
+    flagged.loc[30, "Anomaly_CO"] = None
+    assert not hide_flagged(flagged)["CO"].isna().any()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the rolling-origin backtest
+
+Checks that folds never train on days at or after their test window, that
+held-out cities are kept out of training, that imputation only uses
+training rows and that parallel runs give the same results as serial ones.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+
+from schema import FEATURE_COLUMNS
+from backtest import build_features, fold_rows, prepare_fold, rolling_origin_folds, run_backtest, summarize
+
+
+def make_data(days=900, cities=("Delhi", "Patna", "Chennai"), seed=0):
+    # AQI is a linear function of two pollutants plus noise
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2017-01-01", periods=days)
+    frames = []
+    for city in cities:
+        frame = pd.DataFrame(rng.gamma(2.0, 20.0, size=(days, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+        frame["AQI"] = 1.5 * frame["PM2.5"] + 0.5 * frame["PM10"] + rng.normal(0, 5, days)
+        frame.insert(0, "Date", dates)
+        frame.insert(0, "City", city)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_folds_only_train_on_the_past():
+    """Every training day is before its fold's test window, with the gap respected"""
+    matrix = build_features(make_data())
+    folds = rolling_origin_folds(matrix.days, n_folds=3, test_days=60, gap_days=7)
+    assert [f.number for f in folds] == [1, 2, 3]
+    assert folds[-1].test_end == pd.Timestamp(matrix.days.max()) + pd.Timedelta(days=1)
+    for fold in folds:
+        train, _, test, _ = fold_rows(matrix, fold)
+        assert matrix.days[train].max() < matrix.days[test].min() - np.timedelta64(7, "D")
+        assert (matrix.days[test] >= np.datetime64(fold.test_start.date())).all()
+        assert test.stop - test.start == 60 * 3
+
+    # Folds with less than a year of training are dropped
+    assert len(rolling_origin_folds(matrix.days, n_folds=2, test_days=300)) == 1
+    with pytest.raises(ValueError):
+        rolling_origin_folds(matrix.days, n_folds=1, test_days=600)
+
+
+def test_held_out_cities_and_training_medians():
+    """Held-out cities are only tested; gaps are filled with training medians"""
+    df = make_data()
+    last_day = df["Date"].max()
+    # Test-period readings are huge; Patna's last reading is missing
+    df.loc[df["Date"] > last_day - pd.Timedelta(days=30), "NH3"] = 1000.0
+    df.loc[(df["City"] == "Patna") & (df["Date"] == last_day), "NH3"] = np.nan
+    matrix = build_features(df)
+    fold = rolling_origin_folds(matrix.days, n_folds=1, test_days=30, held_out=["Patna"])[0]
+    data = prepare_fold(matrix, fold)
+    assert len(data.y_train) == 2 * (900 - 30) and len(data.y_test) == 30
+
+    patna = matrix.city_names.index("Patna")
+    train, train_keep, test, test_keep = fold_rows(matrix, fold)
+    assert (matrix.cities[train][train_keep] != patna).all()
+    assert (matrix.cities[test][test_keep] == patna).all()
+    # The missing reading is the median of the training rows only
+    nh3 = FEATURE_COLUMNS.index("NH3")
+    assert data.X_test[-1, nh3] == np.median(data.X_train[:, nh3]) < 1000.0
+    assert not np.isnan(data.X_train).any() and not np.isnan(data.X_test).any()
+
+    # A misspelt city would otherwise leave the test set empty
+    with pytest.raises(ValueError, match="Dehli"):
+        run_backtest(matrix, {"Ridge Regression": Ridge()}, n_folds=1, test_days=30,
+                     held_out=["Dehli"], n_jobs=1)
+
+
+def test_parallel_matches_serial():
+    """Per-fold metrics do not depend on the number of workers"""
+    df = make_data()
+    models = {"Linear Regression": LinearRegression(), "Ridge Regression": Ridge()}
+    serial = run_backtest(df, models, n_folds=3, test_days=90, n_jobs=1)
+    parallel = run_backtest(build_features(df), models, n_folds=3, test_days=90, n_jobs=2)
+    assert len(serial) == 6
+    pd.testing.assert_frame_equal(serial.drop(columns=["Fit_s", "Predict_s"]),
+                                  parallel.drop(columns=["Fit_s", "Predict_s"]))
+    assert (serial["R2"] > 0.9).all()
+
+    summary = summarize(serial)
+    assert list(summary["Model"]) == sorted(models, key=lambda m: -serial[serial.Model == m]["R2"].mean())
@@ -0,0 +1,60 @@
+"""
+Unit tests for multi-process batch scoring
+
+Checks that the forest attached from shared memory predicts the same as
+the original and that pooled scoring writes every row in input order.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from batch_score import SharedForest, score_files
+from forest_arrays import ForestArrays
+from schema import FEATURE_COLUMNS
+
+
+def make_files(tmp_path):
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.gamma(2.0, 20.0, size=(120, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    model = RandomForestRegressor(n_estimators=5, max_depth=5, random_state=0).fit(X, X["PM2.5"] * 2)
+    joblib.dump(model, tmp_path / "model.pkl")
+
+    paths = []
+    for i, city in enumerate(["Delhi", "Patna", "Jaipur"]):
+        part = X.iloc[i * 40:(i + 1) * 40].assign(City=city, Date="01/01/2020")
+        path = tmp_path / f"{city}_data.csv"
+        part.to_csv(path, index=False)
+        paths.append(str(path))
+    return model, X, paths
+
+
+def test_attached_forest_is_zero_copy(tmp_path):
+    """Arrays attached in another process view the shared block directly"""
+    model, X, _ = make_files(tmp_path)
+    shared = SharedForest(ForestArrays.from_model(model))
+    try:
+        forest, block = SharedForest.attach(shared.spec)
+        assert not forest.value.flags.owndata and not forest.value.flags.writeable
+        np.testing.assert_allclose(forest.predict(X), model.predict(X))
+        del forest
+        block.close()
+    finally:
+        shared.close()
+
+
+def test_score_files_streams_all_rows(tmp_path):
+    """Every input row is scored and written in input order"""
+    model, X, paths = make_files(tmp_path)
+    for output, chunk_rows in [(tmp_path / "out.csv", None), (tmp_path / "out.parquet", 15)]:
+        stats = score_files(paths, str(output), str(tmp_path / "model.pkl"), workers=2,
+                            chunk_rows=chunk_rows, intervals=True)
+        scored = pd.read_csv(output) if output.suffix == ".csv" else pd.read_parquet(output)
+        assert stats["rows"] == len(scored) == len(X)
+        assert scored["City"].tolist() == ["Delhi"] * 40 + ["Patna"] * 40 + ["Jaipur"] * 40
+        np.testing.assert_allclose(scored["Predicted_AQI"], model.predict(X), rtol=1e-6)
+        assert "AQI_Upper" in scored
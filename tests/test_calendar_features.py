@@ -0,0 +1,51 @@
+"""
+Unit tests for the vectorized calendar features
+
+Checks the array arithmetic against pandas' own date accessors and the
+notebook's original month → season mapping.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import pandas as pd
+
+from calendar_features import CALENDAR_COLUMNS, add_calendar_features, calendar_features
+
+
+def get_season(m):
+    # The notebook's original per-row mapping
+    if m in [12, 1, 2]: return "Winter"
+    if m in [3, 4, 5]: return "Summer"
+    if m in [6, 7, 8]: return "Monsoon"
+    return "Autumn"
+
+
+def test_matches_pandas_accessors():
+    """Year, month, ISO week and weekday agree with pandas for every day of 30 years"""
+    dates = pd.Series(pd.date_range("1999-12-25", "2030-01-05"))
+    features = calendar_features(dates)
+    iso = dates.dt.isocalendar()
+    assert (features["Year"] == dates.dt.year).all()
+    assert (features["Month"] == dates.dt.month).all()
+    assert (features["Week"].astype(int) == iso["week"].astype(int)).all()
+    assert (features["Weekday"] == dates.dt.weekday).all()
+    assert (features["Season"].astype(str) == dates.dt.month.apply(get_season)).all()
+
+
+def test_missing_dates_give_missing_features():
+    """NaT rows get missing values in every column; the index is kept"""
+    dates = pd.Series(pd.to_datetime(["2020-06-01", None, "2021-01-03"]), index=[5, 6, 7])
+    features = calendar_features(dates)
+    assert features.index.tolist() == [5, 6, 7]
+    assert features.loc[6].isna().all()
+    assert features.loc[7, "Week"] == 53 and features.loc[7, "Year"] == 2021
+    assert features["Season"].tolist()[0] == "Monsoon"
+
+
+def test_add_calendar_features():
+    """The columns are added next to the existing ones"""
+    df = pd.DataFrame({"Date": pd.to_datetime(["2019-12-31"]), "AQI": [300.0]})
+    out = add_calendar_features(df)
+    assert list(out.columns) == ["Date", "AQI"] + CALENDAR_COLUMNS
+    assert out.loc[0, "Week"] == 1 and out.loc[0, "Season"] == "Winter"
@@ -0,0 +1,82 @@
+"""
+Unit tests for the rendered chart cache
+
+Checks LRU eviction under the byte budget, dataset fingerprints, that
+figures are closed once rendered and that a failed render leaves other
+figures alone.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import pandas as pd
+import pytest
+from chart_cache import ChartCache, chart_key, dataset_fingerprint
+
+
+def test_lru_eviction_respects_byte_budget():
+    """Least recently used charts are evicted first"""
+    cache = ChartCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")  # "a" is now more recent than "b"
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.size <= 10
+    assert cache.evictions == 1
+
+
+def test_get_or_render_renders_once_and_closes_figure():
+    """The second request is a cache hit and no figures are left open"""
+    calls = []
+
+    def build():
+        calls.append(1)
+        fig, ax = plt.subplots()
+        ax.plot([1, 2, 3])
+        return fig
+
+    cache = ChartCache()
+    first = cache.get_or_render("line", build)
+    second = cache.get_or_render("line", build)
+
+    assert first == second
+    assert first.startswith(b"\x89PNG")
+    assert len(calls) == 1
+    assert plt.get_fignums() == []
+
+
+def test_failed_build_leaves_other_figures_open():
+    """A chart that fails half-way caches nothing and does not touch another session's figure"""
+    other, _ = plt.subplots()  # Figure another session is still drawing
+
+    def build():
+        fig = Figure()
+        fig.subplots().plot([1, 2, 3])
+        raise KeyError("PM2.5")
+
+    cache = ChartCache()
+    try:
+        with pytest.raises(KeyError):
+            cache.get_or_render("broken", build)
+        assert plt.get_fignums() == [other.number]
+        assert cache.size == 0
+    finally:
+        plt.close(other)
+
+
+def test_fingerprint_and_key_depend_on_contents():
+    """Same data gives the same key; different data or params do not"""
+    df = pd.DataFrame({"City": ["Delhi"], "AQI": [200.0]})
+    fp = dataset_fingerprint(df)
+
+    assert fp == dataset_fingerprint(df.copy())
+    assert fp != dataset_fingerprint(df.assign(AQI=[201.0]))
+    assert chart_key(fp, "histogram", column="AQI") == chart_key(fp, "histogram", column="AQI")
+    assert chart_key(fp, "histogram", column="AQI") != chart_key(fp, "histogram", column="PM2.5")
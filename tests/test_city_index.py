@@ -0,0 +1,57 @@
+"""
+Unit tests for the sorted (City, Date) index
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+from city_index import CityDateIndex
+
+
+def make_data():
+    # Deliberately unsorted, with one missing date
+    return pd.DataFrame({
+        "City": ["Patna", "Delhi", "Delhi", "Patna", "Delhi", "Delhi"],
+        "Date": ["03/01/2019", "02/01/2019", "01/01/2019", "01/01/2019", "05/01/2019", None],
+        "AQI": [300, 200, 100, 250, 500, 50],
+    })
+
+
+def test_slice_matches_boolean_mask():
+    """City + window selection gives the same rows as a full-scan filter"""
+    index = CityDateIndex(make_data())
+    result = index.slice("Delhi", "2019-01-02", "2019-01-05")
+
+    assert result["Date"].dt.day.tolist() == [2, 5]
+    assert result["AQI"].tolist() == [200, 500]
+
+
+def test_slice_is_zero_copy():
+    """A city slice shares memory with the sorted frame"""
+    index = CityDateIndex(make_data())
+    result = index.slice("Patna")
+    assert np.shares_memory(result["AQI"].to_numpy(), index.frame["AQI"].to_numpy())
+
+
+def test_all_cities_window_and_bounds():
+    """None means all cities; bounds ignore missing dates"""
+    index = CityDateIndex(make_data())
+
+    assert len(index.slice(None, "2019-01-01", "2019-01-01")) == 2
+    assert len(index.slice("Delhi")) == 4  # including the row without a date
+    assert index.date_bounds("Delhi") == (pd.Timestamp(2019, 1, 1), pd.Timestamp(2019, 1, 5))
+    assert index.slice("Mumbai").empty
+
+
+def test_sorted_input_is_not_copied():
+    """Already (City, Date)-sorted data is used as is; all-city windows come in Date order"""
+    df = CityDateIndex(make_data()).frame
+    index = CityDateIndex(df)
+    assert np.shares_memory(index.frame["AQI"].to_numpy(), df["AQI"].to_numpy())
+    assert index.slice(None) is index.frame
+
+    window = index.slice(None, "2019-01-01", "2019-01-03")
+    assert window["Date"].dt.day.tolist() == [1, 1, 2, 3]
+    assert index.date_bounds() == (pd.Timestamp(2019, 1, 1), pd.Timestamp(2019, 1, 5))
@@ -0,0 +1,68 @@
+"""
+Unit tests for city similarity and clustering
+
+Checks the date-grid alignment, that the blocked NaN-aware correlation
+equals pandas' pairwise correlation and that clustering recovers groups
+of cities that move together.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+from city_similarity import AlignedSeries, align_series, cluster_cities, most_similar, similarity_matrices
+
+
+def make_series(n_cities=6, n_days=200, seed=0):
+    # Two groups of cities following two different signals, with gaps
+    rng = np.random.default_rng(seed)
+    signals = rng.normal(size=(2, n_days)).cumsum(axis=1)
+    values = np.array([signals[i % 2] + rng.normal(0, 0.5, n_days) for i in range(n_cities)])
+    values[rng.random(values.shape) < 0.3] = np.nan
+    cities = [f"City{i}" for i in range(n_cities)]
+    return AlignedSeries(values, cities, pd.date_range("2019-01-01", periods=n_days))
+
+
+def test_align_series_averages_same_day_readings():
+    """Readings go on one daily grid; duplicates are averaged, gaps are NaN"""
+    df = pd.DataFrame({
+        "City": ["Delhi", "Delhi", "Delhi", "Patna"],
+        "Date": ["01/01/2020", "01/01/2020", "04/01/2020", "02/01/2020"],
+        "PM2.5": [10.0, 20.0, 30.0, 5.0],
+    })
+    aligned = align_series(df, "PM2.5")
+    assert aligned.cities == ["Delhi", "Patna"]
+    assert len(aligned.dates) == 4
+    np.testing.assert_array_equal(aligned.values[0], [15.0, np.nan, np.nan, 30.0])
+    np.testing.assert_array_equal(aligned.values[1], [np.nan, 5.0, np.nan, np.nan])
+
+
+def test_blocked_correlation_matches_pandas():
+    """Blocks of 4 cities give pandas' pairwise-complete correlation"""
+    aligned = make_series(n_cities=10)
+    correlation, distance, overlap = similarity_matrices(aligned, min_overlap=30, block=4)
+    expected = pd.DataFrame(aligned.values.T, columns=aligned.cities).corr(min_periods=30)
+    np.testing.assert_allclose(correlation.to_numpy(), expected.to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(np.diag(distance), 0.0, atol=1e-6)
+    assert overlap.iloc[0, 0] == np.sum(~np.isnan(aligned.values[0]))
+
+
+def test_short_overlap_is_missing():
+    """Pairs with too few common days get no similarity"""
+    aligned = make_series(n_cities=2)
+    aligned.values[1, :150] = np.nan
+    correlation, _, _ = similarity_matrices(aligned, min_overlap=60)
+    assert np.isnan(correlation.iloc[0, 1]) and correlation.iloc[0, 0] == 1.0
+
+
+def test_clusters_follow_shared_signals():
+    """Cities driven by the same signal end up in the same cluster"""
+    aligned = make_series()
+    correlation, _, _ = similarity_matrices(aligned)
+    labels, order = cluster_cities(correlation, n_clusters=2)
+    assert labels.iloc[0::2].nunique() == 1 and labels.iloc[1::2].nunique() == 1
+    assert labels.iloc[0] != labels.iloc[1]
+    assert sorted(order) == aligned.cities
+    assert most_similar(correlation, "City0", k=2).index.tolist() in (["City2", "City4"], ["City4", "City2"])
@@ -0,0 +1,73 @@
+"""
+Unit tests for the streaming XLSX reader
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import os
+from io import BytesIO
+
+import pandas as pd
+import pytest
+import excel_reader
+from excel_reader import list_sheets, read_sheet, read_excel_cached
+
+
+@pytest.fixture
+def workbook_bytes():
+    buffer = BytesIO()
+    delhi = pd.DataFrame({
+        "City": ["Delhi", "Delhi"],
+        "Date": ["01/02/2019", "02/02/2019"],
+        "PM2.5": [120.5, None],
+        "AQI": ["1,205", "300"],
+    })
+    mumbai = pd.DataFrame({"City": ["Mumbai"], "Date": ["01/02/2019"], "PM2.5": [80.0], "AQI": [150]})
+    with pd.ExcelWriter(buffer) as writer:
+        delhi.to_excel(writer, sheet_name="Delhi", index=False)
+        mumbai.to_excel(writer, sheet_name="Mumbai", index=False)
+    return buffer.getvalue()
+
+
+def test_read_sheet_types_columns(workbook_bytes):
+    """Pollutant columns are float64 and dates use the schema format"""
+    df = read_sheet(workbook_bytes, "Delhi")
+
+    assert df["PM2.5"].dtype == "float64"
+    assert pd.isna(df["PM2.5"].iloc[1])
+    assert df["AQI"].tolist() == [1205.0, 300.0]
+    assert df["Date"].iloc[0] == pd.Timestamp(2019, 2, 1)
+
+
+def test_read_sheet_matches_read_excel(workbook_bytes):
+    """The streaming reader gives the same numbers as pd.read_excel"""
+    fast = read_sheet(workbook_bytes, "Mumbai")
+    slow = pd.read_excel(BytesIO(workbook_bytes), sheet_name="Mumbai")
+    assert fast["PM2.5"].tolist() == slow["PM2.5"].tolist()
+
+
+def test_cached_read_combines_sheets(workbook_bytes, tmp_path):
+    """Multiple sheets are combined and cached as Parquet"""
+    assert list_sheets(workbook_bytes) == ["Delhi", "Mumbai"]
+
+    first = read_excel_cached(workbook_bytes, ["Delhi", "Mumbai"], cache_dir=tmp_path)
+    assert len(first) == 3
+    assert len(list(tmp_path.glob("*.parquet"))) == 2
+
+    second = read_excel_cached(workbook_bytes, ["Delhi", "Mumbai"], cache_dir=tmp_path)
+    assert second["AQI"].tolist() == first["AQI"].tolist()
+
+
+def test_cache_is_keyed_by_schema_and_bounded(workbook_bytes, tmp_path, monkeypatch):
+    """A new schema version re-parses; the oldest files go once over the limit"""
+    read_excel_cached(workbook_bytes, ["Delhi", "Mumbai"], cache_dir=tmp_path)
+    old = sorted(tmp_path.glob("*.parquet"))
+    for path in old:
+        os.utime(path, (0, 0))
+    limit = sum(path.stat().st_size for path in old)
+
+    monkeypatch.setattr(excel_reader, "SCHEMA_VERSION", 2)
+    read_excel_cached(workbook_bytes, ["Delhi", "Mumbai"], cache_dir=tmp_path, max_bytes=limit)
+    kept = sorted(path.name for path in tmp_path.iterdir())
+    assert len(kept) == 2 and all(name.startswith("s2-") for name in kept)
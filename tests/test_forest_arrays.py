@@ -0,0 +1,110 @@
+"""
+Unit tests for the flattened forest, feature contributions and batch scoring
+
+Checks that predictions match scikit-learn (including missing values),
+that contributions add up to the prediction and that intervals agree with
+the individual trees.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_arrays import ForestArrays
+from explain import feature_contributions, contributions_frame
+from intervals import predict_interval, bucket_probabilities
+from scoring import score_frame
+from schema import AQI_BUCKETS, FEATURE_COLUMNS
+from utils import get_aqi_categories
+
+
+def make_model(seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.gamma(2.0, 20.0, size=(300, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = 1.5 * X["PM2.5"] + 0.5 * X["PM10"] + rng.normal(0, 5, len(X))
+    model = RandomForestRegressor(n_estimators=12, max_depth=6, random_state=seed).fit(X, y)
+    return model, X
+
+
+def test_predict_matches_sklearn():
+    """Flattened traversal gives the same predictions as model.predict"""
+    model, X = make_model()
+    forest = ForestArrays.from_model(model)
+    assert forest.n_trees == 12
+    np.testing.assert_allclose(forest.predict(X), model.predict(X))
+    np.testing.assert_allclose(forest.predict_per_tree(X[:5]).mean(axis=1), model.predict(X[:5]))
+
+
+def test_missing_values_follow_sklearn():
+    """NaN inputs take the same branch as in scikit-learn"""
+    model, X = make_model()
+    X = X.copy()
+    X.iloc[::3, 0] = np.nan
+    forest = ForestArrays.from_model(model)
+    np.testing.assert_allclose(forest.predict(X), model.predict(X))
+
+
+def test_round_trip_arrays():
+    """from_arrays rebuilds an equivalent forest"""
+    model, X = make_model()
+    forest = ForestArrays.from_model(model)
+    copy = ForestArrays.from_arrays(forest.to_arrays(), forest.feature_names, forest.max_depth)
+    np.testing.assert_allclose(copy.predict(X), forest.predict(X))
+
+
+def test_contributions_sum_to_prediction():
+    """bias + contributions equals the prediction; unused features get 0"""
+    model, X = make_model()
+    forest = ForestArrays.from_model(model)
+    bias, contrib = feature_contributions(forest, X)
+    assert contrib.shape == (len(X), len(FEATURE_COLUMNS))
+    np.testing.assert_allclose(bias + contrib.sum(axis=1), model.predict(X))
+
+    unused = np.setdiff1d(np.arange(len(FEATURE_COLUMNS)),
+                          np.concatenate([e.tree_.feature[e.tree_.feature >= 0] for e in model.estimators_]))
+    assert np.all(contrib[:, unused] == 0)
+
+    table = contributions_frame(forest, X.iloc[[0]])
+    assert list(table.columns) == ["Feature", "Value", "Contribution"]
+    assert abs(table["Contribution"].iloc[0]) == abs(table["Contribution"]).max()
+
+
+def test_score_frame_columns():
+    """score_frame adds predictions, buckets and contribution columns"""
+    model, X = make_model()
+    forest = ForestArrays.from_model(model)
+    df = X.assign(City="Delhi")
+    scored = score_frame(forest, df, contributions=True)
+    np.testing.assert_allclose(scored["Predicted_AQI"], model.predict(X))
+    assert "Predicted_Bucket" in scored and "Contribution_PM2.5" in scored
+    parts = scored[[f"Contribution_{name}" for name in FEATURE_COLUMNS] + ["Contribution_Bias"]].sum(axis=1)
+    np.testing.assert_allclose(parts, scored["Predicted_AQI"])
+    assert "Predicted_AQI" not in df
+
+    # Plain scoring predicts with the model itself when it is given
+    plain = score_frame(forest, df, model=model)
+    np.testing.assert_allclose(plain["Predicted_AQI"], model.predict(X))
+    assert "Contribution_Bias" not in plain
+
+
+def test_intervals_and_bucket_probabilities():
+    """Interval brackets the mean and bucket probabilities match per-tree votes"""
+    model, X = make_model()
+    forest = ForestArrays.from_model(model)
+    summary = predict_interval(forest, X)
+    np.testing.assert_allclose(summary["Predicted_AQI"], model.predict(X))
+    assert (summary["AQI_Lower"] <= summary["Predicted_AQI"]).all()
+    assert (summary["AQI_Upper"] >= summary["Predicted_AQI"]).all()
+
+    per_tree = np.column_stack([e.predict(X.to_numpy()) for e in model.estimators_])
+    probabilities = bucket_probabilities(per_tree)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    votes = get_aqi_categories(per_tree[0])
+    expected = [np.mean(votes == name) for name in AQI_BUCKETS]
+    np.testing.assert_allclose(probabilities[0], expected)
+
+    scored = score_frame(forest, X, intervals=True)
+    assert {"AQI_Lower", "AQI_Upper", "P_Severe"} <= set(scored.columns)
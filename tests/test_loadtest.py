@@ -0,0 +1,55 @@
+"""
+Unit tests for the load-testing harness
+
+Runs a small scenario against a real server and checks the baseline
+comparison.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import os
+
+import pandas as pd
+
+from loadtest import DEFAULT_DATA, ROOT, ScenarioResult, find_regressions, run_scenario
+from preloaded import PRELOAD_ENV_VAR, build_preloaded
+
+
+def make_result(**changes):
+    values = dict(scenario="upload", sessions=2, reruns=4, errors=0, first_error="",
+                  p50_ms=100.0, p95_ms=200.0, max_ms=250.0, wall_s=1.0, cpu_s=0.9,
+                  cpu_percent=90.0, peak_rss_mb=150.0)
+    values.update(changes)
+    return ScenarioResult(**values)
+
+
+def run_upload(monkeypatch, preload_dir):
+    monkeypatch.setenv("AQI_APP_WARMUP", "0")
+    monkeypatch.setenv(PRELOAD_ENV_VAR, str(preload_dir))
+    return run_scenario("upload", sessions=2)
+
+
+def test_upload_scenario_runs_concurrently(monkeypatch, tmp_path):
+    """Two sessions upload the sample file to one server and every rerun is timed"""
+    # No preloaded dataset: open the page, then upload (two reruns each)
+    result = run_upload(monkeypatch, tmp_path / "none")
+    assert result.reruns == 4 and result.errors == 0
+    assert 0 < result.p50_ms <= result.p95_ms <= result.max_ms
+    assert result.peak_rss_mb > 0 and result.cpu_s > 0
+
+
+def test_upload_scenario_leaves_the_preloaded_source(monkeypatch, tmp_path):
+    """With a preloaded dataset, each session first switches the source to uploads"""
+    build_preloaded(pd.read_csv(os.path.join(ROOT, DEFAULT_DATA)), str(tmp_path / "preloaded"))
+    result = run_upload(monkeypatch, tmp_path / "preloaded")
+    assert result.reruns == 6 and result.errors == 0
+
+
+def test_find_regressions():
+    """Slower p95, more memory or new errors beyond the tolerance are reported"""
+    baseline = [vars(make_result())]
+    assert find_regressions([make_result(p95_ms=240.0)], baseline) == []
+    assert len(find_regressions([make_result(p95_ms=300.0)], baseline)) == 1
+    assert len(find_regressions([make_result(peak_rss_mb=400.0, errors=1)], baseline)) == 2
+    assert find_regressions([make_result(scenario="predict")], baseline) == []
@@ -0,0 +1,94 @@
+"""
+Unit tests for latency-budgeted model selection
+
+Checks greedy tree selection, forest subsets, budget filtering, refitting
+the selected variant on all rows and the atomic model write and its publication to the registry.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from model_budget import (Budget, build_variants, greedy_tree_order, forest_subset, measure_latency,
+                          refit_variant, select_variant, within_budget, deploy_model)
+from model_registry import current_version, list_versions
+from schema import FEATURE_COLUMNS
+
+
+def test_greedy_order_prefers_accurate_trees():
+    """The tree closest to the target is picked first and no tree twice"""
+    y = np.array([10.0, 20.0, 30.0])
+    per_tree = np.column_stack([y + 50, y + 1, y - 30, y - 1])
+    order = greedy_tree_order(per_tree, y, 4)
+    assert order[0] in (1, 3)
+    assert set(order[:2]) == {1, 3}  # +1 and -1 cancel out
+    assert sorted(order) == [0, 1, 2, 3]
+
+
+def test_forest_subset_predicts_mean_of_kept_trees():
+    """A subset forest averages only the selected trees"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(100, 3)), columns=["a", "b", "c"])
+    y = X["a"] * 3 + rng.normal(size=100)
+    model = RandomForestRegressor(n_estimators=8, max_depth=4, random_state=0).fit(X, y)
+    subset = forest_subset(model, [1, 5])
+    expected = (model.estimators_[1].predict(X.to_numpy()) + model.estimators_[5].predict(X.to_numpy())) / 2
+    np.testing.assert_allclose(subset.predict(X), expected)
+    assert len(model.estimators_) == 8
+
+    latency = measure_latency(subset, X, repeat=5, batch_rows=50)
+    assert latency["single_p50_ms"] <= latency["single_p99_ms"]
+
+
+def test_refit_variant_uses_all_rows():
+    """Deployed forests and distilled trees are retrained on all rows; greedy subsets are kept"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = X["a"] * 3 + rng.normal(size=200)
+    train, val = X.index[:120], X.index[120:160]
+    reference = RandomForestRegressor(n_estimators=8, max_depth=6, random_state=0).fit(X.loc[train], y.loc[train])
+    variants = build_variants(reference, X.loc[train], y.loc[train], X.loc[val], y.loc[val],
+                              tree_counts=(4,), depths=(3,), distill_depths=(3,))
+
+    for name, model in variants.items():
+        final = refit_variant(name, model, reference, X, y)
+        if name.startswith("greedy"):
+            assert final is model
+        else:
+            assert final is not model and final.get_params() == model.get_params()
+            assert final.n_features_in_ == 3
+            assert not np.allclose(final.predict(X), model.predict(X))
+
+
+def test_select_variant_respects_budget(tmp_path):
+    """The most accurate variant within every limit is chosen"""
+    report = pd.DataFrame({
+        "Variant": ["big", "medium", "small"],
+        "R2": [0.90, 0.88, 0.80],
+        "single_p99_ms": [40.0, 10.0, 1.0],
+        "batch_p99_ms": [100.0, 30.0, 2.0],
+        "Size_MB": [100.0, 20.0, 0.1],
+    })
+    assert within_budget(report, Budget(25, 250, 50)).tolist() == [False, True, True]
+    assert select_variant(report, Budget(25, 250, 50)) == "medium"
+    assert select_variant(report, Budget(25, 250, 10)) == "small"
+    assert select_variant(report, Budget(0.5, 250, 50)) is None
+
+    path = tmp_path / "model.pkl"
+    assert deploy_model({"name": "medium"}, str(path), registry=None) is None
+    assert joblib.load(path) == {"name": "medium"}
+    assert not (tmp_path / "model.pkl.tmp").exists()
+
+    # Deploying publishes the file, so the app serves it even when a registry exists
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.gamma(2.0, 30.0, size=(100, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    forest = RandomForestRegressor(n_estimators=3, max_depth=3, random_state=0).fit(X, X["PM2.5"])
+    registry = str(tmp_path / "registry")
+    deploy_model(forest, str(path), registry, metrics={"R2": 0.8})
+    manifest = deploy_model(forest_subset(forest, [0]), str(path), registry, metrics={"R2": 0.9})
+    assert current_version(registry) == manifest["version"] == "v0002"
+    assert [m["metrics"]["R2"] for m in list_versions(registry)] == [0.8, 0.9]
@@ -0,0 +1,120 @@
+"""
+Unit tests for the versioned model registry
+
+Checks publishing and the atomic CURRENT pointer, that models the app
+could not serve are rejected up front, that a live model keeps serving the
+old version until the new one has warmed up, that a broken version is never
+served and that the unversioned fallback file is reloaded when it is
+replaced.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+import model_registry
+from model_registry import LiveModel, activate, current_version, list_versions, publish
+from schema import FEATURE_COLUMNS
+
+
+def save_forest(path, seed):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.gamma(2.0, 30.0, size=(200, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = 2 * X["PM2.5"] + rng.normal(0, 5, len(X))
+    joblib.dump(RandomForestRegressor(n_estimators=5, max_depth=4, random_state=seed).fit(X, y), path)
+    return str(path)
+
+
+def test_publish_and_activate(tmp_path):
+    """Versions are numbered, CURRENT moves on publish and can be rolled back"""
+    registry = str(tmp_path / "registry")
+    assert current_version(registry) is None and list_versions(registry) == []
+
+    first = publish(save_forest(tmp_path / "a.pkl", 0), registry, note="first")
+    second = publish(save_forest(tmp_path / "b.pkl", 1), registry, make_current=False)
+    assert [m["version"] for m in list_versions(registry)] == ["v0001", "v0002"]
+    assert current_version(registry) == "v0001"
+    assert first["note"] == "first" and len(second["sha256"]) == 64
+
+    activate("v0002", registry)
+    assert current_version(registry) == "v0002"
+    assert sorted(os.listdir(registry)) == ["CURRENT", "versions"]
+    with pytest.raises(ValueError):
+        activate("v0009", registry)
+
+
+def test_models_that_cannot_be_served_are_rejected(tmp_path):
+    """A model that is not a tree forest is neither published nor activated"""
+    registry = str(tmp_path / "registry")
+    X = pd.DataFrame(np.ones((5, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    joblib.dump(Ridge().fit(X, np.arange(5.0)), tmp_path / "ridge.pkl")
+    with pytest.raises(ValueError, match="cannot be served"):
+        publish(str(tmp_path / "ridge.pkl"), registry)
+    assert list_versions(registry) == []
+
+    publish(save_forest(tmp_path / "a.pkl", 0), registry)
+    publish(str(tmp_path / "ridge.pkl"), registry, make_current=False, check=False)
+    with pytest.raises(ValueError, match="cannot be served"):
+        activate("v0002", registry)
+    assert current_version(registry) == "v0001"
+
+
+def test_live_model_swaps_after_warmup(tmp_path, monkeypatch):
+    """The old version serves while the new one loads; broken versions are skipped"""
+    registry = str(tmp_path / "registry")
+    publish(save_forest(tmp_path / "a.pkl", 0), registry)
+    live = LiveModel(registry, fallback=str(tmp_path / "missing.pkl"))
+    assert live.current().version == "v0001"
+
+    # Hold the new version's load until the old one has been checked
+    release = threading.Event()
+    load_handle = model_registry.load_handle
+
+    def slow_load(*args):
+        release.wait(10)
+        return load_handle(*args)
+
+    monkeypatch.setattr(model_registry, "load_handle", slow_load)
+    publish(save_forest(tmp_path / "b.pkl", 1), registry)
+    thread = live.check()
+    assert live.loading == "v0002" and live.current().version == "v0001"
+    release.set()
+    thread.join()
+    handle = live.current()
+    assert handle.version == "v0002" and handle.warmup_seconds > 0
+    row = model_registry.warmup_rows(3)
+    np.testing.assert_allclose(handle.forest.predict(row), handle.model.predict(row))
+
+    # A file that is not a model fails its warm-up and is never served
+    with open(tmp_path / "broken.pkl", "wb") as f:
+        f.write(b"not a model")
+    publish(str(tmp_path / "broken.pkl"), registry, check=False)
+    live.check().join()
+    assert live.current().version == "v0002"
+    assert "v0003" in live.last_error
+    assert live.check() is None
+
+
+def test_fallback_file_is_reloaded_when_replaced(tmp_path):
+    """Without a registry the fallback file is served and reloaded after a replace"""
+    path = save_forest(tmp_path / "aqi_model.pkl", 0)
+    live = LiveModel(str(tmp_path / "registry"), fallback=path)
+    first = live.current()
+    assert first.version == "unversioned"
+
+    save_forest(tmp_path / "new.pkl", 1)
+    os.replace(tmp_path / "new.pkl", path)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    live.check().join()
+    assert live.current() is not first
+    assert live.current().manifest["source"] == "aqi_model.pkl"
+    assert LiveModel(str(tmp_path / "none"), fallback=str(tmp_path / "missing.pkl")).available() is False
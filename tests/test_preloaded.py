@@ -0,0 +1,75 @@
+"""
+Unit tests for the memory-mapped preloaded dataset
+
+Checks that the per-column arrays round-trip to the same frame, that they
+are memory-mapped read-only without copies and that sessions without an
+upload are given the shared dataset.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import mmap
+
+import numpy as np
+import pandas as pd
+
+from preloaded import build_preloaded, default_dataset, known_fingerprint, open_preloaded, use_default_dataset
+from schema import coerce_frame, is_normalized
+
+
+def make_data():
+    return coerce_frame(pd.DataFrame({
+        "City": ["Patna", "Delhi", "Delhi", None],
+        "Date": ["02/01/2020", "02/01/2020", "01/01/2020", "03/01/2020"],
+        "PM2.5": [10.0, None, 30.0, 40.0],
+        "AQI_Bucket": ["Good", "Poor", None, "Severe"],
+        "Station": ["A", "B", "B", None],
+    }))
+
+
+def is_mapped(array):
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def test_round_trip_sorted_by_city_and_date(tmp_path):
+    """The mapped frame equals the source sorted by City then Date"""
+    df = make_data()
+    manifest = build_preloaded(df, str(tmp_path / "pre"))
+    dataset = open_preloaded(str(tmp_path / "pre"))
+    expected = df.sort_values(["City", "Date"], kind="stable", na_position="first").reset_index(drop=True)
+    pd.testing.assert_frame_equal(dataset.frame.drop(columns="Station"), expected.drop(columns="Station"))
+    # Other text columns come back as categories
+    station = dataset.frame["Station"]
+    assert station.isna().tolist() == [True, False, False, False] and station[1:].tolist() == ["B", "B", "A"]
+    assert manifest["rows"] == 4 and dataset.fingerprint == manifest["fingerprint"]
+
+
+def test_columns_are_memory_mapped_read_only(tmp_path):
+    """Every column views the mapped file; the frame is already normalized"""
+    build_preloaded(make_data(), str(tmp_path / "pre"))
+    frame = open_preloaded(str(tmp_path / "pre")).frame
+    for name in ["City", "Date", "PM2.5", "AQI_Bucket"]:
+        values = frame[name].array.codes if name in ("City", "AQI_Bucket") else frame[name].to_numpy()
+        assert is_mapped(values) and not values.flags.writeable
+    assert is_normalized(frame) and coerce_frame(frame) is frame
+
+
+def test_sessions_share_one_mapping(tmp_path):
+    """Sessions without data get the same frame; a rebuild is picked up"""
+    directory = str(tmp_path / "pre")
+    assert default_dataset(directory) is None
+    build_preloaded(make_data(), directory)
+
+    first, second = {}, {}
+    assert use_default_dataset(first, directory) and use_default_dataset(second, directory)
+    assert first["df"] is second["df"]
+    assert known_fingerprint(first["df"]) == default_dataset(directory).fingerprint
+
+    uploaded = {"df": make_data()}
+    assert not use_default_dataset(uploaded, directory)
+    assert known_fingerprint(uploaded["df"]) is None
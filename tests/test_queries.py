@@ -0,0 +1,79 @@
+"""
+Unit tests for the ranking queries
+
+Checks top-K selection, streaming results against in-memory results and
+run-length episode detection.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from queries import (top_k_rows, top_k_groups, top_k_rows_stream, top_k_groups_stream,
+                     find_episodes, longest_episodes, longest_episodes_stream)
+from utils import get_aqi_category, get_aqi_categories
+
+
+def make_data():
+    dates = pd.date_range("2019-01-01", periods=10).strftime("%d/%m/%Y")
+    return pd.DataFrame({
+        "City": ["Delhi"] * 10 + ["Patna"] * 10,
+        "Date": list(dates) * 2,
+        # Delhi: Severe on days 2-4 and 7-8; Patna: Severe on days 1-6
+        "AQI": [300, 450, 460, 470, 200, 100, 420, 430, 90, 80,
+                410, 420, 430, 440, 450, 460, 150, np.nan, 120, 110],
+    })
+
+
+def chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+def test_vectorized_categories_match_scalar():
+    """get_aqi_categories gives the same answer as get_aqi_category"""
+    values = [0, 50, 50.5, 100, 101, 200, 300, 400, 401, 2000, np.nan]
+    assert get_aqi_categories(values).tolist() == [get_aqi_category(v) for v in values]
+
+
+def test_top_k_rows_and_groups():
+    """Highest values come first and NaN is ignored"""
+    df = make_data()
+    assert top_k_rows(df, "AQI", k=3)["AQI"].tolist() == [470, 460, 460]
+    assert top_k_rows(df, "AQI", k=2, largest=False)["AQI"].tolist() == [80, 90]
+
+    cities = top_k_groups(df, "City", "AQI", k=2)
+    assert cities["City"].tolist() == ["Patna", "Delhi"]
+    assert cities["Records"].tolist() == [9, 10]
+
+
+def test_streaming_matches_in_memory():
+    """Chunked top-K gives the same answer as the in-memory version"""
+    df = make_data()
+    streamed = top_k_rows_stream(chunks(df, 3), "AQI", k=5)
+    assert streamed["AQI"].tolist() == top_k_rows(df, "AQI", k=5)["AQI"].tolist()
+
+    grouped = top_k_groups_stream(chunks(df, 4), "City", "AQI", k=2)
+    expected = top_k_groups(df, "City", "AQI", k=2)
+    assert np.allclose(grouped["Mean_AQI"], expected["Mean_AQI"])
+
+
+def test_episodes_split_on_gaps_and_cities():
+    """Runs break when the category or city changes"""
+    episodes = find_episodes(make_data(), "Severe")
+    assert episodes["City"].tolist() == ["Delhi", "Delhi", "Patna"]
+    assert episodes["Days"].tolist() == [3, 2, 6]
+    assert episodes["Peak_AQI"].tolist() == [470, 430, 460]
+
+    with pytest.raises(ValueError, match="AQI_Bucket"):
+        find_episodes(make_data().drop(columns=["AQI"]))
+
+
+def test_streaming_episodes_join_across_chunks():
+    """A run cut by a chunk boundary is counted once, in full"""
+    df = make_data()
+    streamed = longest_episodes_stream(chunks(df, 3), "Severe", k=2)
+    expected = longest_episodes(df, "Severe", k=2)
+    assert streamed["Days"].tolist() == expected["Days"].tolist() == [6, 3]
+    assert streamed["Start"].tolist() == expected["Start"].tolist()
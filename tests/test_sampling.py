@@ -0,0 +1,90 @@
+"""
+Unit tests for stratified progressive sampling
+
+Checks that every (City, year) is represented, that chart samples take the
+same share of every stratum, that refining a sample only adds rows and that
+the error estimates behave at the extremes.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import numpy as np
+import pandas as pd
+
+from sampling import StratifiedReservoir, correlation_error, stratified_mean
+
+
+def make_data():
+    rng = np.random.default_rng(0)
+    frames = []
+    # A large city and a small one; a plain random sample could miss Aizawl
+    for city, days in [("Delhi", 1400), ("Aizawl", 40)]:
+        dates = pd.date_range("2017-01-01", periods=days, freq="D" if days > 100 else "30D")
+        frames.append(pd.DataFrame({"City": city, "Date": dates.strftime("%d/%m/%Y"),
+                                    "PM2.5": rng.gamma(2.0, 30.0, days)}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_every_stratum_is_represented_up_to_capacity():
+    """Each City×year keeps min(capacity, rows) rows"""
+    df = make_data()
+    reservoir = StratifiedReservoir.from_frame(df, capacity=20)
+    sample, info = reservoir.sample()
+    counts = sample.groupby("_stratum").size()
+    assert set(counts.index) == set(reservoir.population.index)
+    expected = np.minimum(reservoir.population, 20).reindex(counts.index)
+    assert (counts == expected).all()
+    assert info.total_rows == len(df) and info.sample_rows == len(sample)
+    assert sample["Date"].is_monotonic_increasing
+
+
+def test_smaller_sample_is_nested_in_larger():
+    """Refining a sample only adds rows"""
+    reservoir = StratifiedReservoir.from_frame(make_data(), capacity=30)
+    quick, _ = reservoir.sample(5)
+    larger, _ = reservoir.sample(30)
+    key = ["City", "Date"]
+    assert len(quick.merge(larger, on=key)) == len(quick)
+
+
+def test_proportional_sample_takes_the_same_share_of_every_stratum():
+    """Chart samples are self-weighting: each stratum is within one row of its share"""
+    df = make_data()
+    reservoir = StratifiedReservoir.from_frame(df, capacity=40)
+    sample, info = reservoir.sample(40, proportional=True)
+    counts = sample.groupby("_stratum").size().reindex(reservoir.population.index, fill_value=0)
+    share = reservoir.population * 40 / reservoir.population.max()
+    assert ((counts - share).abs() < 1).all()
+    assert counts.max() == 40 and info.sample_rows == counts.sum()
+
+    quick, _ = reservoir.sample(10, proportional=True)
+    key = ["City", "Date"]
+    assert len(quick.merge(sample, on=key)) == len(quick)
+
+
+def test_chunked_updates_fill_the_same_strata():
+    """Streaming chunks gives the same populations and sample sizes as one pass"""
+    df = make_data()
+    whole = StratifiedReservoir.from_frame(df, capacity=20)
+    chunked = StratifiedReservoir(capacity=20)
+    for start in range(0, len(df), 97):
+        chunked.update(df.iloc[start:start + 97])
+    pd.testing.assert_series_equal(chunked.population.sort_index(), whole.population.sort_index())
+    assert chunked.sample()[1] == whole.sample()[1]
+
+
+def test_error_estimates():
+    """A complete sample has no error; the stratified mean is unbiased in weight"""
+    df = make_data()
+    full = StratifiedReservoir.from_frame(df, capacity=len(df))
+    sample, info = full.sample()
+    mean, error = stratified_mean(sample, "PM2.5", full.population)
+    assert info.exact and error == 0
+    assert np.isclose(mean, df["PM2.5"].mean())
+
+    small = StratifiedReservoir.from_frame(df, capacity=10)
+    _, error = stratified_mean(small.sample()[0], "PM2.5", small.population)
+    assert error > 0
+    assert correlation_error(0.5, 101) == 0.075
+    assert np.isnan(correlation_error(0.5, 3))
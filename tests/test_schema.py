@@ -0,0 +1,55 @@
+"""
+Unit tests for the schema registry
+
+Checks that coercion parses dd/mm/yyyy dates, cleans numeric columns and
+marks the frame so it is only normalized once.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import pandas as pd
+from schema import coerce_frame, is_normalized, FEATURE_COLUMNS, VALID_RANGES
+from utils import validate_pollutant_values
+
+
+def test_coerce_parses_day_first_dates():
+    """01/02/2019 is the 1st of February, not January 2nd"""
+    df = coerce_frame(pd.DataFrame({"Date": ["01/02/2019", "2024-01-03", "bad"]}))
+
+    assert df["Date"].iloc[0] == pd.Timestamp(2019, 2, 1)
+    assert df["Date"].iloc[1] == pd.Timestamp(2024, 1, 3)
+    assert pd.isna(df["Date"].iloc[2])
+
+
+def test_coerce_cleans_numeric_and_categories():
+    """Numbers with commas become floats; City and AQI_Bucket become categories"""
+    raw = pd.DataFrame({
+        "City": [" Delhi", "Mumbai"],
+        "PM2.5": ["1,234.5", "abc"],
+        "AQI_Bucket": ["Poor", None],
+    })
+    df = coerce_frame(raw)
+
+    assert df["PM2.5"].iloc[0] == 1234.5
+    assert pd.isna(df["PM2.5"].iloc[1])
+    assert df["City"].tolist() == ["Delhi", "Mumbai"]
+    assert df["AQI_Bucket"].cat.ordered
+    assert raw["PM2.5"].iloc[0] == "1,234.5"  # input is not modified
+
+
+def test_coerce_runs_only_once():
+    """A normalized frame is returned unchanged, even after filtering"""
+    df = coerce_frame(pd.DataFrame({"City": ["Delhi", "Pune"], "AQI": ["100", "200"]}))
+    assert is_normalized(df)
+    assert coerce_frame(df) is df
+
+    subset = df[df["City"] == "Delhi"]
+    assert is_normalized(subset)
+
+
+def test_ranges_shared_with_validation():
+    """utils.validate_pollutant_values uses the schema ranges"""
+    assert set(FEATURE_COLUMNS) <= set(VALID_RANGES)
+    high_co = VALID_RANGES["CO"][1] + 1
+    assert "CO" in validate_pollutant_values({"CO": high_co})
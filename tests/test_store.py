@@ -0,0 +1,67 @@
+"""
+Unit tests for the partitioned dataset store
+
+Checks append de-duplication, partition pruning and compaction using a
+temporary store directory.
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import pandas as pd
+import pytest
+from store import DatasetStore
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        "City": ["Delhi", "Delhi", "Mumbai", "Delhi"],
+        "Date": ["01/01/2019", "02/01/2019", "01/01/2019", "31/12/2020"],
+        "PM2.5": ["120", "1,100.5", "80", "95"],
+        "AQI": [205, 350, 145, 180],
+    })
+
+
+def test_append_partitions_by_city_and_year(tmp_path, sample_df):
+    """Each (City, Year) pair should get its own partition"""
+    store = DatasetStore(tmp_path)
+    assert store.append(sample_df) == 4
+
+    parts = [(city, year) for city, year, _ in store.partitions()]
+    assert parts == [("Delhi", 2019), ("Delhi", 2020), ("Mumbai", 2019)]
+    assert store.read()["PM2.5"].max() == 1100.5
+
+
+def test_append_skips_existing_city_date(tmp_path, sample_df):
+    """Re-appending the same records should write nothing"""
+    store = DatasetStore(tmp_path)
+    store.append(sample_df)
+
+    assert store.append(sample_df) == 0
+    assert len(store.read()) == 4
+
+
+def test_read_prunes_partitions(tmp_path, sample_df):
+    """Reading Delhi 2019 should only return that partition"""
+    store = DatasetStore(tmp_path)
+    store.append(sample_df)
+
+    result = store.read(cities=["Delhi"], years=[2019], columns=["City", "Date", "AQI"])
+    assert list(result.columns) == ["City", "Date", "AQI"]
+    assert len(result) == 2
+    assert (result["Date"].dt.year == 2019).all()
+
+
+def test_compact_merges_part_files(tmp_path, sample_df):
+    """Several small appends should compact into one file per partition"""
+    store = DatasetStore(tmp_path)
+    store.append(sample_df.iloc[:1])
+    store.append(sample_df.iloc[1:2])
+
+    _, _, directory = store.partitions(cities=["Delhi"], years=[2019])[0]
+    assert len(list(directory.glob("part-*.parquet"))) == 2
+
+    assert store.compact() == 1
+    assert len(list(directory.glob("part-*.parquet"))) == 1
+    assert len(store.read(cities=["Delhi"])) == 2
@@ -0,0 +1,39 @@
+"""
+Unit tests for lazy loading and cold-start measurement
+
+Author: Mohsina Zaman Mim
+Date: October 19, 2026
+"""
+
+import joblib
+import pytest
+import warmup
+
+
+def test_load_model_artifact_loads_once(tmp_path):
+    """The same path returns the same object without reloading"""
+    path = tmp_path / "model.pkl"
+    joblib.dump({"weights": [1, 2, 3]}, path)
+
+    first = warmup.load_model_artifact(str(path))
+    second = warmup.load_model_artifact(str(path))
+    assert first is second
+
+
+def test_load_model_artifact_missing_file(tmp_path):
+    """A missing model raises FileNotFoundError like joblib.load"""
+    with pytest.raises(FileNotFoundError):
+        warmup.load_model_artifact(str(tmp_path / "missing.pkl"))
+
+
+def test_background_warmup_can_be_disabled(monkeypatch):
+    """AQI_APP_WARMUP=0 skips the warm-up thread"""
+    monkeypatch.setenv(warmup.WARMUP_ENV_VAR, "0")
+    assert warmup.start_background_warmup() is False
+
+
+def test_measure_import_time_reports_module():
+    """Cold import of a stdlib module is measured in a fresh interpreter"""
+    result = warmup.measure_import_time("json")
+    assert result["cumulative_ms"] > 0
+    assert result["wall_ms"] >= result["cumulative_ms"]
@@ -13,6 +13,8 @@ import pandas as pd
 import numpy as np
 from typing import Union, List, Dict
 
+from schema import FEATURE_COLUMNS, NUMERIC_COLUMNS, VALID_RANGES
+
 
 def clean_numeric_column(series: pd.Series) -> pd.Series:
     """
@@ -102,6 +104,38 @@ def get_aqi_category(aqi_value: float) -> str:
         return "Severe"
 
 
+def get_aqi_categories(aqi_values: Union[pd.Series, np.ndarray, List[float]]) -> np.ndarray:
+    """
+    Vectorized version of get_aqi_category for whole columns.
+
+    Uses a binary search over the category upper bounds instead of calling
+    get_aqi_category once per row, and gives identical results.
+
+    Parameters
+    ----------
+    aqi_values : pd.Series, np.ndarray or list
+        Numerical AQI values (NaN allowed)
+
+    Returns
+    -------
+    np.ndarray
+        Array of category names (dtype object), "Unknown" for missing values
+
+    Examples
+    --------
+    >>> get_aqi_categories([45, 51, 425, np.nan]).tolist()
+    ['Good', 'Satisfactory', 'Severe', 'Unknown']
+    """
+    values = np.asarray(aqi_values, dtype="float64")
+    names = np.array(list(AQI_THRESHOLDS) + ["Unknown"], dtype=object)
+    upper_bounds = np.array(list(AQI_THRESHOLDS.values())[:-1])
+
+    # side="left" keeps each boundary value in the lower category (50 → Good)
+    codes = np.searchsorted(upper_bounds, values, side="left")
+    codes[np.isnan(values)] = len(names) - 1
+    return names[codes]
+
+
 def get_aqi_color(aqi_value: float) -> str:
     """
     Get color code for AQI value visualization.
@@ -224,22 +258,8 @@ def validate_pollutant_values(pollutant_dict: Dict[str, float]) -> Dict[str, str
     """
     warnings = {}
     
-    # Define reasonable ranges (min, max) for each pollutant
-    # Based on typical measurement ranges in India
-    ranges = {
-        'PM2.5': (0, 500),
-        'PM10': (0, 600),
-        'NO': (0, 200),
-        'NO2': (0, 200),
-        'NOx': (0, 300),
-        'NH3': (0, 200),
-        'CO': (0, 10),  # mg/m³
-        'SO2': (0, 100),
-        'O3': (0, 300),
-        'Benzene': (0, 50),
-        'Toluene': (0, 100),
-        'Xylene': (0, 100)
-    }
+    # Reasonable ranges (min, max) for each pollutant come from the schema registry
+    ranges = VALID_RANGES
     
     for pollutant, value in pollutant_dict.items():
         if pollutant in ranges:
@@ -391,10 +411,8 @@ def format_number(value: float, decimal_places: int = 2) -> str:
 
 
 # Constants for the application
-FEATURE_COLUMNS = ['PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3', 
-                   'CO', 'SO2', 'O3', 'Benzene', 'Toluene', 'Xylene']
-
-NUMERIC_COLUMNS = FEATURE_COLUMNS + ['AQI']
+# FEATURE_COLUMNS and NUMERIC_COLUMNS are defined in schema.py and
+# re-exported here for backwards compatibility
 
 AQI_THRESHOLDS = {
     'Good': 50,
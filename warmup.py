@@ -0,0 +1,235 @@
+"""
+Lazy Loading and Cold-Start Warm-up
+
+Heavy libraries (matplotlib, seaborn, joblib, scikit-learn) and the model
+file are slow to import/load, and after a deploy or container restart the
+first visitor used to pay for all of them at once. The pages now import
+them only when a chart or prediction needs them, and the landing page
+starts a background warm-up that loads them while the user is still
+reading it.
+
+This module also contains a reproducible cold-start measurement that runs
+each import in a fresh interpreter with ``python -X importtime``.
+
+Author: Mohsina Zaman Mim
+Student ID: St20336239
+Date: October 19, 2026
+
+Usage:
+    python warmup.py --measure            # import time per module
+    python warmup.py --measure --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import subprocess
+from typing import Dict, List, Optional
+
+
+MODEL_PATH = "aqi_model.pkl"
+
+# Set AQI_APP_WARMUP=0 to disable the background warm-up (e.g. on tiny hosts)
+WARMUP_ENV_VAR = "AQI_APP_WARMUP"
+
+# Heavy modules, in the order the pages first need them
+HEAVY_MODULES = ["matplotlib.pyplot", "seaborn", "joblib", "sklearn.ensemble"]
+
+# Modules reported by the cold-start measurement
+MEASURED_MODULES = ["streamlit", "pandas", "numpy", "pyarrow.parquet"] + HEAVY_MODULES + [
+    "schema", "utils", "store", "chart_cache"
+]
+
+_model_cache: Dict[str, object] = {}
+_model_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def use_headless_backend() -> None:
+    """Select matplotlib's non-interactive Agg backend before pyplot is imported."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def load_model_artifact(path: str = MODEL_PATH):
+    """
+    Load a joblib model file once per process.
+
+    joblib (and scikit-learn, through unpickling) are only imported on the
+    first call. Concurrent callers wait for the same load instead of
+    loading the file twice.
+
+    Parameters
+    ----------
+    path : str, optional
+        Model file path (default is ``aqi_model.pkl``)
+
+    Returns
+    -------
+    object
+        The unpickled model
+
+    Raises
+    ------
+    FileNotFoundError
+        If the model file does not exist
+    """
+    path = os.path.abspath(path)
+    with _model_lock:
+        if path not in _model_cache:
+            import joblib
+            _model_cache[path] = joblib.load(path)
+        return _model_cache[path]
+
+
+def warm_up(model_path: str = MODEL_PATH) -> Dict[str, float]:
+    """
+    Import the plotting/ML stack and load the model, timing each step.
+
+    The model is loaded and warmed up through ``model_registry.live_model``,
+    which also starts watching the registry for new versions, so
+    scikit-learn's first-call overhead is paid here rather than by the
+    first user.
+
+    Parameters
+    ----------
+    model_path : str, optional
+        Model file used when no version was published (skipped if missing)
+
+    Returns
+    -------
+    dict
+        Seconds spent per step
+    """
+    import importlib
+
+    timings = {}
+    use_headless_backend()
+    for name in HEAVY_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = time.perf_counter() - start
+
+    # The served model comes from the registry (or model_path without one)
+    # and is warmed up with predictions before it is handed out
+    from model_registry import live_model
+
+    live = live_model(fallback=model_path)
+    if live.available():
+        start = time.perf_counter()
+        live.current()
+        timings["model"] = time.perf_counter() - start
+
+    return timings
+
+
+def start_background_warmup(model_path: str = MODEL_PATH) -> bool:
+    """
+    Start ``warm_up`` in a daemon thread, at most once per process.
+
+    Parameters
+    ----------
+    model_path : str, optional
+        Model file to preload
+
+    Returns
+    -------
+    bool
+        True if a warm-up thread was started by this call
+    """
+    global _warmup_thread
+
+    if os.environ.get(WARMUP_ENV_VAR, "1") == "0":
+        return False
+
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(
+            target=warm_up, args=(model_path,), name="aqi-warmup", daemon=True
+        )
+        _warmup_thread.start()
+        return True
+
+
+def measure_import_time(module: str, python: str = sys.executable) -> Dict[str, float]:
+    """
+    Measure a cold import of ``module`` in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Dotted module name
+    python : str, optional
+        Interpreter to use (default is the current one)
+
+    Returns
+    -------
+    dict
+        ``self_ms`` and ``cumulative_ms`` from ``-X importtime`` and the
+        ``wall_ms`` of the whole interpreter run
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise ImportError(f"Cannot import {module}: {result.stderr.strip().splitlines()[-1]}")
+
+    # Lines look like: "import time:       412 |      10373 | pandas"
+    self_us = cumulative_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+    return {"self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000, "wall_ms": wall * 1000}
+
+
+def measure_cold_start(modules: List[str] = MEASURED_MODULES, repeat: int = 3) -> List[Dict]:
+    """
+    Measure cold import time for each module, taking the median of several runs.
+
+    Parameters
+    ----------
+    modules : list of str, optional
+        Modules to measure (default is ``MEASURED_MODULES``)
+    repeat : int, optional
+        Fresh-interpreter runs per module (default is 3)
+
+    Returns
+    -------
+    list of dict
+        One row per module, sorted slowest first
+    """
+    rows = []
+    for module in modules:
+        runs = [measure_import_time(module) for _ in range(repeat)]
+        row = {"module": module}
+        for key in ("cumulative_ms", "self_ms", "wall_ms"):
+            row[key] = sorted(run[key] for run in runs)[len(runs) // 2]
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start measurement and warm-up")
+    parser.add_argument("--measure", action="store_true", help="report import time per module")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module (median is reported)")
+    args = parser.parse_args()
+
+    if args.measure:
+        print(f"{'module':<20}{'cumulative ms':>15}{'self ms':>10}{'wall ms':>10}")
+        for row in measure_cold_start(repeat=args.repeat):
+            print(f"{row['module']:<20}{row['cumulative_ms']:>15.1f}"
+                  f"{row['self_ms']:>10.1f}{row['wall_ms']:>10.1f}")
+    else:
+        for step, seconds in warm_up().items():
+            print(f"{step:<20}{seconds * 1000:>10.1f} ms")